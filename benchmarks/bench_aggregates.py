@@ -0,0 +1,57 @@
+"""
+benchmark for the closest players kept by TeamAggregates, scanning the
+field players against keeping them ordered, as the team size grows.
+
+each tick of a match the update is timed once more, and so is the
+first query of the tick for the player closest to the opponents' goal,
+so that the orderings see the movement of a real match. the scan is
+cheaper at every size, which is why the orderings are opt-in.
+
+    python -m benchmarks.bench_aggregates
+"""
+
+import time
+
+from simple_soccer_py.aggregates import TeamAggregates
+from simple_soccer_py.models import SoccerPitch
+from simple_soccer_py.params import Params
+
+TICKS = 600
+
+
+def time_per_tick(players: int, ordered: bool) -> tuple[float, float]:
+    """the seconds for an update and for a goal query"""
+    pitch = SoccerPitch(Params(players_per_team=players), seed=0)
+    for team in (pitch.red_team, pitch.blue_team):
+        team.aggregates = TeamAggregates(team, ordered)
+        team.aggregates.recompute()
+    aggregates = pitch.red_team.aggregates
+    update = query = 0.0
+    for _ in range(TICKS):
+        pitch.update()
+        start = time.perf_counter()
+        aggregates.update()
+        middle = time.perf_counter()
+        aggregates.closest_to_opponents_goal
+        end = time.perf_counter()
+        update += middle - start
+        query += end - middle
+    return update / TICKS, query / TICKS
+
+
+def main() -> None:
+    print(
+        f"{'field':>6}{'update':>20}{'goal query':>20}\n"
+        f"{'':>6}{'scan us':>10}{'ordered us':>12}{'scan us':>10}{'ordered us':>12}"
+    )
+    for players in (3, 5, 9, 17, 33, 65):
+        scan, scan_goal = time_per_tick(players, ordered=False)
+        ordered, ordered_goal = time_per_tick(players, ordered=True)
+        print(
+            f"{players - 1:>6}{scan * 1e6:>10.2f}{ordered * 1e6:>12.2f}"
+            f"{scan_goal * 1e6:>10.2f}{ordered_goal * 1e6:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+benchmark for BatchRunner, match throughput against the number of workers.
+
+    python -m benchmarks.bench_batch
+"""
+
+import os
+
+from simple_soccer_py.batch import BatchRunner
+
+MATCHES = 16
+TICKS = 3_000
+
+
+def main() -> None:
+    cores = os.cpu_count() or 1
+    workers = 1
+    base = 0.0
+    while True:
+        runner = BatchRunner(ticks=TICKS, max_workers=workers)
+        runner.run(range(MATCHES))
+        rate = MATCHES / runner.elapsed
+        base = base or rate
+        print(
+            f"{workers:>3} workers: {rate:>8.2f} matches/sec"
+            f" ({rate / base:.2f}x, {rate * TICKS:>10,.0f} ticks/sec)"
+        )
+        if workers >= cores:
+            break
+        workers = min(workers * 2, cores)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+benchmark for the spatial partitions against a brute force scan when
+tagging the neighbours of every entity once per tick.
+
+the space grows with the population so the density, and with it the
+number of true neighbours per query, stays roughly constant.
+
+    python -m benchmarks.bench_cell_space
+"""
+
+import math
+import random
+import time
+from collections.abc import Callable
+from functools import partial
+
+from simple_soccer_py.common.cell_space_partition import (
+    CellSpacePartition,
+    QuadTreePartition,
+    SpacePartition,
+)
+from simple_soccer_py.common.moving_entity import BaseGameEntity
+from simple_soccer_py.common.vector2d import Vector2D
+
+RADIUS = 10.0
+# entities per 100 square units
+DENSITY = 0.4
+# the brute force scan is quadratic, so only a sample of queries is timed
+MAX_QUERIES = 500
+
+
+def brute_force_tag(
+    entities: list[BaseGameEntity], entity: BaseGameEntity, radius: float
+) -> None:
+    position = entity.position
+    for other in entities:
+        other.untag()
+        if other is entity:
+            continue
+        reach = radius + other.bounding_radius
+        if other.position.distance_sq(position) < reach * reach:
+            other.tag()
+
+
+def time_per_query(
+    entities: list[BaseGameEntity], tag: Callable[[BaseGameEntity], object]
+) -> float:
+    sample = entities[:MAX_QUERIES]
+    start = time.perf_counter()
+    for entity in sample:
+        tag(entity)
+    return (time.perf_counter() - start) / len(sample)
+
+
+def main() -> None:
+    print(
+        f"{'entities':>9}{'brute us':>11}{'grid us':>10}{'quad us':>10}"
+        f"{'grid x':>8}{'quad x':>8}"
+    )
+    for n in (22, 50, 100, 250, 1_000, 2_500, 10_000):
+        side = math.sqrt(n / DENSITY) * 10
+        rng = random.Random(n)
+        entities = []
+        for i in range(n):
+            entity = BaseGameEntity(i)
+            entity.position = Vector2D(rng.uniform(0, side), rng.uniform(0, side))
+            entity.bounding_radius = 1.0
+            entities.append(entity)
+
+        cells = max(1, int(side / RADIUS))
+        partitions: list[SpacePartition] = [
+            CellSpacePartition(side, side, cells, cells),
+            QuadTreePartition(side, side),
+        ]
+        for partition in partitions:
+            partition.add_entities(entities)
+
+        brute = time_per_query(
+            entities, lambda entity: brute_force_tag(entities, entity, RADIUS)
+        )
+        grid, quad = (
+            time_per_query(entities, partial(partition.tag_neighbours, radius=RADIUS))
+            for partition in partitions
+        )
+        print(
+            f"{n:>9}{brute * 1e6:>11.1f}{grid * 1e6:>10.1f}{quad * 1e6:>10.1f}"
+            f"{brute / grid:>7.1f}x{brute / quad:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+benchmark for EntityStore.integrate against a Python loop over
+MovingEntity.integrate.
+
+    python -m benchmarks.bench_entity_store
+"""
+
+import random
+import timeit
+
+import numpy as np
+
+from simple_soccer_py.common.entity_store import EntityStore
+from simple_soccer_py.common.moving_entity import MovingEntity
+from simple_soccer_py.common.vector2d import Vector2D
+
+DT = 1 / 30
+
+
+def populate(n: int, seed: int = 0) -> tuple[EntityStore, list[MovingEntity]]:
+    rng = random.Random(seed)
+    store = EntityStore(n)
+    entities = []
+    for i in range(n):
+        position = Vector2D(rng.uniform(0, 105), rng.uniform(0, 68))
+        heading = Vector2D(1, 0)
+        args = (i, position, 1.0, Vector2D(), 7.0, heading, 70.0, Vector2D(1, 1))
+        store.add(*args, 0.4, 1000.0)
+        entities.append(
+            MovingEntity(
+                i, position.copy(), 1.0, Vector2D(), 7.0, Vector2D(1, 0), 70.0,
+                Vector2D(1, 1), 0.4, 1000.0,
+            )
+        )  # fmt: skip
+    return store, entities
+
+
+def main() -> None:
+    print(f"{'entities':>9}{'loop ents/s':>16}{'store ents/s':>16}{'speedup':>10}")
+    for n in (22, 100, 1_000, 10_000):
+        store, entities = populate(n)
+        forces = np.random.default_rng(0).uniform(-500, 500, (n, 2))
+        force_vectors = [Vector2D(fx, fy) for fx, fy in forces.tolist()]
+
+        def loop() -> None:
+            for entity, force in zip(entities, force_vectors):
+                entity.integrate(DT, force)
+
+        def vectorized() -> None:
+            store.integrate(DT, forces)
+
+        number = max(1, 20_000 // n)
+        loop_time = min(timeit.repeat(loop, number=number, repeat=5)) / number
+        store_time = min(timeit.repeat(vectorized, number=number, repeat=5)) / number
+        print(
+            f"{n:>9}{n / loop_time:>16,.0f}{n / store_time:>16,.0f}"
+            f"{loop_time / store_time:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+"""
+benchmark for the headless match engine, simulated ticks per second.
+
+    python -m benchmarks.bench_match
+"""
+
+from simple_soccer_py.models import SoccerPitch
+
+MATCHES = 3
+
+
+def main() -> None:
+    for seed in range(MATCHES):
+        pitch = SoccerPitch(seed=seed)
+        summary = pitch.run()
+        print(
+            f"seed {seed}: {summary.red_score:>3} - {summary.blue_score:<3}"
+            f" {summary.ticks:,} ticks in {summary.elapsed:.2f}s"
+            f" {summary.ticks_per_second:>10,.0f} ticks/sec"
+        )
+
+
+if __name__ == "__main__":
+    main()
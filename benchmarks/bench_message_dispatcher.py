@@ -0,0 +1,61 @@
+"""
+benchmark for MessageDispatcher with a large queue of delayed telegrams.
+
+    python -m benchmarks.bench_message_dispatcher
+"""
+
+import random
+import time
+
+from simple_soccer_py.common.message_dispatcher import MessageDispatcher
+from simple_soccer_py.common.moving_entity import BaseGameEntity
+from simple_soccer_py.common.telegram import Telegram
+
+N = 100_000
+RECEIVERS = 1_000
+
+
+class Sink(BaseGameEntity):
+    def handle_message(self, msg: Telegram) -> bool:
+        return True
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def main() -> None:
+    rng = random.Random(0)
+    clock = Clock()
+    entities = {i: Sink(i) for i in range(RECEIVERS)}
+    dispatcher = MessageDispatcher(entities, clock=clock)
+    messages = [
+        (rng.uniform(0.01, 60.0), rng.randrange(RECEIVERS), rng.randrange(RECEIVERS))
+        for _ in range(N)
+    ]
+
+    start = time.perf_counter()
+    for delay, sender, receiver in messages:
+        dispatcher.dispatch_msg(delay, sender, receiver, 0)
+    queue_time = time.perf_counter() - start
+    queued = len(dispatcher)
+
+    start = time.perf_counter()
+    sent = 0
+    # drain in ticks of a 30Hz simulation
+    while len(dispatcher):
+        clock.now += 1 / 30
+        sent += dispatcher.dispatch_delayed_messages()
+    drain_time = time.perf_counter() - start
+
+    print(f"queued {queued:,} of {N:,} telegrams ({N - queued:,} merged)")
+    print(f"queue: {queued / queue_time:>12,.0f} msgs/sec")
+    print(f"drain: {sent / drain_time:>12,.0f} msgs/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+benchmark for the cost of the profiler, disabled and enabled.
+
+    python -m benchmarks.bench_profiler
+"""
+
+import time
+
+from simple_soccer_py.models import SoccerPitch
+from simple_soccer_py.profiler import Profiler
+
+TICKS = 5_000
+
+
+def ticks_per_second(profiler: Profiler | None = None) -> float:
+    pitch = SoccerPitch(seed=0)
+    if profiler is not None:
+        profiler.enable()
+    start = time.perf_counter()
+    pitch.run(TICKS)
+    elapsed = time.perf_counter() - start
+    if profiler is not None:
+        profiler.disable()
+    return TICKS / elapsed
+
+
+def main() -> None:
+    baseline = ticks_per_second()
+    # enabled then disabled again, the engine is back to the plain methods
+    ticks_per_second(Profiler())
+    disabled = ticks_per_second()
+    enabled = ticks_per_second(Profiler())
+    traced = ticks_per_second(Profiler(trace_allocations=True))
+
+    for name, rate in [
+        ("baseline", baseline),
+        ("disabled", disabled),
+        ("enabled", enabled),
+        ("tracemalloc", traced),
+    ]:
+        print(f"{name:<12} {rate:>10,.0f} ticks/sec ({rate / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
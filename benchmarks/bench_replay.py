@@ -0,0 +1,52 @@
+"""
+benchmark for the replay log, recording and streaming back a full match.
+
+    python -m benchmarks.bench_replay
+"""
+
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from simple_soccer_py.models import SoccerPitch
+from simple_soccer_py.replay import ReplayReader, record_match
+
+SEED = 0
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "match.replay"
+        pitch = SoccerPitch(seed=SEED)
+        ticks = pitch.match_ticks
+
+        start = time.perf_counter()
+        record_match(pitch, path, ticks)
+        record_time = time.perf_counter() - start
+        size = path.stat().st_size
+        frames = ticks + 1
+
+        with ReplayReader(path) as reader:
+            start = time.perf_counter()
+            states = [frame.state.tolist() for frame in reader]
+            read_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for tick in range(0, ticks, ticks // 100):
+                reader.frame(tick)
+            seek_time = (time.perf_counter() - start) / 100
+
+            json_size = len(json.dumps(states))
+            raw_size = frames * reader.entity_count * 6 * 8
+
+        print(f"{frames:,} frames recorded in {record_time:.2f}s (with simulation)")
+        print(f"replay: {size:>12,} bytes ({size / frames:.0f} per frame)")
+        print(f"raw:    {raw_size:>12,} bytes")
+        print(f"json:   {json_size:>12,} bytes")
+        print(f"read:   {frames / read_time:>12,.0f} frames/sec")
+        print(f"seek:   {seek_time * 1e6:>12,.0f} us per random frame")
+
+
+if __name__ == "__main__":
+    main()
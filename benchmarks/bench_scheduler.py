@@ -0,0 +1,63 @@
+"""
+benchmark for the AIScheduler: the cost of the ticks of many pitches
+packed into one process, rescoring the support spots of every team once a
+simulated second. run all at once they land on the same tick, scheduled
+they are spread over the second.
+
+    python -m benchmarks.bench_scheduler
+"""
+
+import statistics
+import time
+from collections.abc import Callable
+
+from simple_soccer_py.common.scheduler import AIScheduler
+from simple_soccer_py.models import SoccerPitch, SoccerTeam
+
+PITCHES = 16
+TICKS = 300
+
+
+def rescore(team: SoccerTeam) -> Callable[[], object]:
+    calc = team.support_spots
+    attacker = team.players[-1]
+
+    def update() -> object:
+        calc.reset()
+        return calc.determine_best_supporting_position(attacker.position)
+
+    return update
+
+
+def tick_times(scheduled: bool) -> list[float]:
+    pitches = [SoccerPitch(seed=i) for i in range(PITCHES)]
+    tasks = [rescore(t) for p in pitches for t in (p.red_team, p.blue_team)]
+    # the pitches share one simulated clock
+    clock = pitches[0]._clock
+    scheduler = AIScheduler(clock=clock)
+    for i, task in enumerate(tasks):
+        # phase 0 puts every task on the same tick, as if unscheduled
+        scheduler.register(i, task, 1.0, phase=None if scheduled else 0.0)
+
+    times = []
+    for _ in range(TICKS):
+        start = time.perf_counter()
+        for pitch in pitches:
+            pitch.update()
+        scheduler.update()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main() -> None:
+    for name, scheduled in [("all at once", False), ("scheduled", True)]:
+        times = sorted(tick_times(scheduled))
+        p99 = times[int(len(times) * 0.99)]
+        print(
+            f"{name:<12} median {statistics.median(times) * 1e3:6.2f} ms"
+            f"  p99 {p99 * 1e3:6.2f} ms  max {times[-1] * 1e3:6.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+benchmark for write_many / read_many against pickling the entities, and
+for the columnar EntityStore records against pack_many / unpack_many on
+the views of a store.
+
+    python -m benchmarks.bench_serialization
+"""
+
+import pickle
+import time
+
+from simple_soccer_py.common import serialization
+from simple_soccer_py.common.entity_store import EntityStore
+from simple_soccer_py.common.moving_entity import MovingEntity
+from simple_soccer_py.common.vector2d import Vector2D
+
+N = 50_000
+
+
+def main() -> None:
+    entities = [
+        MovingEntity(
+            i,
+            Vector2D(i, i),
+            0.5,
+            Vector2D(1, 0),
+            8.0,
+            Vector2D(1, 0),
+            70.0,
+            Vector2D(1, 1),
+            0.4,
+            700.0,
+        )  # fmt: skip
+        for i in range(N)
+    ]
+
+    start = time.perf_counter()
+    pickled = pickle.dumps(entities, protocol=pickle.HIGHEST_PROTOCOL)
+    pickle_dump = time.perf_counter() - start
+    start = time.perf_counter()
+    pickle.loads(pickled)
+    pickle_load = time.perf_counter() - start
+
+    start = time.perf_counter()
+    packed = serialization.pack_many(entities)
+    pack = time.perf_counter() - start
+    start = time.perf_counter()
+    serialization.unpack_many(packed, MovingEntity, into=entities)
+    restore = time.perf_counter() - start
+    start = time.perf_counter()
+    serialization.unpack_many(packed, MovingEntity)
+    unpack = time.perf_counter() - start
+
+    print(f"{N:,} entities")
+    print(f"pickle:  {len(pickled):>12,} bytes")
+    print(f"records: {len(packed):>12,} bytes")
+    print(f"pickle dump:   {pickle_dump * 1000:8.1f} ms")
+    print(f"pack_many:     {pack * 1000:8.1f} ms")
+    print(f"pickle load:   {pickle_load * 1000:8.1f} ms")
+    print(f"unpack (new):  {unpack * 1000:8.1f} ms")
+    print(f"unpack (into): {restore * 1000:8.1f} ms")
+
+    store = EntityStore(N)
+    for entity in entities:
+        store.add(
+            entity.id, entity.position, 0.5, entity.velocity, 8.0, entity.heading,
+            70.0, entity.scale, 0.4, 700.0,
+        )  # fmt: skip
+
+    start = time.perf_counter()
+    packed = serialization.pack_many(store.entities)
+    store_pack = time.perf_counter() - start
+    start = time.perf_counter()
+    serialization.unpack_many(packed, MovingEntity, into=store.entities)
+    store_restore = time.perf_counter() - start
+    start = time.perf_counter()
+    store.pack_records()
+    columns_pack = time.perf_counter() - start
+    start = time.perf_counter()
+    store.restore_records(packed)
+    columns_restore = time.perf_counter() - start
+
+    print(f"store pack_many:       {store_pack * 1000:8.1f} ms")
+    print(f"store pack_records:    {columns_pack * 1000:8.1f} ms")
+    print(f"store unpack (into):   {store_restore * 1000:8.1f} ms")
+    print(f"store restore_records: {columns_restore * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
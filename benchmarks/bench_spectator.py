@@ -0,0 +1,56 @@
+"""
+benchmark for the spectator server: whether a match paced at ten times
+real time keeps its tick rate with more and more spectators, half of
+them reading every frame and half subscribed but never reading. the
+spectators run in the same process, so they take their share of the
+one event loop too.
+
+    python -m benchmarks.bench_spectator
+"""
+
+import asyncio
+
+from simple_soccer_py.models import SoccerPitch
+from simple_soccer_py.spectator import SpectatorClient, SpectatorServer, connect_tcp
+
+TICKS = 900
+TICK_RATE = 300.0
+
+
+async def drain(client: SpectatorClient) -> int:
+    frames = 0
+    try:
+        while True:
+            await client.read()
+            frames += 1
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return frames
+
+
+async def measure(spectators: int) -> tuple[float, int, int, int]:
+    """ticks a second, late ticks, frames read and frames dropped"""
+    async with SpectatorServer(SoccerPitch(seed=0), TICK_RATE) as server:
+        listening = await server.listen_tcp()
+        port = listening.sockets[0].getsockname()[1]
+        clients = [await connect_tcp("127.0.0.1", port) for _ in range(spectators)]
+        readers = [asyncio.create_task(drain(c)) for c in clients[: spectators // 2]]
+        summary = await server.run(TICKS)
+        dropped = sum(s.dropped for s in server.spectators)
+        late = server.late_ticks
+    for client in clients:
+        await client.close()
+    frames = sum(await asyncio.gather(*readers))
+    return summary.ticks_per_second, late, frames, dropped
+
+
+def main() -> None:
+    for spectators in (0, 2, 8, 32):
+        rate, late, frames, dropped = asyncio.run(measure(spectators))
+        print(
+            f"{spectators:>3} spectators  {rate:6,.1f} ticks/sec  {late:3} late"
+            f"  {frames:7,} frames read  {dropped:5,} dropped"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+micro-benchmark for Vector2D arithmetic.
+
+compares the slotted Vector2D against the previous dict-backed
+implementation, and the allocating operators against the in-place
+and "into" variants.
+
+    python -m benchmarks.bench_vector2d
+"""
+
+import timeit
+import tracemalloc
+from collections.abc import Callable
+
+from simple_soccer_py.common.vector2d import Vector2D, Vector2DPool
+
+N = 100_000
+
+
+class DictVector2D:
+    """the dict-backed Vector2D this module replaced, kept for comparison"""
+
+    def __init__(self, x: float = 0, y: float = 0) -> None:
+        self.x = x
+        self.y = y
+
+    def __add__(self, other: "DictVector2D") -> "DictVector2D":
+        return DictVector2D(self.x + other.x, self.y + other.y)
+
+    def __mul__(self, scalar: float) -> "DictVector2D":
+        return DictVector2D(self.x * scalar, self.y * scalar)
+
+    def dot(self, v2: "DictVector2D") -> float:
+        return self.x * v2.x + self.y * v2.y
+
+    def get_reverse(self) -> "DictVector2D":
+        return DictVector2D(-self.x, -self.y)
+
+    def reflect(self, norm: "DictVector2D") -> "DictVector2D":
+        return self + norm.get_reverse() * 2.0 * self.dot(norm)
+
+
+def allocated_per_op(op: Callable[[], object], n: int = 10_000) -> tuple[float, float]:
+    """returns (blocks, bytes) still allocated per call with every result kept"""
+    results = []
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for _ in range(n):
+        results.append(op())
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    blocks = sum(s.count_diff for s in stats)
+    size = sum(s.size_diff for s in stats)
+    # the list holding the results is not part of the operation
+    size -= results.__sizeof__()
+    return blocks / n, size / n
+
+
+def ops_per_sec(op: Callable[[], object], n: int = N) -> float:
+    best = min(timeit.repeat(op, number=n, repeat=5))
+    return n / best
+
+
+def main() -> None:
+    old_v, old_n = DictVector2D(1.0, 2.0), DictVector2D(0.0, 1.0)
+    v, norm = Vector2D(1.0, 2.0), Vector2D(0.0, 1.0)
+    out = Vector2D()
+    pool = Vector2DPool()
+
+    def pooled_reflect() -> Vector2D:
+        with pool.frame():
+            return v.reflect_into(norm, pool.get())
+
+    def iadd() -> Vector2D:
+        nonlocal out
+        out += norm
+        return out
+
+    cases: list[tuple[str, Callable[[], object]]] = [
+        ("dict add", lambda: old_v + old_n),
+        ("slots add", lambda: v + norm),
+        ("slots iadd", iadd),
+        ("dict reflect", lambda: old_v.reflect(old_n)),
+        ("slots reflect", lambda: v.reflect(norm)),
+        ("slots reflect_into", lambda: v.reflect_into(norm, out)),
+        ("pooled reflect_into", pooled_reflect),
+    ]
+
+    print(f"{'case':<22}{'ops/sec':>14}{'blocks/op':>12}{'bytes/op':>12}")
+    for name, op in cases:
+        blocks, size = allocated_per_op(op)
+        print(f"{name:<22}{ops_per_sec(op):>14,.0f}{blocks:>12.2f}{size:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+runs the cases in benchmarks.suite, saves the results as a JSON baseline
+and compares runs against a baseline.
+
+    python -m benchmarks.runner run [-k PATTERN] [--save results.json]
+    python -m benchmarks.runner compare baseline.json results.json
+    python -m benchmarks.runner run --compare baseline.json
+
+every case is warmed up, then timed `repeats` times over `number` calls.
+the best repeat is the figure compared, being the least disturbed by
+the rest of the machine. compare exits with status 1 if any case is
+slower than its baseline by more than the threshold.
+
+baselines only mean something on the machine they were taken on.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import timeit
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .suite import CASES, Case
+
+DEFAULT_THRESHOLD = 0.10
+
+
+def measure(case: Case, warmup: int = 1, repeats: int = 5) -> dict[str, float]:
+    """times case, returns seconds per call of its operation"""
+    op = case.setup()
+    timer = timeit.Timer(op)
+    for _ in range(warmup):
+        timer.timeit(case.number)
+    times = [t / case.number for t in timer.repeat(repeats, case.number)]
+    return {
+        "best": min(times),
+        "median": statistics.median(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "number": case.number,
+        "repeats": repeats,
+    }
+
+
+def run(
+    cases: Iterable[Case], warmup: int = 1, repeats: int = 5, verbose: bool = True
+) -> dict[str, Any]:
+    results = {}
+    for case in cases:
+        result = measure(case, warmup, repeats)
+        results[case.name] = result
+        if verbose:
+            print(
+                f"{case.name:<32} {result['best'] * 1e6:>12.3f} us"
+                f"  (median {result['median'] * 1e6:.3f})",
+                flush=True,
+            )
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def compare(
+    baseline: dict[str, Any], current: dict[str, Any]
+) -> list[tuple[str, float, float, float]]:
+    """
+    returns (name, baseline, current, ratio) of every case in both runs,
+    ratio being current / baseline of the best times
+    """
+    rows = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        rows.append((name, base["best"], result["best"], result["best"] / base["best"]))
+    return rows
+
+
+def regressions(
+    rows: Sequence[tuple[str, float, float, float]],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[str]:
+    return [name for name, _, _, ratio in rows if ratio > 1 + threshold]
+
+
+def report(
+    rows: Sequence[tuple[str, float, float, float]],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> int:
+    """prints the comparison, returns the exit status"""
+    for name, base, current, ratio in rows:
+        if ratio > 1 + threshold:
+            flag = "REGRESSION"
+        elif ratio < 1 - threshold:
+            flag = "faster"
+        else:
+            flag = ""
+        print(
+            f"{name:<32} {base * 1e6:>12.3f} -> {current * 1e6:>12.3f} us"
+            f" {ratio:>6.2f}x {flag}"
+        )
+    slower = regressions(rows, threshold)
+    if slower:
+        print(f"{len(slower)} regression(s) over {threshold:.0%}: {', '.join(slower)}")
+        return 1
+    return 0
+
+
+def load(path: Path) -> dict[str, Any]:
+    data: dict[str, Any] = json.loads(Path(path).read_text())
+    return data
+
+
+def save(data: dict[str, Any], path: Path) -> None:
+    Path(path).write_text(json.dumps(data, indent=2) + "\n")
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.runner")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="time the suite")
+    run_parser.add_argument("-k", "--filter", default="", help="substring of names")
+    run_parser.add_argument("--warmup", type=int, default=1)
+    run_parser.add_argument("--repeats", type=int, default=5)
+    run_parser.add_argument("--save", type=Path, help="write the results here")
+    run_parser.add_argument("--compare", type=Path, help="baseline to compare to")
+    run_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    run_parser.add_argument("--list", action="store_true", help="only list cases")
+
+    compare_parser = commands.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+
+    args = parser.parse_args(argv)
+    if args.command == "compare":
+        rows = compare(load(args.baseline), load(args.current))
+        return report(rows, args.threshold)
+
+    cases = [c for name, c in CASES.items() if args.filter in name]
+    if args.list:
+        for c in cases:
+            print(c.name)
+        return 0
+    data = run(cases, args.warmup, args.repeats)
+    if args.save:
+        save(data, args.save)
+    if args.compare:
+        print()
+        return report(compare(load(args.compare), data), args.threshold)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
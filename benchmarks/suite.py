@@ -0,0 +1,361 @@
+"""
+the cases timed by benchmarks.runner.
+
+every case is a setup function returning the operation to time, so that
+building its inputs is not measured. register new cases with @case.
+"""
+
+import random
+import tempfile
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from simple_soccer_py.aggregates import TeamAggregates
+from simple_soccer_py.cache import ResultCache
+from simple_soccer_py.common.c2d_matrix import C2DMatrix
+from simple_soccer_py.common.cell_space_partition import CellSpacePartition
+from simple_soccer_py.common.entity_store import EntityStore
+from simple_soccer_py.common.message_dispatcher import MessageDispatcher
+from simple_soccer_py.common.moving_entity import BaseGameEntity, MovingEntity
+from simple_soccer_py.common.telegram import Telegram
+from simple_soccer_py.common.vector2d import Vector2D
+from simple_soccer_py.common.wall2d import Wall2D
+from simple_soccer_py.models import SoccerPitch
+from simple_soccer_py.passing import safe_passes
+from simple_soccer_py.steering import calculate_batch
+from simple_soccer_py.support_spots import score_support_spots
+
+Operation = Callable[[], object]
+Setup = Callable[[], Operation]
+
+
+@dataclass
+class Case:
+    name: str
+    setup: Setup
+    # calls of the operation per timed repeat
+    number: int
+
+
+CASES: dict[str, Case] = {}
+
+
+def case(name: str, number: int) -> Callable[[Setup], Setup]:
+    def register(setup: Setup) -> Setup:
+        if name in CASES:
+            raise ValueError(f"<case> {name} is already registered")
+        CASES[name] = Case(name, setup, number)
+        return setup
+
+    return register
+
+
+def _entity(rng: random.Random) -> MovingEntity:
+    heading = Vector2D(rng.uniform(-1, 1), rng.uniform(-1, 1))
+    heading.normalize()
+    return MovingEntity(
+        0, Vector2D(rng.uniform(0, 100), rng.uniform(0, 60)), 0.5, Vector2D(),
+        8.0, heading, 70.0, Vector2D(1, 1), 0.4, 700.0,
+    )  # fmt: skip
+
+
+@case("vector2d.arithmetic", number=20_000)
+def vector2d_arithmetic() -> Operation:
+    a, b = Vector2D(3, 4), Vector2D(1, 2)
+
+    def op() -> object:
+        return (a + b) * 2.0 - b
+
+    return op
+
+
+@case("vector2d.in_place", number=20_000)
+def vector2d_in_place() -> Operation:
+    a, b = Vector2D(3, 4), Vector2D(1, 2)
+
+    def op() -> object:
+        v = a
+        v += b
+        v -= b
+        v *= 1.0
+        return v
+
+    return op
+
+
+@case("vector2d.normalize_reflect", number=20_000)
+def vector2d_normalize_reflect() -> Operation:
+    v, norm = Vector2D(3, 4), Vector2D(0, 1)
+
+    def op() -> object:
+        w = v.copy()
+        w.normalize()
+        return w.reflect(norm)
+
+    return op
+
+
+@case("c2d_matrix.compose", number=10_000)
+def c2d_matrix_compose() -> Operation:
+    heading, side = Vector2D(0.6, 0.8), Vector2D(-0.8, 0.6)
+
+    def op() -> object:
+        m = C2DMatrix()
+        m.rotate_by_vectors(heading, side)
+        m.translate(10, 5)
+        m.scale(2, 2)
+        return m
+
+    return op
+
+
+@case("c2d_matrix.transform", number=10_000)
+def c2d_matrix_transform() -> Operation:
+    heading, side = Vector2D(0.6, 0.8), Vector2D(-0.8, 0.6)
+    m = C2DMatrix.world_transform(heading, side, Vector2D(10, 5))
+    points = [Vector2D(i, -i) for i in range(4)]
+
+    def op() -> object:
+        m.transform_vector2ds(*points)
+        return points
+
+    return op
+
+
+@case("c2d_matrix.apply_to_array", number=2_000)
+def c2d_matrix_apply_to_array() -> Operation:
+    heading, side = Vector2D(0.6, 0.8), Vector2D(-0.8, 0.6)
+    m = C2DMatrix.world_transform(heading, side, Vector2D(10, 5))
+    points = np.random.default_rng(0).uniform(-50, 50, (1_000, 2))
+
+    def op() -> object:
+        return m.apply_to_array(points)
+
+    return op
+
+
+@case("moving_entity.rotate_heading", number=10_000)
+def moving_entity_rotate_heading() -> Operation:
+    rng = random.Random(0)
+    entities = [_entity(rng) for _ in range(64)]
+    targets = [Vector2D(rng.uniform(0, 100), rng.uniform(0, 60)) for _ in range(64)]
+    pairs = list(zip(entities, targets))
+    index = [0]
+
+    def op() -> object:
+        i = index[0] = (index[0] + 1) & 63
+        entity, target = pairs[i]
+        return entity.rotate_heading_to_face_position(target)
+
+    return op
+
+
+@case("wall2d.normal", number=10_000)
+def wall2d_normal() -> Operation:
+    wall = Wall2D(Vector2D(0, 0), Vector2D(10, 5))
+    end = Vector2D(10, 5)
+
+    def op() -> object:
+        wall.to = end
+        return wall.normal
+
+    return op
+
+
+@case("telegram.create", number=20_000)
+def telegram_create() -> Operation:
+    def op() -> object:
+        return Telegram(1, 2, 3, 1.5, "info")
+
+    return op
+
+
+@case("message_dispatcher.dispatch", number=5_000)
+def message_dispatcher_dispatch() -> Operation:
+    class Sink(BaseGameEntity):
+        def handle_message(self, msg: Telegram) -> bool:
+            return True
+
+    dispatcher = MessageDispatcher({1: Sink(1)})
+
+    def op() -> object:
+        return dispatcher.dispatch_msg(0, 0, 1, 0)
+
+    return op
+
+
+@case("entity_store.integrate_1k", number=200)
+def entity_store_integrate() -> Operation:
+    rng = random.Random(0)
+    store = EntityStore()
+    for i in range(1_000):
+        e = _entity(rng)
+        store.add(
+            i, e.position, 0.5, Vector2D(), 8.0, e.heading, 70.0, Vector2D(1, 1),
+            0.4, 700.0,
+        )  # fmt: skip
+    forces = np.random.default_rng(0).uniform(-700, 700, (1_000, 2))
+
+    def op() -> object:
+        store.integrate(1 / 30, forces)
+        return store
+
+    return op
+
+
+@case("entity_store.records_1k", number=200)
+def entity_store_records() -> Operation:
+    rng = random.Random(0)
+    store = EntityStore()
+    for i in range(1_000):
+        e = _entity(rng)
+        store.add(
+            i, e.position, 0.5, Vector2D(), 8.0, e.heading, 70.0, Vector2D(1, 1),
+            0.4, 700.0,
+        )  # fmt: skip
+
+    def op() -> object:
+        store.restore_records(store.pack_records())
+        return store
+
+    return op
+
+
+@case("cell_space.neighbours", number=2_000)
+def cell_space_neighbours() -> Operation:
+    rng = random.Random(0)
+    partition = CellSpacePartition(105, 68, 10, 7)
+    for i in range(200):
+        entity = BaseGameEntity(i)
+        entity.position = Vector2D(rng.uniform(0, 105), rng.uniform(0, 68))
+        partition.add_entity(entity)
+    centre = Vector2D(50, 30)
+
+    def op() -> object:
+        return partition.neighbours(centre, 10.0)
+
+    return op
+
+
+@case("match.tick", number=500)
+def match_tick() -> Operation:
+    pitch = SoccerPitch(seed=0)
+    # get past the kick off into open play
+    pitch.run(300)
+    return pitch.update
+
+
+@case("support_spots.score_64_pitches", number=20)
+def support_spots_score() -> Operation:
+    pitch = SoccerPitch(seed=0)
+    calc = pitch.red_team.support_spots
+    rng = np.random.default_rng(0)
+    pitches = 64
+    spots = np.broadcast_to(calc.spots, (pitches, *calc.spots.shape))
+    attackers = rng.uniform([0, 0], [105, 68], (pitches, 2))
+    opponents = rng.uniform([0, 0], [105, 68], (pitches, 5, 2))
+    speeds = np.full((pitches, 5), 8.0)
+    radii = np.full((pitches, 5), 0.5)
+    goals = np.broadcast_to(calc.goal_targets, (pitches, *calc.goal_targets.shape))
+
+    def op() -> object:
+        return score_support_spots(
+            spots, attackers, opponents, speeds, radii, goals, pitch.params
+        )
+
+    return op
+
+
+@case("passing.safety_64_pitches", number=50)
+def passing_safety() -> Operation:
+    rng = np.random.default_rng(0)
+    pitches, passes, opponents = 64, 4, 5
+    origins = rng.uniform([0, 0], [105, 68], (pitches, 1, 2))
+    targets = rng.uniform([0, 0], [105, 68], (pitches, passes, 2))
+    positions = rng.uniform([0, 0], [105, 68], (pitches, opponents, 2))
+    speeds = np.full((pitches, opponents), 8.0)
+    radii = np.full((pitches, opponents), 0.5)
+
+    def op() -> object:
+        return safe_passes(origins, targets, positions, speeds, radii, 16, -4, 0.5)
+
+    return op
+
+
+@case("ball.future_positions", number=2_000)
+def ball_future_positions() -> Operation:
+    pitch = SoccerPitch(seed=0)
+    ball = pitch.ball
+    ball.kick(Vector2D(1, 0.5), 16.0)
+    times = np.linspace(0, 3, 10)
+
+    def op() -> object:
+        # the ten receivers and interceptors of one tick
+        ball.invalidate_predictions()
+        return [ball.future_position(t) for t in times.tolist()]
+
+    return op
+
+
+@case("steering.calculate", number=500)
+def steering_calculate() -> Operation:
+    pitch = SoccerPitch(seed=0)
+    pitch.run(300)
+    behaviors = [
+        p.steering for p in (*pitch.red_team.players, *pitch.blue_team.players)
+    ]
+    dt = pitch.params.dt
+
+    def op() -> object:
+        return [b.calculate(dt) for b in behaviors]
+
+    return op
+
+
+@case("steering.calculate_batch", number=500)
+def steering_calculate_batch() -> Operation:
+    pitch = SoccerPitch(seed=0)
+    pitch.run(300)
+    behaviors = [
+        p.steering for p in (*pitch.red_team.players, *pitch.blue_team.players)
+    ]
+    dt = pitch.params.dt
+
+    def op() -> object:
+        return calculate_batch(behaviors, dt)
+
+    return op
+
+
+@case("team.aggregates_update", number=5_000)
+def team_aggregates_update() -> Operation:
+    pitch = SoccerPitch(seed=0)
+    pitch.run(300)
+    return pitch.red_team.aggregates.update
+
+
+@case("team.aggregates_update_ordered", number=5_000)
+def team_aggregates_update_ordered() -> Operation:
+    pitch = SoccerPitch(seed=0)
+    pitch.run(300)
+    team = pitch.red_team
+    team.aggregates = TeamAggregates(team, ordered=True)
+    team.aggregates.recompute()
+    return team.aggregates.update
+
+
+@case("cache.run_cached_hit", number=5_000)
+def cache_run_cached_hit() -> Operation:
+    directory = tempfile.TemporaryDirectory()
+    cache = ResultCache(Path(directory.name) / "results.sqlite3")
+    SoccerPitch.run_cached(seed=0, ticks=30, cache=cache)
+
+    def op() -> object:
+        # keeps the directory alive as long as the operation
+        assert directory
+        return SoccerPitch.run_cached(seed=0, ticks=30, cache=cache)
+
+    return op
@@ -0,0 +1,203 @@
+"""
+the per-tick facts a team keeps about its players: who is closest to the
+ball, who is closest to the opponents' goal and who has which role.
+
+by default the closest players are found with a scan of the field
+players. with ordered=True the field players are instead kept ordered by
+distance to the ball and to the goal. the orderings barely change from
+one tick to the next, so they are repaired with an insertion sort, which
+costs one pass when nothing moved past anyone. a repair that needs more
+than max_swaps swaps, after a kick off say, falls back to sorting from
+scratch.
+
+keeping the orderings costs a little more than the scan at every team
+size, since both measure every player each tick, so they are only worth
+it to code that wants more than the closest player.
+benchmarks/bench_aggregates.py compares the two.
+"""
+
+import math
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .common.vector2d import Vector2D
+    from .models import PlayerBase, SoccerTeam
+
+
+def repair_order(order: list[int], keys: list[float], max_swaps: int) -> int:
+    """
+    insertion sorts order, indices into keys, by (key, index). returns the
+    number of swaps, or -1 if it gave up after max_swaps with order only
+    partly sorted
+    """
+    swaps = 0
+    for i in range(1, len(order)):
+        index = order[i]
+        key = keys[index]
+        j = i - 1
+        while j >= 0:
+            other = order[j]
+            other_key = keys[other]
+            if other_key < key or (other_key == key and other < index):
+                break
+            order[j + 1] = other
+            j -= 1
+            swaps += 1
+        order[j + 1] = index
+        if swaps > max_swaps:
+            return -1
+    return swaps
+
+
+class TeamAggregates:
+    """
+    kept by a SoccerTeam, call update() once a tick before the players
+    think. the closest to the goal is only brought up to date when asked
+    for. by_ball and by_goal are only kept when ordered
+    """
+
+    def __init__(self, team: "SoccerTeam", ordered: bool = False) -> None:
+        self.team = team
+        self.ordered = ordered
+        self.field_players: list[PlayerBase] = team.field_players
+        count = len(self.field_players)
+        # indices into field_players, nearest first
+        self.by_ball = list(range(count))
+        self.by_goal = list(range(count))
+        self.ball_dist_sq = [0.0] * count
+        self.goal_dist_sq = [0.0] * count
+        # indices into field_players of the closest, when not ordered
+        self._ball_index = 0 if count else -1
+        self._goal_index = self._ball_index
+        self._goal_tick = -1
+        self.max_swaps = count * count // 4
+
+        # the player the ball was last passed to
+        self.receiving_player: PlayerBase | None = None
+        # the field player running to the best support spot
+        self.supporting_player: PlayerBase | None = None
+
+        # how the orderings were kept up to date
+        self.repairs = 0
+        self.swaps = 0
+        self.recomputes = 0
+
+    @property
+    def closest_to_ball(self) -> "PlayerBase | None":
+        index = self.by_ball[0] if self.ordered and self.by_ball else self._ball_index
+        return None if index < 0 else self.field_players[index]
+
+    @property
+    def closest_to_opponents_goal(self) -> "PlayerBase | None":
+        self._update_goal_order()
+        index = self.by_goal[0] if self.ordered and self.by_goal else self._goal_index
+        return None if index < 0 else self.field_players[index]
+
+    @property
+    def controlling_player(self) -> "PlayerBase | None":
+        return self.team.controlling_player()
+
+    def update(self) -> None:
+        """measures the distances to the ball and finds the closest"""
+        ball = self.team.pitch.ball.position
+        if not self.ordered:
+            self._ball_index = self._measure(self.ball_dist_sq, ball)
+            return
+        x, y = ball.x, ball.y
+        keys = self.ball_dist_sq
+        for i, player in enumerate(self.field_players):
+            position = player.position
+            dx = position.x - x
+            dy = position.y - y
+            keys[i] = dx * dx + dy * dy
+
+        # most ticks nobody passes anybody
+        order = self.by_ball
+        previous, previous_index = -1.0, -1
+        for index in order:
+            key = keys[index]
+            if key < previous or (key == previous and index < previous_index):
+                self._repair(order, keys)
+                return
+            previous, previous_index = key, index
+        self.repairs += 1
+
+    def _update_goal_order(self) -> None:
+        tick = self.team.pitch.tick
+        if self._goal_tick != tick:
+            self._goal_tick = tick
+            index = self._measure(self.goal_dist_sq, self.team.opponents_goal.center)
+            if self.ordered:
+                self._repair(self.by_goal, self.goal_dist_sq)
+            else:
+                self._goal_index = index
+
+    def _measure(self, dist_sq: list[float], target: "Vector2D") -> int:
+        """fills dist_sq, returns the index of the closest or -1 if none"""
+        x, y = target.x, target.y
+        closest, closest_dist_sq = -1, math.inf
+        for i, player in enumerate(self.field_players):
+            position = player.position
+            dx = position.x - x
+            dy = position.y - y
+            d = dist_sq[i] = dx * dx + dy * dy
+            # the lowest index on a tie
+            if d < closest_dist_sq:
+                closest, closest_dist_sq = i, d
+        return closest
+
+    def _repair(self, order: list[int], keys: list[float]) -> None:
+        swaps = repair_order(order, keys, self.max_swaps)
+        if swaps < 0:
+            order.sort(key=lambda i: (keys[i], i))
+            self.recomputes += 1
+        else:
+            self.repairs += 1
+            self.swaps += swaps
+
+    def recompute(self) -> None:
+        """measures from scratch, sorting the orderings if they are kept"""
+        pitch = self.team.pitch
+        self._ball_index = self._measure(self.ball_dist_sq, pitch.ball.position)
+        self._goal_index = self._measure(
+            self.goal_dist_sq, self.team.opponents_goal.center
+        )
+        self._goal_tick = pitch.tick
+        if self.ordered:
+            for order, keys in (
+                (self.by_ball, self.ball_dist_sq),
+                (self.by_goal, self.goal_dist_sq),
+            ):
+                order.sort(key=lambda i: (keys[i], i))
+        self.recomputes += 1
+
+    def check(self) -> list[str]:
+        """
+        the ways the aggregates disagree with the players' current
+        positions, or an empty list if they are consistent. call it after
+        update() and before the players move
+        """
+        problems = []
+        team = self.team
+        pitch = team.pitch
+        self._update_goal_order()
+        for name, order, index, target in (
+            ("ball", self.by_ball, self._ball_index, pitch.ball.position),
+            ("goal", self.by_goal, self._goal_index, team.opponents_goal.center),
+        ):
+            keys = [p.position.distance_sq(target) for p in self.field_players]
+            if self.ordered:
+                expected = sorted(range(len(keys)), key=lambda i: (keys[i], i))
+                if order != expected:
+                    problems.append(f"by_{name} is {order}, expected {expected}")
+                continue
+            expected_index = min(range(len(keys)), key=keys.__getitem__, default=-1)
+            if index != expected_index:
+                problems.append(
+                    f"closest to the {name} is {index}, expected {expected_index}"
+                )
+        for role in ("receiving_player", "supporting_player"):
+            player = getattr(self, role)
+            if player is not None and player.team is not team:
+                problems.append(f"{role} {player.id} is not on the team")
+        return problems
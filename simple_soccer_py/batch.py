@@ -0,0 +1,137 @@
+import time
+from collections.abc import Callable, Generator, Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .models import SoccerPitch
+from .params import Params
+
+# one row per match, filled in by the worker that played it
+SUMMARY_DTYPE = np.dtype(
+    [
+        ("seed", np.int64),
+        ("done", np.bool_),
+        ("ticks", np.int64),
+        ("red_score", np.int32),
+        ("blue_score", np.int32),
+        ("red_possession", np.float64),
+        ("blue_possession", np.float64),
+        ("elapsed", np.float64),
+        ("ticks_per_second", np.float64),
+    ]
+)
+
+SummaryArray = NDArray[np.void]
+
+# the view of the shared results in a worker process, set by _init_worker
+_worker_shm: SharedMemory | None = None
+_worker_results: SummaryArray | None = None
+
+
+def _init_worker(shm_name: str, count: int) -> None:
+    global _worker_shm, _worker_results
+    _worker_shm = SharedMemory(name=shm_name)
+    _worker_results = np.ndarray((count,), dtype=SUMMARY_DTYPE, buffer=_worker_shm.buf)
+
+
+def _play_match(index: int, seed: int, params: Params, ticks: int | None) -> int:
+    """plays one match and writes its summary into row index of the results"""
+    assert _worker_results is not None
+    summary = SoccerPitch(params, seed).run(ticks)
+    row = _worker_results[index]
+    row["seed"] = seed
+    row["ticks"] = summary.ticks
+    row["red_score"] = summary.red_score
+    row["blue_score"] = summary.blue_score
+    row["red_possession"] = summary.red_possession
+    row["blue_possession"] = summary.blue_possession
+    row["elapsed"] = summary.elapsed
+    row["ticks_per_second"] = summary.ticks_per_second
+    row["done"] = True
+    return index
+
+
+class BatchRunner:
+    """
+    plays independent seeded matches on a pool of worker processes.
+
+    the workers write their match summaries straight into a structured
+    array of SUMMARY_DTYPE in shared memory, only the row index of a
+    finished match is sent back. every match is played from its seed
+    alone, so the results do not depend on the number of workers or on
+    which worker played which match.
+    """
+
+    def __init__(
+        self,
+        params: Params | None = None,
+        ticks: int | None = None,
+        max_workers: int | None = None,
+    ) -> None:
+        self.params = params if params is not None else Params()
+        # the ticks to play per match, a full match if None
+        self.ticks = ticks
+        self.max_workers = max_workers
+        # wall time of the last batch, in seconds
+        self.elapsed = 0.0
+
+    def stream(
+        self, seeds: Sequence[int]
+    ) -> Generator[tuple[int, np.void], None, None]:
+        """
+        plays a match for every seed, yielding the row index and a copy of
+        the summary of each match as it finishes
+        """
+        count = len(seeds)
+        if not count:
+            self.elapsed = 0.0
+            return
+
+        start = time.perf_counter()
+        shm = SharedMemory(create=True, size=SUMMARY_DTYPE.itemsize * count)
+        results: SummaryArray | None = None
+        try:
+            results = np.ndarray((count,), dtype=SUMMARY_DTYPE, buffer=shm.buf)
+            results[:] = np.zeros(count, dtype=SUMMARY_DTYPE)
+            with ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(shm.name, count),
+            ) as pool:
+                futures = [
+                    pool.submit(_play_match, i, seed, self.params, self.ticks)
+                    for i, seed in enumerate(seeds)
+                ]
+                try:
+                    for future in as_completed(futures):
+                        index = future.result()
+                        yield index, results[index].copy()
+                finally:
+                    # stops early if the caller stops iterating
+                    pool.shutdown(cancel_futures=True)
+            self.elapsed = time.perf_counter() - start
+        finally:
+            # the view has to go before the shared memory can be closed
+            results = None
+            shm.close()
+            shm.unlink()
+
+    def run(
+        self,
+        seeds: Sequence[int],
+        progress: Callable[[int, int, np.void], None] | None = None,
+    ) -> SummaryArray:
+        """
+        plays a match for every seed and returns their summaries in the
+        order of seeds. progress, if given, is called as
+        progress(finished, total, summary) each time a match finishes
+        """
+        results: SummaryArray = np.zeros(len(seeds), dtype=SUMMARY_DTYPE)
+        for finished, (index, summary) in enumerate(self.stream(seeds), 1):
+            results[index] = summary
+            if progress is not None:
+                progress(finished, len(seeds), summary)
+        return results
@@ -0,0 +1,160 @@
+"""
+runs many continuations of a match from its current state, see
+SoccerPitch.branch.
+
+where os.fork exists every continuation runs in a child process that
+starts as a copy-on-write copy of the parent, so the ticks played so far
+are neither replayed nor copied up front. each child sends its summary
+back through a pipe and exits. at most max_workers children are alive at
+once and the parent keeps nothing of theirs but the summaries, so its
+memory does not grow with the number of continuations.
+
+without fork the state is frozen once with deepcopy and every
+continuation runs in this process on a fresh copy of that snapshot. the
+two give the same summaries.
+"""
+
+import copy
+import os
+import pickle
+import random
+import traceback
+from collections import deque
+from collections.abc import Callable, Sequence
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .models import SoccerPitch
+    from .summary import MatchSummary
+
+Setup = Callable[["SoccerPitch"], object]
+
+
+def continue_match(
+    pitch: "SoccerPitch", seed: int, ticks: int | None, setup: Setup | None
+) -> "MatchSummary":
+    """
+    reseeds pitch, applies setup and plays ticks more updates, or the rest
+    of the match. pitch is changed, pass a copy to keep the original
+    """
+    pitch.seed = seed
+    pitch.rng = random.Random(seed)
+    if setup is not None:
+        setup(pitch)
+    return pitch.run(ticks)
+
+
+def branch(
+    pitch: "SoccerPitch",
+    seeds: Sequence[int],
+    ticks: int | None = None,
+    setup: Setup | None = None,
+    max_workers: int | None = None,
+    fork: bool | None = None,
+) -> list["MatchSummary"]:
+    """
+    the summaries of continuations of pitch from its current state, one
+    per seed in the same order. fork defaults to whether os.fork exists
+    """
+    if fork is None:
+        fork = hasattr(os, "fork")
+    if fork:
+        return _branch_forked(pitch, seeds, ticks, setup, max_workers)
+    return _branch_copied(pitch, seeds, ticks, setup)
+
+
+def _branch_copied(
+    pitch: "SoccerPitch",
+    seeds: Sequence[int],
+    ticks: int | None,
+    setup: Setup | None,
+) -> list["MatchSummary"]:
+    snapshot = copy.deepcopy(pitch)
+    return [
+        continue_match(copy.deepcopy(snapshot), seed, ticks, setup) for seed in seeds
+    ]
+
+
+def _branch_forked(
+    pitch: "SoccerPitch",
+    seeds: Sequence[int],
+    ticks: int | None,
+    setup: Setup | None,
+    max_workers: int | None,
+) -> list["MatchSummary"]:
+    workers = max_workers if max_workers is not None else os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"<branch> max_workers must be positive, not {workers}")
+
+    results: list[MatchSummary | None] = [None] * len(seeds)
+    # (index, pid, read end of the pipe) of the running children
+    running: deque[tuple[int, int, int]] = deque()
+    pending = iter(enumerate(seeds))
+    try:
+        while True:
+            while len(running) < workers:
+                job = next(pending, None)
+                if job is None:
+                    break
+                index, seed = job
+                running.append((index, *_fork_child(pitch, seed, ticks, setup)))
+            if not running:
+                break
+            index, pid, fd = running.popleft()
+            results[index] = _collect(pid, fd, seeds[index])
+    finally:
+        # only left running if collecting one of them failed
+        for _, pid, fd in running:
+            os.close(fd)
+            os.waitpid(pid, 0)
+
+    summaries = []
+    for summary in results:
+        assert summary is not None
+        summaries.append(summary)
+    return summaries
+
+
+def _fork_child(
+    pitch: "SoccerPitch", seed: int, ticks: int | None, setup: Setup | None
+) -> tuple[int, int]:
+    """starts a child playing one continuation, returns its pid and pipe"""
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid:
+        os.close(write_fd)
+        return pid, read_fd
+
+    # the child, it must leave through os._exit so it never runs the
+    # parent's cleanup or returns into its stack
+    status = 0
+    try:
+        os.close(read_fd)
+        try:
+            payload: object = continue_match(pitch, seed, ticks, setup)
+        except BaseException:
+            payload = RuntimeError(traceback.format_exc())
+            status = 1
+        data = pickle.dumps(payload, pickle.HIGHEST_PROTOCOL)
+        with os.fdopen(write_fd, "wb") as pipe:
+            pipe.write(data)
+    finally:
+        os._exit(status)
+
+
+def _collect(pid: int, fd: int, seed: int) -> "MatchSummary":
+    """reads a child's result to the end, then reaps it"""
+    chunks = []
+    with os.fdopen(fd, "rb") as pipe:
+        while chunk := pipe.read(65536):
+            chunks.append(chunk)
+    _, status = os.waitpid(pid, 0)
+    if not chunks:
+        raise RuntimeError(
+            f"<branch> continuation {seed} exited with status {status} and no result"
+        )
+    payload = pickle.loads(b"".join(chunks))
+    if isinstance(payload, BaseException):
+        raise RuntimeError(f"<branch> continuation {seed} failed:\n{payload}")
+    summary: MatchSummary = payload
+    return summary
@@ -0,0 +1,208 @@
+"""
+an on-disk cache of match results, see SoccerPitch.run_cached.
+
+a match is fully determined by its params, seed and ticks and by the
+code of the engine, so the key of a result is a hash of all four. the
+engine is identified by a hash of the source of this package, any
+change to it gives every match a new key and the old results are simply
+never asked for again, until they are evicted.
+
+the results are kept in an sqlite database, at most max_entries of
+them, evicting the least recently used. a hit costs one indexed read;
+the recency of hits is only written back with the next put or flush().
+"""
+
+import atexit
+import dataclasses
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from types import TracebackType
+
+from .params import Params
+from .summary import MatchSummary
+
+PACKAGE_DIR = Path(__file__).parent
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    summary TEXT NOT NULL,
+    replay TEXT,
+    used INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_used ON results (used);
+"""
+
+# the number of hits whose recency is held in memory before it is written
+_MAX_TOUCHED = 1024
+
+
+@functools.cache
+def engine_version() -> str:
+    """a hash of the source of every module of the package"""
+    digest = hashlib.sha256()
+    for path in sorted(PACKAGE_DIR.rglob("*.py")):
+        digest.update(path.relative_to(PACKAGE_DIR).as_posix().encode())
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=64)
+def _params_json(params: Params) -> str:
+    return json.dumps(dataclasses.asdict(params), sort_keys=True)
+
+
+def match_key(params: Params, seed: int, ticks: int, version: str) -> str:
+    """the cache key of ticks of the match of params and seed"""
+    config = f'{{"engine":"{version}","params":{_params_json(params)},'
+    config += f'"seed":{seed},"ticks":{ticks}}}'
+    return hashlib.sha256(config.encode()).hexdigest()
+
+
+def default_cache_path() -> Path:
+    """results.sqlite3 in the user's cache directory"""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "simple_soccer_py" / "results.sqlite3"
+
+
+@dataclass
+class CachedResult:
+    summary: MatchSummary
+    # where the replay of the match was recorded, if it was
+    replay: Path | None
+
+
+class ResultCache:
+    """
+    match summaries by key, with an optional path to a replay of each.
+    version defaults to engine_version(), pass another to keep results
+    apart by something else as well
+    """
+
+    def __init__(
+        self,
+        path: Path | str | None = None,
+        max_entries: int = 100_000,
+        version: str | None = None,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("<ResultCache> max_entries must be positive")
+        self.path = Path(path) if path is not None else default_cache_path()
+        self.max_entries = max_entries
+        self.version = version if version is not None else engine_version()
+        self.hits = 0
+        self.misses = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path)
+        # commits do not wait for the disk, a crash may lose the last few
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        (used,) = self._db.execute("SELECT MAX(used) FROM results").fetchone()
+        # a counter standing in for time, the higher the more recent
+        self._used: int = used or 0
+        # the hits since the last write, by key
+        self._touched: dict[str, int] = {}
+
+    def key(self, params: Params, seed: int, ticks: int) -> str:
+        return match_key(params, seed, ticks, self.version)
+
+    def get(self, key: str) -> CachedResult | None:
+        row = self._db.execute(
+            "SELECT summary, replay FROM results WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._used += 1
+        self._touched[key] = self._used
+        if len(self._touched) >= _MAX_TOUCHED:
+            self.flush()
+        summary, replay = row
+        return CachedResult(
+            MatchSummary(**json.loads(summary)),
+            None if replay is None else Path(replay),
+        )
+
+    def put(self, key: str, summary: MatchSummary, replay: Path | None = None) -> None:
+        """stores summary under key, evicting the least recently used"""
+        self._used += 1
+        self._touched.pop(key, None)
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                (
+                    key,
+                    json.dumps(dataclasses.asdict(summary)),
+                    None if replay is None else str(replay),
+                    self._used,
+                ),
+            )
+            self._write_touched()
+            self._db.execute(
+                "DELETE FROM results WHERE key IN "
+                "(SELECT key FROM results ORDER BY used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def flush(self) -> None:
+        """writes back the recency of the hits since the last write"""
+        if self._touched:
+            with self._db:
+                self._write_touched()
+
+    def _write_touched(self) -> None:
+        self._db.executemany(
+            "UPDATE results SET used = ? WHERE key = ?",
+            [(used, key) for key, used in self._touched.items()],
+        )
+        self._touched.clear()
+
+    def clear(self) -> None:
+        self._touched.clear()
+        with self._db:
+            self._db.execute("DELETE FROM results")
+
+    def __len__(self) -> int:
+        (count,) = self._db.execute("SELECT COUNT(*) FROM results").fetchone()
+        return int(count)
+
+    def __contains__(self, key: str) -> bool:
+        row = self._db.execute("SELECT 1 FROM results WHERE key = ?", (key,))
+        return row.fetchone() is not None
+
+    def close(self) -> None:
+        self.flush()
+        self._db.close()
+
+    def __enter__(self) -> "ResultCache":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+# the cache of run_cached when it is not given one, opened on first use
+_default_cache: ResultCache | None = None
+
+
+def default_cache() -> ResultCache:
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResultCache()
+        atexit.register(_default_cache.close)
+    return _default_cache
@@ -1,11 +1,25 @@
 import math
-import typing
+
+import numpy as np
+from numpy.typing import NDArray
 
 from .vector2d import Vector2D
 
 
 class Matrix:
-    def __init__(self):
+    __slots__ = (
+        "_m11",
+        "_m12",
+        "_m13",
+        "_m21",
+        "_m22",
+        "_m23",
+        "_m31",
+        "_m32",
+        "_m33",
+    )
+
+    def __init__(self) -> None:
         self._m11 = 0.0
         self._m12 = 0.0
         self._m13 = 0.0
@@ -19,184 +33,145 @@ class Matrix:
         self._m33 = 0.0
 
 
+# the elements of the identity in C2DMatrix's (m11, m12, m21, m22, m31, m32) layout
+_IDENTITY = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+
 class C2DMatrix:
-    """2D Matrix class"""
+    """
+    2D Matrix class
+
+    points are row vectors multiplied on the left, so the third column of
+    the 3x3 matrix is always (0, 0, 1) and only the 2x3 affine part
+    (m11, m12, m21, m22, m31, m32) is stored, as a flat tuple.
+    transforms are composed straight into it without temporary matrices.
+    """
+
+    __slots__ = ("_m",)
 
-    def __init__(self):
-        self._matrix = Matrix()
-        self.identity()
+    def __init__(self) -> None:
+        self._m = _IDENTITY
 
-    def __repr__(self):
+    def __repr__(self) -> str:
+        m11, m12, m21, m22, m31, m32 = self._m
         return (
             "Matrix:\n"
-            f"{self._matrix._m11:.4f} {self._matrix._m12:.4f} {self._matrix._m13:.4f}\n"
-            f"{self._matrix._m21:.4f} {self._matrix._m22:.4f} {self._matrix._m23:.4f}\n"
-            f"{self._matrix._m31:.4f} {self._matrix._m32:.4f} {self._matrix._m33:.4f}\n"
+            f"{m11:.4f} {m12:.4f} {0.0:.4f}\n"
+            f"{m21:.4f} {m22:.4f} {0.0:.4f}\n"
+            f"{m31:.4f} {m32:.4f} {1.0:.4f}\n"
         )
 
-    def identity(self):
+    @classmethod
+    def world_transform(
+        cls, heading: Vector2D, side: Vector2D, position: Vector2D
+    ) -> "C2DMatrix":
+        """the transform from an agent's local space to world space"""
+        mat = cls()
+        mat._m = (heading.x, heading.y, side.x, side.y, position.x, position.y)
+        return mat
+
+    @classmethod
+    def local_transform(
+        cls, heading: Vector2D, side: Vector2D, position: Vector2D
+    ) -> "C2DMatrix":
+        """the transform from world space to an agent's local space"""
+        tx = -position.dot(heading)
+        ty = -position.dot(side)
+        mat = cls()
+        mat._m = (heading.x, side.x, heading.y, side.y, tx, ty)
+        return mat
+
+    @property
+    def elements(self) -> tuple[float, float, float, float, float, float]:
+        """the affine part as (m11, m12, m21, m22, m31, m32)"""
+        return self._m
+
+    def identity(self) -> None:
         """create an identity matrix"""
-        self._matrix._m11 = 1.0
-        self._matrix._m12 = 0.0
-        self._matrix._m13 = 0.0
-
-        self._matrix._m21 = 0.0
-        self._matrix._m22 = 1.0
-        self._matrix._m23 = 0.0
-
-        self._matrix._m31 = 0.0
-        self._matrix._m32 = 0.0
-        self._matrix._m33 = 1.0
+        self._m = _IDENTITY
 
     def translate(self, x: float, y: float) -> None:
         """create a transformation matrix"""
-        mat = Matrix()
-
-        mat._m11 = 1
-        mat._m12 = 0
-        mat._m13 = 0
-
-        mat._m21 = 0
-        mat._m22 = 1
-        mat._m23 = 0
-
-        mat._m31 = x
-        mat._m32 = y
-        mat._m33 = 1
-
-        # and multiply
-        self.matrix_multiply(mat)
+        m11, m12, m21, m22, m31, m32 = self._m
+        self._m = (m11, m12, m21, m22, m31 + x, m32 + y)
 
     def scale(self, x_scale: float, y_scale: float) -> None:
         """create a scale matrix"""
-        mat = Matrix()
-
-        mat._m11 = x_scale
-        mat._m12 = 0
-        mat._m13 = 0
-
-        mat._m21 = 0
-        mat._m22 = y_scale
-        mat._m23 = 0
-
-        mat._m31 = 0
-        mat._m32 = 0
-        mat._m33 = 1
-
-        # and multiply
-        self.matrix_multiply(mat)
+        m11, m12, m21, m22, m31, m32 = self._m
+        self._m = (
+            m11 * x_scale,
+            m12 * y_scale,
+            m21 * x_scale,
+            m22 * y_scale,
+            m31 * x_scale,
+            m32 * y_scale,
+        )
 
     def rotate_by_angle(self, rotation: float) -> None:
         """create a rotation matrix"""
-        # 创建旋转矩阵的代码
-        mat = Matrix()
         sin = math.sin(rotation)
         cos = math.cos(rotation)
-
-        mat._m11 = cos
-        mat._m12 = sin
-        mat._m13 = 0
-
-        mat._m21 = -sin
-        mat._m22 = cos
-        mat._m23 = 0
-
-        mat._m31 = 0
-        mat._m32 = 0
-        mat._m33 = 1
-
-        # and multiply
-        self.matrix_multiply(mat)
+        self._multiply(cos, sin, -sin, cos)
 
     def rotate_by_vectors(self, fwd: Vector2D, side: Vector2D) -> None:
         """create a rotation matrix from a fwd and side 2D vector"""
-        # 从 fwd 和 side 2D 向量创建旋转矩阵的代码
-        mat = Matrix()
-
-        mat._m11 = fwd.x
-        mat._m12 = fwd.y
-        mat._m13 = 0
-
-        mat._m21 = side.x
-        mat._m22 = side.y
-        mat._m23 = 0
-
-        mat._m31 = 0
-        mat._m32 = 0
-        mat._m33 = 1
-
-        # and multiply
-        self.matrix_multiply(mat)
+        self._multiply(fwd.x, fwd.y, side.x, side.y)
 
     def transform_vector2ds(self, *points: Vector2D) -> None:
         """applys a transformation matrix to points"""
+        m11, m12, m21, m22, m31, m32 = self._m
         for point in points:
-            temp_x = (
-                self._matrix._m11 * point.x
-                + self._matrix._m21 * point.y
-                + self._matrix._m31
-            )
-            temp_y = (
-                self._matrix._m12 * point.x
-                + self._matrix._m22 * point.y
-                + self._matrix._m32
-            )
-            point.x = temp_x
-            point.y = temp_y
-
-    def matrix_multiply(self, m_in: Matrix) -> None:
-        """multiply two matrices together"""
-        mat_temp = Matrix()
-
-        # first row
-        mat_temp._m11 = (
-            (self._matrix._m11 * m_in._m11)
-            + (self._matrix._m12 * m_in._m21)
-            + (self._matrix._m13 * m_in._m31)
-        )
-        mat_temp._m12 = (
-            (self._matrix._m11 * m_in._m12)
-            + (self._matrix._m12 * m_in._m22)
-            + (self._matrix._m13 * m_in._m32)
-        )
-        mat_temp._m13 = (
-            (self._matrix._m11 * m_in._m13)
-            + (self._matrix._m12 * m_in._m23)
-            + (self._matrix._m13 * m_in._m33)
+            x = point.x
+            y = point.y
+            point.x = m11 * x + m21 * y + m31
+            point.y = m12 * x + m22 * y + m32
+
+    def rotate_vector2ds(self, *vectors: Vector2D) -> None:
+        """
+        applys only the rotation and scale of the matrix,
+        for directions rather than points
+        """
+        m11, m12, m21, m22, _, _ = self._m
+        for vector in vectors:
+            x = vector.x
+            y = vector.y
+            vector.x = m11 * x + m21 * y
+            vector.y = m12 * x + m22 * y
+
+    def apply_to_array(
+        self, points: NDArray[np.float64], translate: bool = True
+    ) -> NDArray[np.float64]:
+        """
+        applys the matrix in place to an (N, 2) float array of points
+        (or of directions when translate is False) and returns it
+        """
+        m11, m12, m21, m22, m31, m32 = self._m
+        x = points[:, 0].copy()
+        y = points[:, 1].copy()
+        points[:, 0] = m11 * x + m21 * y
+        points[:, 1] = m12 * x + m22 * y
+        if translate:
+            points[:, 0] += m31
+            points[:, 1] += m32
+        return points
+
+    def _multiply(self, b11: float, b12: float, b21: float, b22: float) -> None:
+        """multiply by a matrix with no translation"""
+        m11, m12, m21, m22, m31, m32 = self._m
+        self._m = (
+            m11 * b11 + m12 * b21,
+            m11 * b12 + m12 * b22,
+            m21 * b11 + m22 * b21,
+            m21 * b12 + m22 * b22,
+            m31 * b11 + m32 * b21,
+            m31 * b12 + m32 * b22,
         )
 
-        # second
-        mat_temp._m21 = (
-            (self._matrix._m21 * m_in._m11)
-            + (self._matrix._m22 * m_in._m21)
-            + (self._matrix._m23 * m_in._m31)
-        )
-        mat_temp._m22 = (
-            (self._matrix._m21 * m_in._m12)
-            + (self._matrix._m22 * m_in._m22)
-            + (self._matrix._m23 * m_in._m32)
-        )
-        mat_temp._m23 = (
-            (self._matrix._m21 * m_in._m13)
-            + (self._matrix._m22 * m_in._m23)
-            + (self._matrix._m23 * m_in._m33)
-        )
-
-        # third
-        mat_temp._m31 = (
-            (self._matrix._m31 * m_in._m11)
-            + (self._matrix._m32 * m_in._m21)
-            + (self._matrix._m33 * m_in._m31)
-        )
-        mat_temp._m32 = (
-            (self._matrix._m31 * m_in._m12)
-            + (self._matrix._m32 * m_in._m22)
-            + (self._matrix._m33 * m_in._m32)
-        )
-        mat_temp._m33 = (
-            (self._matrix._m31 * m_in._m13)
-            + (self._matrix._m32 * m_in._m23)
-            + (self._matrix._m33 * m_in._m33)
-        )
-
-        self._matrix = mat_temp
+    def matrix_multiply(self, m_in: Matrix) -> None:
+        """
+        multiply two matrices together.
+        m_in must be affine, its third column is taken to be (0, 0, 1)
+        """
+        self._multiply(m_in._m11, m_in._m12, m_in._m21, m_in._m22)
+        m11, m12, m21, m22, m31, m32 = self._m
+        self._m = (m11, m12, m21, m22, m31 + m_in._m31, m32 + m_in._m32)
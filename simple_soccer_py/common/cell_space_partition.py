@@ -0,0 +1,308 @@
+import abc
+from collections.abc import Iterable
+
+from .moving_entity import BaseGameEntity
+from .vector2d import Vector2D
+
+
+class SpacePartition(abc.ABC):
+    """
+    base class for the spatial partitions, subclasses find the candidate
+    entities near a position and this class does the exact range tests
+    """
+
+    def __init__(self) -> None:
+        # the largest bounding radius of any entity ever added,
+        # queries that allow for bounding radii widen their search by it
+        self._max_bounding_radius = 0.0
+        # entities tagged by the last call to tag_neighbours
+        self._tagged: list[BaseGameEntity] = []
+
+    @abc.abstractmethod
+    def __len__(self) -> int:
+        ...
+
+    @abc.abstractmethod
+    def add_entity(self, entity: BaseGameEntity) -> None:
+        ...
+
+    @abc.abstractmethod
+    def remove_entity(self, entity: BaseGameEntity) -> None:
+        ...
+
+    @abc.abstractmethod
+    def update_entity(self, entity: BaseGameEntity) -> bool:
+        """
+        call after an entity has moved. it is only re-bucketed when it has
+        left its cell, returns true if it was
+        """
+
+    @abc.abstractmethod
+    def _candidates(self, position: Vector2D, radius: float) -> list[BaseGameEntity]:
+        """every entity in the cells overlapping the square around position"""
+
+    def _track_radius(self, entity: BaseGameEntity) -> None:
+        if entity.bounding_radius > self._max_bounding_radius:
+            self._max_bounding_radius = entity.bounding_radius
+
+    def add_entities(self, entities: Iterable[BaseGameEntity]) -> None:
+        for entity in entities:
+            self.add_entity(entity)
+
+    def update_entities(self, entities: Iterable[BaseGameEntity]) -> int:
+        """updates every entity, returns how many were re-bucketed"""
+        moved = 0
+        for entity in entities:
+            if self.update_entity(entity):
+                moved += 1
+        return moved
+
+    def neighbours(self, position: Vector2D, radius: float) -> list[BaseGameEntity]:
+        """
+        returns the entities whose position is closer than radius to
+        position. like tag_neighbours, an entity exactly at radius is not
+        a neighbour
+        """
+        radius_sq = radius * radius
+        return [
+            entity
+            for entity in self._candidates(position, radius)
+            if entity.position.distance_sq(position) < radius_sq
+        ]
+
+    def tag_neighbours(
+        self, entity: BaseGameEntity, radius: float
+    ) -> list[BaseGameEntity]:
+        """
+        tags every other entity whose bounding circle overlaps the circle
+        of radius around entity, untagging the ones tagged by the previous
+        call. returns the tagged entities
+        """
+        for previous in self._tagged:
+            previous.untag()
+
+        position = entity.position
+        search = radius + self._max_bounding_radius
+        tagged = []
+        for other in self._candidates(position, search):
+            if other is entity:
+                continue
+            reach = radius + other.bounding_radius
+            if other.position.distance_sq(position) < reach * reach:
+                other.tag()
+                tagged.append(other)
+        self._tagged = tagged
+        return tagged
+
+
+class CellSpacePartition(SpacePartition):
+    """
+    divides the space into a uniform grid of cells_x by cells_y cells, each
+    holding the entities whose position falls in it. positions outside the
+    space are bucketed in the nearest edge cell.
+    """
+
+    def __init__(self, width: float, height: float, cells_x: int, cells_y: int) -> None:
+        super().__init__()
+        self._width = width
+        self._height = height
+        self._cells_x = cells_x
+        self._cells_y = cells_y
+        self._cell_width = width / cells_x
+        self._cell_height = height / cells_y
+        self._cells: list[dict[int, BaseGameEntity]] = [
+            {} for _ in range(cells_x * cells_y)
+        ]
+        # the cell index of every entity, by entity id
+        self._cell_of: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._cell_of)
+
+    def position_to_index(self, position: Vector2D) -> int:
+        """returns the index of the cell containing position"""
+        col = int(position.x / self._cell_width)
+        row = int(position.y / self._cell_height)
+        col = min(max(col, 0), self._cells_x - 1)
+        row = min(max(row, 0), self._cells_y - 1)
+        return row * self._cells_x + col
+
+    def add_entity(self, entity: BaseGameEntity) -> None:
+        if entity.id in self._cell_of:
+            raise ValueError(f"<CellSpacePartition> id {entity.id} already added")
+        index = self.position_to_index(entity.position)
+        self._cells[index][entity.id] = entity
+        self._cell_of[entity.id] = index
+        self._track_radius(entity)
+
+    def remove_entity(self, entity: BaseGameEntity) -> None:
+        index = self._cell_of.pop(entity.id)
+        del self._cells[index][entity.id]
+
+    def update_entity(self, entity: BaseGameEntity) -> bool:
+        old_index = self._cell_of[entity.id]
+        new_index = self.position_to_index(entity.position)
+        if new_index == old_index:
+            return False
+        del self._cells[old_index][entity.id]
+        self._cells[new_index][entity.id] = entity
+        self._cell_of[entity.id] = new_index
+        return True
+
+    def _candidates(self, position: Vector2D, radius: float) -> list[BaseGameEntity]:
+        last_col = self._cells_x - 1
+        last_row = self._cells_y - 1
+        left = min(max(int((position.x - radius) / self._cell_width), 0), last_col)
+        right = min(max(int((position.x + radius) / self._cell_width), 0), last_col)
+        top = min(max(int((position.y - radius) / self._cell_height), 0), last_row)
+        bottom = min(max(int((position.y + radius) / self._cell_height), 0), last_row)
+
+        candidates: list[BaseGameEntity] = []
+        cells = self._cells
+        for row in range(top, bottom + 1):
+            start = row * self._cells_x
+            for index in range(start + left, start + right + 1):
+                cell = cells[index]
+                if cell:
+                    candidates.extend(cell.values())
+        return candidates
+
+    def empty_cells(self) -> None:
+        """removes every entity"""
+        for cell in self._cells:
+            cell.clear()
+        self._cell_of.clear()
+
+
+class _QuadNode:
+    __slots__ = ("left", "top", "right", "bottom", "depth", "entities", "children")
+
+    def __init__(
+        self, left: float, top: float, right: float, bottom: float, depth: int
+    ) -> None:
+        self.left = left
+        self.top = top
+        self.right = right
+        self.bottom = bottom
+        self.depth = depth
+        self.entities: dict[int, BaseGameEntity] = {}
+        self.children: list[_QuadNode] | None = None
+
+    def contains(self, position: Vector2D) -> bool:
+        return (
+            self.left <= position.x < self.right
+            and self.top <= position.y < self.bottom
+        )
+
+    def child_for(self, position: Vector2D) -> "_QuadNode":
+        assert self.children is not None
+        mid_x = (self.left + self.right) / 2
+        mid_y = (self.top + self.bottom) / 2
+        index = (position.x >= mid_x) + 2 * (position.y >= mid_y)
+        return self.children[index]
+
+
+class QuadTreePartition(SpacePartition):
+    """
+    a partition that splits a cell into four once it holds more than
+    max_entities, for spaces where entities bunch together unevenly.
+    positions outside the space are kept in the root cell.
+    """
+
+    def __init__(
+        self,
+        width: float,
+        height: float,
+        max_entities: int = 8,
+        max_depth: int = 8,
+    ) -> None:
+        super().__init__()
+        self._root = _QuadNode(0.0, 0.0, width, height, 0)
+        self._max_entities = max_entities
+        self._max_depth = max_depth
+        # the leaf holding every entity, by entity id
+        self._leaf_of: dict[int, _QuadNode] = {}
+
+    def __len__(self) -> int:
+        return len(self._leaf_of)
+
+    def _leaf(self, position: Vector2D) -> _QuadNode:
+        node = self._root
+        if not node.contains(position):
+            return node
+        while node.children is not None:
+            node = node.child_for(position)
+        return node
+
+    def _insert(self, entity: BaseGameEntity) -> None:
+        node = self._leaf(entity.position)
+        node.entities[entity.id] = entity
+        self._leaf_of[entity.id] = node
+        if (
+            node.children is None
+            and len(node.entities) > self._max_entities
+            and node.depth < self._max_depth
+        ):
+            self._split(node)
+
+    def _split(self, node: _QuadNode) -> None:
+        mid_x = (node.left + node.right) / 2
+        mid_y = (node.top + node.bottom) / 2
+        depth = node.depth + 1
+        node.children = [
+            _QuadNode(node.left, node.top, mid_x, mid_y, depth),
+            _QuadNode(mid_x, node.top, node.right, mid_y, depth),
+            _QuadNode(node.left, mid_y, mid_x, node.bottom, depth),
+            _QuadNode(mid_x, mid_y, node.right, node.bottom, depth),
+        ]
+        entities = node.entities
+        node.entities = {}
+        for entity in entities.values():
+            if node.contains(entity.position):
+                self._insert(entity)
+            else:
+                # outside the space, it stays where it was
+                node.entities[entity.id] = entity
+
+    def add_entity(self, entity: BaseGameEntity) -> None:
+        if entity.id in self._leaf_of:
+            raise ValueError(f"<QuadTreePartition> id {entity.id} already added")
+        self._insert(entity)
+        self._track_radius(entity)
+
+    def remove_entity(self, entity: BaseGameEntity) -> None:
+        node = self._leaf_of.pop(entity.id)
+        del node.entities[entity.id]
+
+    def update_entity(self, entity: BaseGameEntity) -> bool:
+        node = self._leaf_of[entity.id]
+        if node.children is None and node.contains(entity.position):
+            return False
+        if node is self._root and not node.contains(entity.position):
+            return False
+        del node.entities[entity.id]
+        self._insert(entity)
+        return True
+
+    def _candidates(self, position: Vector2D, radius: float) -> list[BaseGameEntity]:
+        left = position.x - radius
+        right = position.x + radius
+        top = position.y - radius
+        bottom = position.y + radius
+
+        candidates: list[BaseGameEntity] = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node.entities:
+                candidates.extend(node.entities.values())
+            if node.children is not None:
+                for child in node.children:
+                    if (
+                        child.left <= right
+                        and child.right >= left
+                        and child.top <= bottom
+                        and child.bottom >= top
+                    ):
+                        stack.append(child)
+        return candidates
@@ -0,0 +1,112 @@
+from collections.abc import Iterable, Iterator, Mapping
+
+from .moving_entity import BaseGameEntity
+from .vector2d import Vector2D
+
+
+class EntityManager(Mapping[int, BaseGameEntity]):
+    """
+    a registry of entities indexed by id, with secondary indexes by type
+    and by tag state that are kept up to date as entities change.
+
+    it is a Mapping from id to entity, so it can be handed straight to
+    a MessageDispatcher to look up receivers.
+    """
+
+    def __init__(self, entities: Iterable[BaseGameEntity] = ()) -> None:
+        self._entities: dict[int, BaseGameEntity] = {}
+        # dicts rather than sets keep the registration order
+        self._by_type: dict[int, dict[int, BaseGameEntity]] = {}
+        self._tagged: dict[int, BaseGameEntity] = {}
+        self.register_many(entities)
+
+    def __getitem__(self, id: int) -> BaseGameEntity:
+        return self._entities[id]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._entities)
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def __contains__(self, id: object) -> bool:
+        return id in self._entities
+
+    def get_entity_from_id(self, id: int) -> BaseGameEntity:
+        """returns the entity with the given id, raises KeyError if none"""
+        return self._entities[id]
+
+    def register(self, entity: BaseGameEntity) -> None:
+        if entity.id in self._entities:
+            raise ValueError(f"<EntityManager> id {entity.id} is already registered")
+        if entity._manager is not None:
+            raise ValueError("<EntityManager> entity belongs to another manager")
+        self._entities[entity.id] = entity
+        self._by_type.setdefault(entity.type, {})[entity.id] = entity
+        if entity.is_tagged():
+            self._tagged[entity.id] = entity
+        entity._manager = self
+
+    def register_many(self, entities: Iterable[BaseGameEntity]) -> None:
+        for entity in entities:
+            self.register(entity)
+
+    def unregister(self, entity: BaseGameEntity) -> None:
+        if self._entities.get(entity.id) is not entity:
+            raise KeyError(entity.id)
+        del self._entities[entity.id]
+        of_type = self._by_type[entity.type]
+        del of_type[entity.id]
+        if not of_type:
+            del self._by_type[entity.type]
+        self._tagged.pop(entity.id, None)
+        entity._manager = None
+
+    def unregister_many(self, entities: Iterable[BaseGameEntity]) -> None:
+        for entity in entities:
+            self.unregister(entity)
+
+    def clear(self) -> None:
+        for entity in self._entities.values():
+            entity._manager = None
+        self._entities.clear()
+        self._by_type.clear()
+        self._tagged.clear()
+
+    def of_type(self, type: int) -> Iterator[BaseGameEntity]:
+        """iterates over the entities of the given type"""
+        return iter(list(self._by_type.get(type, {}).values()))
+
+    def tagged(self) -> Iterator[BaseGameEntity]:
+        """iterates over the tagged entities"""
+        return iter(list(self._tagged.values()))
+
+    def tagged_within_radius(
+        self, position: Vector2D, radius: float
+    ) -> Iterator[BaseGameEntity]:
+        """
+        iterates over the tagged entities whose bounding circle overlaps
+        the circle of the given radius around position.
+        untagged entities are never visited
+        """
+        for entity in list(self._tagged.values()):
+            reach = radius + entity.bounding_radius
+            if entity.position.distance_sq(position) <= reach * reach:
+                yield entity
+
+    def untag_all(self) -> None:
+        for entity in list(self._tagged.values()):
+            entity.untag()
+
+    def _on_tag_changed(self, entity: BaseGameEntity) -> None:
+        if entity.is_tagged():
+            self._tagged[entity.id] = entity
+        else:
+            self._tagged.pop(entity.id, None)
+
+    def _on_type_changed(self, entity: BaseGameEntity, old_type: int) -> None:
+        of_type = self._by_type[old_type]
+        del of_type[entity.id]
+        if not of_type:
+            del self._by_type[old_type]
+        self._by_type.setdefault(entity.type, {})[entity.id] = entity
@@ -0,0 +1,547 @@
+from collections.abc import Sequence
+from typing import Any, Self
+
+import numpy as np
+from numpy.typing import NDArray
+
+from . import serialization
+from .moving_entity import COS_FACING_TOLERANCE, BaseGameEntity, MovingEntity
+from .vector2d import Vector2D
+
+FloatArray = NDArray[np.float64]
+
+# indexes into EntityStore._vectors
+POSITION = 0
+VELOCITY = 1
+HEADING = 2
+SIDE = 3
+SCALE = 4
+
+# indexes into EntityStore._scalars
+MASS = 0
+MAX_SPEED = 1
+MAX_FORCE = 2
+MAX_TURN_RATE = 3
+BOUNDING_RADIUS = 4
+
+# MovingEntity.RECORD as a numpy structured dtype, so that a store can
+# pack and restore its records a column at a time
+RECORD_DTYPE = np.dtype(
+    {
+        "names": [
+            "id", "type", "tag", "position", "scale", "bounding_radius",
+            "velocity", "heading", "mass", "max_speed", "max_force",
+            "max_turn_rate",
+        ],
+        "formats": [
+            "<i8", "<i4", "?", ("<f8", 2), ("<f8", 2), "<f8", ("<f8", 2),
+            ("<f8", 2), "<f8", "<f8", "<f8", "<f8",
+        ],
+        "offsets": [0, 8, 12, 16, 32, 48, 56, 72, 88, 96, 104, 112],
+        "itemsize": MovingEntity.RECORD.size,
+    }
+)  # fmt: skip
+
+# the record fields held in EntityStore._vectors and EntityStore._scalars
+_RECORD_VECTORS = (
+    ("position", POSITION),
+    ("scale", SCALE),
+    ("velocity", VELOCITY),
+    ("heading", HEADING),
+)
+_RECORD_SCALARS = (
+    ("bounding_radius", BOUNDING_RADIUS),
+    ("mass", MASS),
+    ("max_speed", MAX_SPEED),
+    ("max_force", MAX_FORCE),
+    ("max_turn_rate", MAX_TURN_RATE),
+)
+
+
+def truncate_rows(vectors: FloatArray, max_lengths: FloatArray) -> None:
+    """
+    adjusts every row of an (N, 2) array in place so that its length
+    does not exceed the matching entry of max_lengths
+    """
+    lengths = np.hypot(vectors[:, 0], vectors[:, 1])
+    over = lengths > max_lengths
+    if over.any():
+        vectors[over] *= (max_lengths[over] / lengths[over])[:, None]
+
+
+class EntityStore:
+    """
+    structure-of-arrays storage for moving entities.
+
+    every field of MovingEntity lives in a contiguous float64 column,
+    one row per entity, so the whole population can be integrated with
+    a handful of array operations. the MovingEntityView objects handed
+    out by add() keep the MovingEntity property API and read and write
+    their row of the store.
+    """
+
+    def __init__(self, capacity: int = 64) -> None:
+        capacity = max(capacity, 1)
+        self._size = 0
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._vectors: list[FloatArray] = [np.zeros((capacity, 2)) for _ in range(5)]
+        self._scalars: list[FloatArray] = [np.zeros(capacity) for _ in range(5)]
+        self._entities: list[MovingEntityView] = []
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, row: int) -> "MovingEntityView":
+        return self._entities[row]
+
+    @property
+    def capacity(self) -> int:
+        return len(self._ids)
+
+    @property
+    def entities(self) -> list["MovingEntityView"]:
+        """the views in row order"""
+        return self._entities
+
+    @property
+    def ids(self) -> NDArray[np.int64]:
+        return self._ids[: self._size]
+
+    @property
+    def positions(self) -> FloatArray:
+        return self._vectors[POSITION][: self._size]
+
+    @property
+    def velocities(self) -> FloatArray:
+        return self._vectors[VELOCITY][: self._size]
+
+    @property
+    def headings(self) -> FloatArray:
+        return self._vectors[HEADING][: self._size]
+
+    @property
+    def sides(self) -> FloatArray:
+        return self._vectors[SIDE][: self._size]
+
+    @property
+    def scales(self) -> FloatArray:
+        return self._vectors[SCALE][: self._size]
+
+    @property
+    def masses(self) -> FloatArray:
+        return self._scalars[MASS][: self._size]
+
+    @property
+    def max_speeds(self) -> FloatArray:
+        return self._scalars[MAX_SPEED][: self._size]
+
+    @property
+    def max_forces(self) -> FloatArray:
+        return self._scalars[MAX_FORCE][: self._size]
+
+    @property
+    def max_turn_rates(self) -> FloatArray:
+        return self._scalars[MAX_TURN_RATE][: self._size]
+
+    @property
+    def bounding_radii(self) -> FloatArray:
+        return self._scalars[BOUNDING_RADIUS][: self._size]
+
+    def _grow(self) -> None:
+        capacity = self.capacity * 2
+        ids = np.zeros(capacity, dtype=np.int64)
+        ids[: self._size] = self._ids[: self._size]
+        self._ids = ids
+        for i, column in enumerate(self._vectors):
+            vectors = np.zeros((capacity, 2))
+            vectors[: self._size] = column[: self._size]
+            self._vectors[i] = vectors
+        for i, column in enumerate(self._scalars):
+            scalars = np.zeros(capacity)
+            scalars[: self._size] = column[: self._size]
+            self._scalars[i] = scalars
+
+    def add(
+        self,
+        id: int,
+        position: Vector2D,
+        radius: float,
+        velocity: Vector2D,
+        max_speed: float,
+        heading: Vector2D,
+        mass: float,
+        scale: Vector2D,
+        turn_rate: float,
+        max_force: float,
+    ) -> "MovingEntityView":
+        """
+        appends an entity to the store, takes the same arguments as
+        MovingEntity and returns a view onto the new row
+        """
+        if self._size == self.capacity:
+            self._grow()
+        row = self._size
+        self._size += 1
+
+        self._ids[row] = id
+        self._vectors[POSITION][row] = position.x, position.y
+        self._vectors[VELOCITY][row] = velocity.x, velocity.y
+        self._vectors[HEADING][row] = heading.x, heading.y
+        self._vectors[SIDE][row] = -heading.y, heading.x
+        self._vectors[SCALE][row] = scale.x, scale.y
+        self._scalars[MASS][row] = mass
+        self._scalars[MAX_SPEED][row] = max_speed
+        self._scalars[MAX_FORCE][row] = max_force
+        self._scalars[MAX_TURN_RATE][row] = turn_rate
+        self._scalars[BOUNDING_RADIUS][row] = radius
+
+        entity = MovingEntityView(self, row, id)
+        self._entities.append(entity)
+        return entity
+
+    def remove(self, entity: "MovingEntityView") -> None:
+        """
+        removes an entity by moving the last row into its place.
+        the removed view is detached and must not be used afterwards.
+        """
+        if entity._store is not self:
+            raise ValueError("<EntityStore> entity does not belong to this store")
+        row = entity._row
+        last = self._size - 1
+        if row != last:
+            self._ids[row] = self._ids[last]
+            for column in self._vectors:
+                column[row] = column[last]
+            for column in self._scalars:
+                column[row] = column[last]
+            moved = self._entities[last]
+            moved._row = row
+            self._entities[row] = moved
+        self._entities.pop()
+        self._size = last
+        entity._store = None
+
+    def pack_records(self) -> bytearray:
+        """
+        the same buffer as serialization.pack_many(self.entities), built
+        from whole columns rather than one record at a time
+        """
+        n = self._size
+        if not n:
+            raise ValueError("<EntityStore> nothing to pack")
+        records = np.zeros(n, dtype=RECORD_DTYPE)
+        records["id"] = self._ids[:n]
+        # the type and tag are kept by the views rather than the store
+        records["type"] = [entity._type for entity in self._entities]
+        records["tag"] = [entity._tag for entity in self._entities]
+        for name, column in _RECORD_VECTORS:
+            records[name] = self._vectors[column][:n]
+        for name, column in _RECORD_SCALARS:
+            records[name] = self._scalars[column][:n]
+
+        buffer = bytearray(
+            serialization.HEADER.pack(
+                serialization.MAGIC,
+                serialization.FORMAT_VERSION,
+                MovingEntity.RECORD_KIND,
+                RECORD_DTYPE.itemsize,
+                n,
+            )
+        )
+        buffer += records.tobytes()
+        return buffer
+
+    def restore_records(self, buffer: bytes | bytearray | memoryview) -> None:
+        """
+        the same as serialization.unpack_many(buffer, MovingEntity,
+        into=self.entities), restoring whole columns at a time. the
+        records must hold the ids of the store in row order
+        """
+        kind, size, count = serialization.unpack_header(buffer)
+        if kind != MovingEntity.RECORD_KIND or size != RECORD_DTYPE.itemsize:
+            raise ValueError("<EntityStore> buffer does not hold MovingEntity records")
+        n = self._size
+        if count != n:
+            raise ValueError(f"<EntityStore> {count} records for {n} entities")
+        records = np.frombuffer(
+            buffer, dtype=RECORD_DTYPE, count=count, offset=serialization.HEADER.size
+        )
+        if not np.array_equal(records["id"], self._ids[:n]):
+            raise ValueError("<EntityStore> record ids do not match the store")
+
+        for name, column in _RECORD_VECTORS:
+            self._vectors[column][:n] = records[name]
+        for name, column in _RECORD_SCALARS:
+            self._scalars[column][:n] = records[name]
+        heading = self._vectors[HEADING][:n]
+        side = self._vectors[SIDE][:n]
+        side[:, 0] = -heading[:, 1]
+        side[:, 1] = heading[:, 0]
+
+        # through the setters, so an entity manager sees any change
+        types = records["type"].tolist()
+        tags = records["tag"].tolist()
+        for entity, type, tagged in zip(self._entities, types, tags):
+            if entity._type != type:
+                entity.type = type
+            if entity._tag != tagged:
+                if tagged:
+                    entity.tag()
+                else:
+                    entity.untag()
+
+    def integrate(self, dt: float, forces: FloatArray) -> None:
+        """
+        advances every entity by dt under the (N, 2) array of steering
+        forces, the vectorized equivalent of MovingEntity.integrate
+        """
+        n = self._size
+        forces = np.array(forces, dtype=np.float64)
+        if forces.shape != (n, 2):
+            raise ValueError(f"<EntityStore> expected forces of shape ({n}, 2)")
+
+        position = self._vectors[POSITION][:n]
+        velocity = self._vectors[VELOCITY][:n]
+        heading = self._vectors[HEADING][:n]
+        side = self._vectors[SIDE][:n]
+
+        truncate_rows(forces, self._scalars[MAX_FORCE][:n])
+        forces *= (dt / self._scalars[MASS][:n])[:, None]
+        velocity += forces
+        truncate_rows(velocity, self._scalars[MAX_SPEED][:n])
+        position += velocity * dt
+
+        speed_sq = velocity[:, 0] * velocity[:, 0] + velocity[:, 1] * velocity[:, 1]
+        moving = speed_sq > 0.00000001
+        if moving.any():
+            heading[moving] = velocity[moving] / np.sqrt(speed_sq[moving])[:, None]
+            side[moving, 0] = -heading[moving, 1]
+            side[moving, 1] = heading[moving, 0]
+
+    def rotate_heading_to_face_position(
+        self,
+        targets: FloatArray,
+        rows: Sequence[int] | NDArray[np.intp] | None = None,
+    ) -> NDArray[np.bool_]:
+        """
+        the batched form of MovingEntity.rotate_heading_to_face_position.
+
+        rotates the heading, side and velocity of the entities in rows
+        (all entities if None, rows must not repeat) towards the matching
+        row of the (N, 2) targets by no more than their max turn rate.
+
+        returns a mask that is true where the entity already faces its target
+        """
+        if rows is None:
+            rows = np.arange(self._size)
+        rows = np.asarray(rows, dtype=np.intp)
+        targets = np.asarray(targets, dtype=np.float64)
+        if targets.shape != (len(rows), 2):
+            raise ValueError(
+                f"<EntityStore> expected targets of shape ({len(rows)}, 2)"
+            )
+
+        heading = self._vectors[HEADING][rows]
+        to_target = targets - self._vectors[POSITION][rows]
+        length = np.hypot(to_target[:, 0], to_target[:, 1])
+        nonzero = length > 0
+        to_target[nonzero] /= length[nonzero, None]
+        dot = heading[:, 0] * to_target[:, 0] + heading[:, 1] * to_target[:, 1]
+
+        facing = dot > COS_FACING_TOLERANCE
+        turning = ~facing
+        if not turning.any():
+            return facing
+
+        rows = rows[turning]
+        heading = heading[turning]
+        to_target = to_target[turning]
+        dot = dot[turning]
+
+        # clamp the amount to turn to the max turn rate
+        rate = self._scalars[MAX_TURN_RATE][rows]
+        cos_max = np.cos(rate)
+        clamped = dot < cos_max
+        cos = np.where(clamped, cos_max, dot)
+        sin = np.where(clamped, np.sin(rate), np.sqrt(np.maximum(0.0, 1.0 - dot * dot)))
+        # Vector2D.sign of each heading towards its target
+        anticlockwise = (
+            heading[:, 1] * to_target[:, 0] > heading[:, 0] * to_target[:, 1]
+        )
+        sin[anticlockwise] = -sin[anticlockwise]
+
+        velocity = self._vectors[VELOCITY][rows]
+        for vectors, column in ((heading, HEADING), (velocity, VELOCITY)):
+            x = vectors[:, 0]
+            y = vectors[:, 1]
+            self._vectors[column][rows, 0] = cos * x - sin * y
+            self._vectors[column][rows, 1] = sin * x + cos * y
+
+        rotated = self._vectors[HEADING][rows]
+        self._vectors[SIDE][rows, 0] = -rotated[:, 1]
+        self._vectors[SIDE][rows, 1] = rotated[:, 0]
+
+        return facing
+
+
+class _RowVector(Vector2D):
+    """a Vector2D whose components live in one row of an EntityStore column"""
+
+    __slots__ = ("_entity", "_column")
+
+    def __init__(self, entity: "MovingEntityView", column: int) -> None:
+        self._entity = entity
+        self._column = column
+
+    @property
+    def x(self) -> float:
+        entity = self._entity
+        return float(entity._vectors()[self._column][entity._row, 0])
+
+    @x.setter
+    def x(self, value: float) -> None:
+        entity = self._entity
+        entity._vectors()[self._column][entity._row, 0] = value
+
+    @property
+    def y(self) -> float:
+        entity = self._entity
+        return float(entity._vectors()[self._column][entity._row, 1])
+
+    @y.setter
+    def y(self, value: float) -> None:
+        entity = self._entity
+        entity._vectors()[self._column][entity._row, 1] = value
+
+
+class MovingEntityView(MovingEntity):
+    """
+    a MovingEntity backed by a row of an EntityStore, create them with
+    EntityStore.add. assigning a vector property copies its components
+    into the store rather than rebinding it.
+    """
+
+    def __init__(self, store: EntityStore, row: int, id: int) -> None:
+        BaseGameEntity.__init__(self, id)
+        self._store: EntityStore | None = store
+        self._row = row
+
+        self._position = _RowVector(self, POSITION)
+        self._velocity = _RowVector(self, VELOCITY)
+        self._heading = _RowVector(self, HEADING)
+        self._side = _RowVector(self, SIDE)
+        self._scale = _RowVector(self, SCALE)
+
+        self._init_caches()
+
+    @property
+    def row(self) -> int:
+        return self._row
+
+    @property
+    def store(self) -> EntityStore:
+        if self._store is None:
+            raise ValueError("<MovingEntityView> entity was removed from its store")
+        return self._store
+
+    @classmethod
+    def from_record(cls, fields: tuple[Any, ...]) -> Self:
+        raise TypeError(
+            "<MovingEntityView> views are made by EntityStore.add, "
+            "read records into existing views instead"
+        )
+
+    def _vectors(self) -> list[FloatArray]:
+        return self.store._vectors
+
+    def _get_scalar(self, column: int) -> float:
+        return float(self.store._scalars[column][self._row])
+
+    def _set_scalar(self, column: int, value: float) -> None:
+        self.store._scalars[column][self._row] = value
+
+    @property
+    def position(self) -> Vector2D:
+        return self._position
+
+    @position.setter
+    def position(self, new_pos: Vector2D) -> None:
+        self._position.copy_from(new_pos)
+
+    @property
+    def bounding_radius(self) -> float:
+        return self._get_scalar(BOUNDING_RADIUS)
+
+    @bounding_radius.setter
+    def bounding_radius(self, new_radius: float) -> None:
+        self._set_scalar(BOUNDING_RADIUS, new_radius)
+
+    @property
+    def scale(self) -> Vector2D:
+        return self._scale
+
+    @scale.setter
+    def scale(self, new_scale: Vector2D) -> None:
+        self.bounding_radius *= max(new_scale.x, new_scale.y) / max(
+            self._scale.x, self._scale.y
+        )
+        self._scale.copy_from(new_scale)
+
+    @property
+    def velocity(self) -> Vector2D:
+        return self._velocity
+
+    @velocity.setter
+    def velocity(self, new_vel: Vector2D) -> None:
+        self._velocity.copy_from(new_vel)
+
+    @property
+    def mass(self) -> float:
+        return self._get_scalar(MASS)
+
+    @mass.setter
+    def mass(self, new_mass: float) -> None:
+        self._set_scalar(MASS, new_mass)
+
+    @property
+    def side(self) -> Vector2D:
+        return self._side
+
+    @side.setter
+    def side(self, new_side: Vector2D) -> None:
+        self._side.copy_from(new_side)
+
+    @property
+    def max_speed(self) -> float:
+        return self._get_scalar(MAX_SPEED)
+
+    @max_speed.setter
+    def max_speed(self, new_speed: float) -> None:
+        self._set_scalar(MAX_SPEED, new_speed)
+
+    @property
+    def max_force(self) -> float:
+        return self._get_scalar(MAX_FORCE)
+
+    @max_force.setter
+    def max_force(self, mf: float) -> None:
+        self._set_scalar(MAX_FORCE, mf)
+
+    @property
+    def heading(self) -> Vector2D:
+        return self._heading
+
+    @heading.setter
+    def heading(self, new_heading: Vector2D) -> None:
+        assert (new_heading.length_sq() - 1.0) < 0.00001
+        self._heading.copy_from(new_heading)
+        # the side vector must always be perpendicular to the heading
+        self._heading.perp_into(self._side)
+
+    @property
+    def max_turn_rate(self) -> float:
+        return self._get_scalar(MAX_TURN_RATE)
+
+    @max_turn_rate.setter
+    def max_turn_rate(self, val: float) -> None:
+        self._set_scalar(MAX_TURN_RATE, val)
@@ -0,0 +1,113 @@
+import heapq
+import time
+from collections.abc import Callable, Mapping
+from typing import Any
+
+from .moving_entity import BaseGameEntity
+from .telegram import SMALLEST_DELAY, Telegram
+
+
+class MessageDispatcher:
+    """
+    delivers telegrams between entities, looked up by id in `entities`.
+
+    telegrams with no delay are discharged straight away, delayed ones
+    wait in a heap ordered by dispatch time until dispatch_delayed_messages
+    is called at or after that time. a delayed telegram with the same
+    sender, receiver and msg as one already queued within
+    `duplicate_window` seconds, a duplicate by Telegram.is_duplicate, is
+    merged into the queued one.
+    """
+
+    def __init__(
+        self,
+        entities: Mapping[int, BaseGameEntity],
+        clock: Callable[[], float] = time.perf_counter,
+        duplicate_window: float = SMALLEST_DELAY,
+    ) -> None:
+        self._entities = entities
+        self._clock = clock
+        self._duplicate_window = duplicate_window
+
+        # (dispatch_time, sequence, telegram), the sequence keeps
+        # telegrams due at the same time in the order they were sent
+        self._queue: list[tuple[float, int, Telegram]] = []
+        # a plain int rather than itertools.count, which copy.deepcopy of a
+        # pitch no longer supports from python 3.14
+        self._sequence = 0
+        # dispatch times of the queued telegrams by (sender, receiver, msg)
+        self._pending: dict[tuple[int, int, int], list[float]] = {}
+
+    def __len__(self) -> int:
+        """returns the number of delayed telegrams waiting to be sent"""
+        return len(self._queue)
+
+    def _discharge(self, receiver: BaseGameEntity, telegram: Telegram) -> bool:
+        return receiver.handle_message(telegram)
+
+    def dispatch_msg(
+        self,
+        delay: float,
+        sender: int,
+        receiver: int,
+        msg: int,
+        *extra_info: Any,
+    ) -> bool:
+        """
+        sends a message to the receiver, after delay seconds if delay is
+        positive. returns false if the receiver does not exist or the
+        telegram was merged into an identical one already queued
+        """
+        receiver_entity = self._entities.get(receiver)
+        if receiver_entity is None:
+            return False
+
+        if delay <= 0.0:
+            telegram = Telegram(sender, receiver, msg, 0.0, *extra_info)
+            self._discharge(receiver_entity, telegram)
+            return True
+
+        dispatch_time = self._clock() + delay
+        key = (sender, receiver, msg)
+        pending = self._pending.get(key)
+        if pending is None:
+            self._pending[key] = [dispatch_time]
+        else:
+            window = self._duplicate_window
+            for queued_time in pending:
+                if abs(queued_time - dispatch_time) < window:
+                    return False
+            pending.append(dispatch_time)
+
+        telegram = Telegram(sender, receiver, msg, dispatch_time, *extra_info)
+        self._sequence += 1
+        heapq.heappush(self._queue, (dispatch_time, self._sequence, telegram))
+        return True
+
+    def dispatch_delayed_messages(self) -> int:
+        """
+        sends every queued telegram whose dispatch time has passed,
+        returns the number of telegrams sent
+        """
+        queue = self._queue
+        now = self._clock()
+        sent = 0
+        while queue and queue[0][0] <= now:
+            _, _, telegram = heapq.heappop(queue)
+            key = (telegram.sender, telegram.receiver, telegram.msg)
+            pending = self._pending[key]
+            if len(pending) == 1:
+                del self._pending[key]
+            else:
+                pending.remove(telegram.dispatch_time)
+
+            receiver = self._entities.get(telegram.receiver)
+            if receiver is not None:
+                self._discharge(receiver, telegram)
+                sent += 1
+        return sent
+
+    def clear(self) -> None:
+        """drops every queued telegram"""
+        self._queue.clear()
+        self._pending.clear()
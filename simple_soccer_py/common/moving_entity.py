@@ -1,17 +1,30 @@
 import math
+import struct
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, ClassVar, Self
 
+from . import serialization
 from .c2d_matrix import C2DMatrix
 from .telegram import Telegram
-from .utils import clamp
 from .vector2d import Vector2D
 
+if TYPE_CHECKING:
+    from .entity_manager import EntityManager
+
+# the angle below which an entity is considered to face its target
+FACING_TOLERANCE = 0.00001
+COS_FACING_TOLERANCE = math.cos(FACING_TOLERANCE)
+
 
 class BaseGameEntity:
     """
     一个定义了 id，类型，位置，包围半径和缩放比例的实体
     """
 
+    # id, type, tag, position, scale, bounding radius
+    RECORD: ClassVar[struct.Struct] = struct.Struct("<qi?3x5d")
+    RECORD_KIND: ClassVar[int] = serialization.ENTITY_RECORD
+
     def __init__(self, id: int) -> None:
         # each entity has a unique ID
         self._id = id
@@ -26,6 +39,9 @@ class BaseGameEntity:
 
         self._bounding_radius = 0.0
 
+        # the EntityManager this entity is registered with, if any
+        self._manager: "EntityManager | None" = None
+
     def update(self) -> None:
         ...
 
@@ -37,10 +53,44 @@ class BaseGameEntity:
 
     # entities should be able to read/write their data to a stream
     def write(self, path: Path) -> None:
-        ...
+        serialization.write_many([self], path)
 
     def read(self, path: Path) -> None:
-        ...
+        serialization.read_many(path, type(self), into=[self])
+
+    def record_fields(self) -> tuple[Any, ...]:
+        """the values packed by RECORD"""
+        p, s = self.position, self.scale
+        return (
+            self.id,
+            self.type,
+            self.is_tagged(),
+            p.x,
+            p.y,
+            s.x,
+            s.y,
+            self.bounding_radius,
+        )
+
+    def restore_record(self, fields: tuple[Any, ...]) -> None:
+        """sets the state of this entity from values unpacked by RECORD"""
+        id, type, tagged, px, py, sx, sy, radius = fields[:8]
+        if id != self.id:
+            raise ValueError(f"<BaseGameEntity> record id {id} is not {self.id}")
+        self.type = type
+        if tagged:
+            self.tag()
+        else:
+            self.untag()
+        self.position.set(px, py)
+        self.scale.set(sx, sy)
+        self.bounding_radius = radius
+
+    @classmethod
+    def from_record(cls, fields: tuple[Any, ...]) -> Self:
+        entity = cls(fields[0])
+        entity.restore_record(fields)
+        return entity
 
     @property
     def position(self) -> Vector2D:
@@ -66,10 +116,16 @@ class BaseGameEntity:
         return self._tag
 
     def tag(self) -> None:
-        self._tag = True
+        if not self._tag:
+            self._tag = True
+            if self._manager is not None:
+                self._manager._on_tag_changed(self)
 
     def untag(self) -> None:
-        self._tag = False
+        if self._tag:
+            self._tag = False
+            if self._manager is not None:
+                self._manager._on_tag_changed(self)
 
     @property
     def scale(self) -> Vector2D:
@@ -88,10 +144,18 @@ class BaseGameEntity:
 
     @type.setter
     def type(self, new_type: int) -> None:
+        old_type = self._type
         self._type = new_type
+        if self._manager is not None and new_type != old_type:
+            self._manager._on_type_changed(self, old_type)
 
 
 class MovingEntity(BaseGameEntity):
+    # the BaseGameEntity fields then velocity, heading, mass, max speed,
+    # max force and max turn rate
+    RECORD: ClassVar[struct.Struct] = struct.Struct("<qi?3x5d8d")
+    RECORD_KIND: ClassVar[int] = serialization.MOVING_ENTITY_RECORD
+
     def __init__(
         self,
         id: int,
@@ -124,6 +188,18 @@ class MovingEntity(BaseGameEntity):
         self._bounding_radius = radius
         self._scale = scale
 
+        self._init_caches()
+
+    def _init_caches(self) -> None:
+        # values derived from the state above, each stored with the
+        # state it was computed from so it is only recomputed on change
+        self._cached_turn_rate = math.nan
+        self._cached_turn_rate_cos_sin = (1.0, 0.0)
+        self._world_transform_key: tuple[float, ...] = ()
+        self._world_transform = C2DMatrix()
+        self._local_transform_key: tuple[float, ...] = ()
+        self._local_transform = C2DMatrix()
+
     @property
     def velocity(self) -> Vector2D:
         return self._velocity
@@ -136,6 +212,10 @@ class MovingEntity(BaseGameEntity):
     def mass(self) -> float:
         return self._mass
 
+    @mass.setter
+    def mass(self, new_mass: float) -> None:
+        self._mass = new_mass
+
     @property
     def side(self) -> Vector2D:
         return self._side
@@ -183,6 +263,32 @@ class MovingEntity(BaseGameEntity):
         # the side vector must always be perpendicular to the heading
         self._side = self._heading.perp()
 
+    def integrate(self, dt: float, force: Vector2D) -> None:
+        """
+        advances the entity by dt under the given steering force.
+
+        the force is truncated to max_force and the resulting velocity to
+        max_speed, then the heading and side are re-derived from the
+        velocity if the entity is moving.
+        """
+        acceleration = Vector2D(force.x, force.y)
+        acceleration.truncate(self.max_force)
+        acceleration *= dt / self.mass
+
+        velocity = self.velocity
+        velocity += acceleration
+        velocity.truncate(self.max_speed)
+
+        position = self.position
+        position.x += velocity.x * dt
+        position.y += velocity.y * dt
+
+        if velocity.length_sq() > 0.00000001:
+            heading = self.heading
+            heading.copy_from(velocity)
+            heading.normalize()
+            heading.perp_into(self.side)
+
     def rotate_heading_to_face_position(self, target: Vector2D) -> bool:
         """
         given a target position, this method rotates the entity's heading
@@ -193,38 +299,96 @@ class MovingEntity(BaseGameEntity):
         """
         to_target = target - self.position
         to_target.normalize()
-        dot = self.heading.dot(to_target)
-
-        # some compilers lose acurracy
-        # so the value is clamped to ensure it remains valid for the acos
-        dot = clamp(dot, -1, 1)
+        heading = self.heading
+        dot = heading.dot(to_target)
 
-        # first determine the angle between the heading vector and the target
-        angle = math.acos(dot)
-
-        # return true if the player is facing the target
-        if angle < 0.00001:
+        # return true if the player is facing the target,
+        # comparing cosines avoids the acos of the angle between them
+        if dot > COS_FACING_TOLERANCE:
             return True
 
-        # clamp the amount to turn to the max turn rate
-        if angle > self.max_turn_rate:
-            angle = self.max_turn_rate
-
-        # The next few lines use a rotation matrix
-        # to rotate the player's heading vector accordingly
-        rotation_matrix = C2DMatrix()
+        # clamp the amount to turn to the max turn rate, otherwise the
+        # cosine of the angle to turn by is the dot product itself
+        cos_max, sin_max = self._max_turn_rate_cos_sin()
+        if dot < cos_max:
+            cos, sin = cos_max, sin_max
+        else:
+            cos, sin = dot, math.sqrt(max(0.0, 1.0 - dot * dot))
 
         # notice how the direction of rotation has to be determined
-        # when creating the rotation matrix
-        rotation_matrix.rotate_by_angle(angle * self.heading.sign(to_target))
-        rotation_matrix.transform_vector2ds(self.heading)
-        rotation_matrix.transform_vector2ds(self.velocity)
+        sin *= heading.sign(to_target)
+
+        # rotate the heading and velocity in place, this is the
+        # rotation C2DMatrix.rotate_by_angle would build
+        x, y = heading.x, heading.y
+        heading.x = cos * x - sin * y
+        heading.y = sin * x + cos * y
+        velocity = self.velocity
+        x, y = velocity.x, velocity.y
+        velocity.x = cos * x - sin * y
+        velocity.y = sin * x + cos * y
 
         # finally recreate m_vSide
-        self.side = self.heading.perp()
+        self.side = heading.perp()
 
         return False
 
+    def _max_turn_rate_cos_sin(self) -> tuple[float, float]:
+        """cos and sin of max_turn_rate, recomputed only when it changes"""
+        rate = self.max_turn_rate
+        if rate != self._cached_turn_rate:
+            self._cached_turn_rate = rate
+            self._cached_turn_rate_cos_sin = (math.cos(rate), math.sin(rate))
+        return self._cached_turn_rate_cos_sin
+
+    def world_transform(self) -> C2DMatrix:
+        """
+        the transform from the entity's local space to world space,
+        rebuilt only when its position or heading has changed
+        """
+        position, heading, side = self.position, self.heading, self.side
+        key = (position.x, position.y, heading.x, heading.y, side.x, side.y)
+        if key != self._world_transform_key:
+            self._world_transform_key = key
+            self._world_transform = C2DMatrix.world_transform(heading, side, position)
+        return self._world_transform
+
+    def local_transform(self) -> C2DMatrix:
+        """
+        the transform from world space to the entity's local space,
+        rebuilt only when its position or heading has changed
+        """
+        position, heading, side = self.position, self.heading, self.side
+        key = (position.x, position.y, heading.x, heading.y, side.x, side.y)
+        if key != self._local_transform_key:
+            self._local_transform_key = key
+            self._local_transform = C2DMatrix.local_transform(heading, side, position)
+        return self._local_transform
+
+    def point_to_world_space(self, point: Vector2D) -> Vector2D:
+        """transforms a point from the entity's local space into world space"""
+        trans_point = point.copy()
+        self.world_transform().transform_vector2ds(trans_point)
+        return trans_point
+
+    def point_to_local_space(self, point: Vector2D) -> Vector2D:
+        """transforms a point from world space into the entity's local space"""
+        trans_point = point.copy()
+        self.local_transform().transform_vector2ds(trans_point)
+        return trans_point
+
+    def vector_to_world_space(self, vec: Vector2D) -> Vector2D:
+        """transforms a vector from the entity's local space into world space"""
+        trans_vec = vec.copy()
+        self.world_transform().rotate_vector2ds(trans_vec)
+        return trans_vec
+
+    def vector_to_local_space(self, vec: Vector2D) -> Vector2D:
+        """transforms a vector from world space into the entity's local space"""
+        trans_vec = vec.copy()
+        self.local_transform().rotate_vector2ds(trans_vec)
+        return trans_vec
+
     @property
     def max_turn_rate(self) -> float:
         return self._max_turn_rate
@@ -232,3 +396,45 @@ class MovingEntity(BaseGameEntity):
     @max_turn_rate.setter
     def max_turn_rate(self, val: float) -> None:
         self._max_turn_rate = val
+
+    def record_fields(self) -> tuple[Any, ...]:
+        v, h = self.velocity, self.heading
+        return (
+            *super().record_fields(),
+            v.x,
+            v.y,
+            h.x,
+            h.y,
+            self.mass,
+            self.max_speed,
+            self.max_force,
+            self.max_turn_rate,
+        )
+
+    def restore_record(self, fields: tuple[Any, ...]) -> None:
+        super().restore_record(fields)
+        vx, vy, hx, hy, mass, max_speed, max_force, max_turn_rate = fields[8:]
+        self.velocity.set(vx, vy)
+        self.heading.set(hx, hy)
+        self.heading.perp_into(self.side)
+        self.mass = mass
+        self.max_speed = max_speed
+        self.max_force = max_force
+        self.max_turn_rate = max_turn_rate
+
+    @classmethod
+    def from_record(cls, fields: tuple[Any, ...]) -> Self:
+        entity = cls(
+            id=fields[0],
+            position=Vector2D(),
+            radius=0.0,
+            velocity=Vector2D(),
+            max_speed=0.0,
+            heading=Vector2D(1, 0),
+            mass=1.0,
+            scale=Vector2D(1, 1),
+            turn_rate=0.0,
+            max_force=0.0,
+        )
+        entity.restore_record(fields)
+        return entity
@@ -0,0 +1,86 @@
+import random
+import time
+from collections.abc import Callable
+
+
+class Regulator:
+    """
+    use this class to regulate code flow (for an update function say).
+    instantiate the class with the frequency you would like your code
+    section to flow (like 10 times per second) and then only allow the
+    program flow to continue if is_ready() returns true.
+
+    a frequency of zero is never ready and a negative one always is.
+    `clock` gives the time in seconds, pass the simulated time of a
+    pitch to regulate by ticks rather than wall time. the next update
+    time of each call is moved by up to `variator` seconds either way
+    (drawn from `rng`) so that regulators started together drift apart
+    """
+
+    def __init__(
+        self,
+        frequency: float,
+        clock: Callable[[], float] = time.perf_counter,
+        variator: float = 0.0,
+        rng: random.Random | None = None,
+    ) -> None:
+        self._clock = clock
+        self._variator = variator
+        self._rng = rng if rng is not None else random.Random(0)
+        self.frequency = frequency
+        # the first call is always ready
+        self._next_update_time = -float("inf")
+
+    @property
+    def frequency(self) -> float:
+        return self._frequency
+
+    @frequency.setter
+    def frequency(self, frequency: float) -> None:
+        self._frequency = frequency
+        if frequency > 0:
+            self._update_period = 1.0 / frequency
+        elif frequency == 0:
+            self._update_period = 0.0
+        else:
+            self._update_period = -1.0
+
+    @property
+    def update_period(self) -> float:
+        """seconds between updates, 0 if never ready and -1 if always"""
+        return self._update_period
+
+    @property
+    def next_update_time(self) -> float:
+        return self._next_update_time
+
+    @next_update_time.setter
+    def next_update_time(self, time: float) -> None:
+        self._next_update_time = time
+
+    def is_due(self) -> bool:
+        """whether is_ready() would return true, without starting a period"""
+        if self._update_period == 0.0:
+            return False
+        return self._update_period < 0.0 or self._clock() >= self._next_update_time
+
+    def is_ready(self) -> bool:
+        """returns true if the time period has elapsed since the last update"""
+        if self._update_period == 0.0:
+            return False
+        if self._update_period < 0.0:
+            return True
+
+        now = self._clock()
+        if now >= self._next_update_time:
+            self._next_update_time = now + self._update_period
+            if self._variator:
+                self._next_update_time += self._rng.uniform(
+                    -self._variator, self._variator
+                )
+            return True
+        return False
+
+    def reset(self) -> None:
+        """makes the next call to is_ready() return true"""
+        self._next_update_time = -float("inf")
@@ -0,0 +1,191 @@
+import math
+import time
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+
+from .moving_entity import BaseGameEntity
+from .regulator import Regulator
+
+# spreads the first updates of tasks registered together over their period
+GOLDEN_RATIO_CONJUGATE = 0.6180339887498949
+
+
+@dataclass
+class SchedulerStats:
+    ticks: int = 0
+    # task updates run
+    runs: int = 0
+    # due updates left for a later tick because the budget ran out
+    deferred: int = 0
+    # updates skipped because a task fell a whole period or more behind
+    dropped: int = 0
+    # ticks that ran out of budget
+    over_budget_ticks: int = 0
+    # wall time of the last and the slowest tick, in seconds
+    last_tick_time: float = 0.0
+    max_tick_time: float = 0.0
+
+
+class ScheduledTask:
+    """an update function run by an AIScheduler at most `frequency` times a second"""
+
+    def __init__(
+        self, key: Hashable, update: Callable[[], object], regulator: Regulator
+    ) -> None:
+        self.key = key
+        self.update = update
+        self.regulator = regulator
+        self.runs = 0
+        self.deferred = 0
+        self.dropped = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"ScheduledTask({self.key!r}, frequency={self.regulator.frequency},"
+            f" runs={self.runs}, deferred={self.deferred}, dropped={self.dropped})"
+        )
+
+
+class AIScheduler:
+    """
+    time slices expensive updates, such as the AI of many entities, over
+    the ticks of a game so that the cost of a tick stays flat.
+
+    every task has a Regulator on `clock` that says when it is due. each
+    call to update() runs the due tasks round robin, starting from the
+    first one left over last tick, until `budget` seconds of `timer` or
+    `max_tasks` runs are used up. the due tasks left over are deferred to
+    the next tick, and a task that falls one or more whole periods behind
+    has the missed updates dropped rather than run back to back. at least
+    one task runs every tick so nothing starves
+    """
+
+    def __init__(
+        self,
+        budget: float | None = None,
+        max_tasks: int | None = None,
+        clock: Callable[[], float] = time.perf_counter,
+        timer: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.budget = budget
+        self.max_tasks = max_tasks
+        self._clock = clock
+        self._timer = timer
+        self._tasks: list[ScheduledTask] = []
+        self._index: dict[Hashable, ScheduledTask] = {}
+        # the task the next tick starts from
+        self._cursor = 0
+        self.stats = SchedulerStats()
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._index
+
+    def __getitem__(self, key: Hashable) -> ScheduledTask:
+        return self._index[key]
+
+    @property
+    def tasks(self) -> list[ScheduledTask]:
+        return list(self._tasks)
+
+    def register(
+        self,
+        key: Hashable,
+        update: Callable[[], object],
+        frequency: float,
+        phase: float | None = None,
+    ) -> ScheduledTask:
+        """
+        runs update about frequency times a second (every tick if negative).
+        the first run is delayed by phase periods, by default spread so
+        tasks registered together do not all fall due on the same tick
+        """
+        if key in self._index:
+            raise ValueError(f"<AIScheduler> {key!r} is already registered")
+        regulator = Regulator(frequency, self._clock)
+        if phase is None:
+            phase = (len(self._tasks) * GOLDEN_RATIO_CONJUGATE) % 1.0
+        if regulator.update_period > 0:
+            regulator.next_update_time = self._clock() + phase * regulator.update_period
+        task = ScheduledTask(key, update, regulator)
+        self._tasks.append(task)
+        self._index[key] = task
+        return task
+
+    def register_entity(
+        self,
+        entity: BaseGameEntity,
+        frequency: float,
+        update: Callable[[], object] | None = None,
+    ) -> ScheduledTask:
+        """registers entity.update, or update, under the id of entity"""
+        return self.register(
+            entity.id, entity.update if update is None else update, frequency
+        )
+
+    def unregister(self, key: Hashable) -> None:
+        task = self._index.pop(key)
+        index = self._tasks.index(task)
+        del self._tasks[index]
+        if index < self._cursor:
+            self._cursor -= 1
+        if self._cursor >= len(self._tasks):
+            self._cursor = 0
+
+    def update(self) -> int:
+        """runs the due tasks within the budget, returns how many ran"""
+        stats = self.stats
+        stats.ticks += 1
+        start = self._timer()
+        count = len(self._tasks)
+        ran = 0
+        deferred_from = -1
+        now = self._clock()
+
+        for offset in range(count):
+            index = (self._cursor + offset) % count
+            task = self._tasks[index]
+            regulator = task.regulator
+            if not regulator.is_due():
+                continue
+
+            if ran and self._out_of_budget(ran, start):
+                if deferred_from < 0:
+                    deferred_from = index
+                task.deferred += 1
+                stats.deferred += 1
+                continue
+
+            period = regulator.update_period
+            # a regulator that was reset, or only just given a positive
+            # frequency, is due now with nothing to catch up on
+            if period > 0 and math.isfinite(regulator.next_update_time):
+                behind = int((now - regulator.next_update_time) / period)
+                if behind:
+                    task.dropped += behind
+                    stats.dropped += behind
+            regulator.is_ready()
+            task.update()
+            task.runs += 1
+            ran += 1
+
+        if deferred_from >= 0:
+            self._cursor = deferred_from
+            stats.over_budget_ticks += 1
+        stats.runs += ran
+        elapsed = self._timer() - start
+        stats.last_tick_time = elapsed
+        stats.max_tick_time = max(stats.max_tick_time, elapsed)
+        return ran
+
+    def _out_of_budget(self, ran: int, start: float) -> bool:
+        if self.max_tasks is not None and ran >= self.max_tasks:
+            return True
+        return self.budget is not None and self._timer() - start >= self.budget
+
+    def reset_stats(self) -> None:
+        self.stats = SchedulerStats()
+        for task in self._tasks:
+            task.runs = task.deferred = task.dropped = 0
@@ -0,0 +1,122 @@
+"""
+a fixed-layout binary format for entities and walls.
+
+a file is a header followed by count records of one kind, each packed
+with the RECORD struct of its class:
+
+    magic     4s  b"SSPY"
+    version   H   FORMAT_VERSION
+    kind      H   the RECORD_KIND of the records
+    size      I   the size of one record in bytes
+    count     I   the number of records
+
+all values are little endian. EntityStore.pack_records and
+EntityStore.restore_records read and write the same buffers for the
+entities of a store, a column at a time.
+"""
+
+import struct
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, ClassVar, Protocol, Self, TypeVar
+
+MAGIC = b"SSPY"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHII")
+
+# record kinds
+ENTITY_RECORD = 1
+MOVING_ENTITY_RECORD = 2
+WALL_RECORD = 3
+
+
+class Record(Protocol):
+    RECORD: ClassVar[struct.Struct]
+    RECORD_KIND: ClassVar[int]
+
+    def record_fields(self) -> tuple[Any, ...]:
+        ...
+
+    def restore_record(self, fields: tuple[Any, ...]) -> None:
+        ...
+
+    @classmethod
+    def from_record(cls, fields: tuple[Any, ...]) -> Self:
+        ...
+
+
+R = TypeVar("R", bound=Record)
+
+
+def pack_many(objects: Sequence[Record]) -> bytearray:
+    """
+    packs objects, which must all have the same record layout, into a
+    single buffer with a header
+    """
+    if not objects:
+        raise ValueError("<pack_many> nothing to pack")
+    cls = type(objects[0])
+    record = cls.RECORD
+    size = record.size
+
+    buffer = bytearray(HEADER.size + size * len(objects))
+    HEADER.pack_into(
+        buffer, 0, MAGIC, FORMAT_VERSION, cls.RECORD_KIND, size, len(objects)
+    )
+    pack_into = record.pack_into
+    offset = HEADER.size
+    for obj in objects:
+        if obj.RECORD is not record:
+            raise ValueError(
+                f"<pack_many> cannot pack {type(obj).__name__} with {cls.__name__}"
+            )
+        pack_into(buffer, offset, *obj.record_fields())
+        offset += size
+    return buffer
+
+
+def unpack_header(buffer: bytes | bytearray | memoryview) -> tuple[int, int, int]:
+    """checks the header of buffer, returns the kind, size and count"""
+    if len(buffer) < HEADER.size:
+        raise ValueError("<unpack_header> buffer is too short for a header")
+    magic, version, kind, size, count = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError("<unpack_header> not a simple_soccer_py record buffer")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"<unpack_header> unsupported format version {version}")
+    if len(buffer) < HEADER.size + size * count:
+        raise ValueError("<unpack_header> buffer is truncated")
+    return kind, size, count
+
+
+def unpack_many(
+    buffer: bytes | bytearray | memoryview,
+    cls: type[R],
+    into: Sequence[R] | None = None,
+) -> list[R]:
+    """
+    unpacks the records in buffer. with into, the records are restored into
+    those objects in order, otherwise new objects are made with
+    cls.from_record
+    """
+    kind, size, count = unpack_header(buffer)
+    if kind != cls.RECORD_KIND or size != cls.RECORD.size:
+        raise ValueError(f"<unpack_many> buffer does not hold {cls.__name__} records")
+    if into is not None and len(into) != count:
+        raise ValueError(f"<unpack_many> {count} records for {len(into)} objects")
+
+    view = memoryview(buffer)[HEADER.size : HEADER.size + size * count]
+    records = cls.RECORD.iter_unpack(view)
+    if into is None:
+        return [cls.from_record(fields) for fields in records]
+    for obj, fields in zip(into, records):
+        obj.restore_record(fields)
+    return list(into)
+
+
+def write_many(objects: Sequence[Record], path: Path) -> None:
+    Path(path).write_bytes(pack_many(objects))
+
+
+def read_many(path: Path, cls: type[R], into: Sequence[R] | None = None) -> list[R]:
+    return unpack_many(Path(path).read_bytes(), cls, into)
@@ -1,5 +1,9 @@
 from typing import Any
 
+# telegrams for the same sender, receiver and msg whose dispatch times
+# are closer than this are duplicates, see Telegram.is_duplicate
+SMALLEST_DELAY = 0.25
+
 
 class Telegram:
     """
@@ -10,6 +14,8 @@ class Telegram:
     51
     """
 
+    __slots__ = ("sender", "receiver", "msg", "dispatch_time", "extra_info")
+
     def __init__(
         self,
         sender: int,
@@ -35,3 +41,26 @@ class Telegram:
         self.msg = msg
         self.dispatch_time = dispatch_time
         self.extra_info = extra_info
+
+    def __repr__(self) -> str:
+        return (
+            f"Telegram(sender={self.sender}, receiver={self.receiver}, "
+            f"msg={self.msg}, dispatch_time={self.dispatch_time:.3f})"
+        )
+
+    def is_duplicate(self, other: "Telegram", window: float = SMALLEST_DELAY) -> bool:
+        """
+        true if other has the same sender, receiver and msg and a dispatch
+        time less than window away, as Buckland's telegram equality. not
+        transitive, so it is kept apart from == and hashing
+        """
+        return (
+            abs(self.dispatch_time - other.dispatch_time) < window
+            and self.sender == other.sender
+            and self.receiver == other.receiver
+            and self.msg == other.msg
+        )
+
+    def __lt__(self, other: "Telegram") -> bool:
+        """orders by dispatch time, so telegrams can be heap items"""
+        return self.dispatch_time < other.dispatch_time
@@ -0,0 +1,61 @@
+"""
+functions for converting 2D points and vectors between world space and
+the local space of an agent, defined by its heading, side and position
+"""
+
+from .c2d_matrix import C2DMatrix
+from .vector2d import Vector2D
+
+
+def point_to_world_space(
+    point: Vector2D,
+    agent_heading: Vector2D,
+    agent_side: Vector2D,
+    agent_position: Vector2D,
+) -> Vector2D:
+    """transforms a point from the agent's local space into world space"""
+    trans_point = point.copy()
+    C2DMatrix.world_transform(
+        agent_heading, agent_side, agent_position
+    ).transform_vector2ds(trans_point)
+    return trans_point
+
+
+def vector_to_world_space(
+    vec: Vector2D,
+    agent_heading: Vector2D,
+    agent_side: Vector2D,
+) -> Vector2D:
+    """transforms a vector from the agent's local space into world space"""
+    trans_vec = vec.copy()
+    C2DMatrix.world_transform(agent_heading, agent_side, Vector2D()).rotate_vector2ds(
+        trans_vec
+    )
+    return trans_vec
+
+
+def point_to_local_space(
+    point: Vector2D,
+    agent_heading: Vector2D,
+    agent_side: Vector2D,
+    agent_position: Vector2D,
+) -> Vector2D:
+    """transforms a point from world space into the agent's local space"""
+    trans_point = point.copy()
+    C2DMatrix.local_transform(
+        agent_heading, agent_side, agent_position
+    ).transform_vector2ds(trans_point)
+    return trans_point
+
+
+def vector_to_local_space(
+    vec: Vector2D,
+    agent_heading: Vector2D,
+    agent_side: Vector2D,
+) -> Vector2D:
+    """transforms a vector from world space into the agent's local space"""
+    trans_vec = vec.copy()
+    C2DMatrix.local_transform(agent_heading, agent_side, Vector2D()).rotate_vector2ds(
+        trans_vec
+    )
+    return trans_vec
@@ -1,5 +1,28 @@
+from .vector2d import Vector2D
+
+
 def clamp(arg: float, min_val: float, max_val: float) -> float:
     """clamps the first argument between the second two"""
     if min_val >= max_val:
         raise ValueError("<Clamp>MaxVal < MinVal!")
     return max(min_val, min(arg, max_val))
+
+
+def line_intersection_2d(
+    a: Vector2D, b: Vector2D, c: Vector2D, d: Vector2D
+) -> float | None:
+    """
+    given 2 lines in 2D space AB, CD this returns the fraction of the way
+    from A to B at which they intersect, or None if they do not
+    """
+    r_bot = (b.x - a.x) * (d.y - c.y) - (b.y - a.y) * (d.x - c.x)
+    if r_bot == 0:
+        # parallel
+        return None
+    r_top = (a.y - c.y) * (d.x - c.x) - (a.x - c.x) * (d.y - c.y)
+    s_top = (a.y - c.y) * (b.x - a.x) - (a.x - c.x) * (b.y - a.y)
+    r = r_top / r_bot
+    s = s_top / r_bot
+    if 0 < r < 1 and 0 < s < 1:
+        return r
+    return None
@@ -1,11 +1,17 @@
 import math
+from types import TracebackType
 
 
 class Vector2D:
+    __slots__ = ("x", "y")
+
     def __init__(self, x: float = 0, y: float = 0) -> None:
         self.x = x
         self.y = y
 
+    def __repr__(self) -> str:
+        return f"Vector2D({self.x!r}, {self.y!r})"
+
     def __add__(self, other: "Vector2D") -> "Vector2D":
         return Vector2D(self.x + other.x, self.y + other.y)
 
@@ -21,6 +27,28 @@ class Vector2D:
     def __truediv__(self, scalar: float) -> "Vector2D":
         return self.__floatdiv__(scalar)
 
+    # in-place operators mutate the vector instead of allocating a new one
+
+    def __iadd__(self, other: "Vector2D") -> "Vector2D":
+        self.x += other.x
+        self.y += other.y
+        return self
+
+    def __isub__(self, other: "Vector2D") -> "Vector2D":
+        self.x -= other.x
+        self.y -= other.y
+        return self
+
+    def __imul__(self, scalar: float) -> "Vector2D":
+        self.x *= scalar
+        self.y *= scalar
+        return self
+
+    def __itruediv__(self, scalar: float) -> "Vector2D":
+        self.x /= scalar
+        self.y /= scalar
+        return self
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Vector2D):
             return NotImplemented
@@ -31,6 +59,22 @@ class Vector2D:
             return NotImplemented
         return (self.x != other.x) or (self.y != other.y)
 
+    def set(self, x: float, y: float) -> "Vector2D":
+        """sets x and y, returns self so it can be chained"""
+        self.x = x
+        self.y = y
+        return self
+
+    def copy_from(self, v2: "Vector2D") -> "Vector2D":
+        """copies the components of v2 into this vector"""
+        self.x = v2.x
+        self.y = v2.y
+        return self
+
+    def copy(self) -> "Vector2D":
+        """returns a new vector with the same components"""
+        return Vector2D(self.x, self.y)
+
     def zero(self) -> None:
         """sets x and y to zero"""
         self.x = 0
@@ -38,17 +82,17 @@ class Vector2D:
 
     def is_zero(self) -> bool:
         """returns true if both x and y are zero"""
-        return (self.x**2 + self.y**2) < 0.000001
+        return (self.x * self.x + self.y * self.y) < 0.000001
 
     def length_sq(self) -> float:
         """
         returns the squared length of the vector (thereby avoiding the sqrt)
         """
-        return self.x**2 + self.y**2
+        return self.x * self.x + self.y * self.y
 
     def length(self) -> float:
         """returns the length of the vector"""
-        return math.sqrt(self.length_sq())
+        return math.sqrt(self.x * self.x + self.y * self.y)
 
     def normalize(self) -> None:
         """normalizes a 2D Vector"""
@@ -75,6 +119,13 @@ class Vector2D:
         """returns the vector that is perpendicular to this one."""
         return Vector2D(-self.y, self.x)
 
+    def perp_into(self, out: "Vector2D") -> "Vector2D":
+        """writes the perpendicular of this vector into out"""
+        x = self.x
+        out.x = -self.y
+        out.y = x
+        return out
+
     def truncate(self, max: float) -> None:
         """
         adjusts x and y so that the length of the vector does not exceed max
@@ -88,7 +139,9 @@ class Vector2D:
         """
         squared version of distance.
         """
-        return (v2.x - self.x) ** 2 + (v2.y - self.y) ** 2
+        dx = v2.x - self.x
+        dy = v2.y - self.y
+        return dx * dx + dy * dy
 
     def distance(self, v2: "Vector2D") -> float:
         """
@@ -100,9 +153,91 @@ class Vector2D:
         """returns the vector that is the reverse of this vector"""
         return Vector2D(-self.x, -self.y)
 
+    def get_reverse_into(self, out: "Vector2D") -> "Vector2D":
+        """writes the reverse of this vector into out"""
+        out.x = -self.x
+        out.y = -self.y
+        return out
+
     def reflect(self, norm: "Vector2D") -> "Vector2D":
         """
         given a normalized vector this method reflects the vector it is operating upon.
         (like the path of a ball bouncing off a wall)
         """
-        return self + norm.get_reverse() * 2.0 * self.dot(norm)
+        return self.reflect_into(norm, Vector2D())
+
+    def reflect_into(self, norm: "Vector2D", out: "Vector2D") -> "Vector2D":
+        """
+        same as reflect but writes the result into out,
+        out may be this vector to reflect it in place.
+        """
+        d = 2.0 * (self.x * norm.x + self.y * norm.y)
+        out.x = self.x - norm.x * d
+        out.y = self.y - norm.y * d
+        return out
+
+
+class Vector2DPool:
+    """
+    a stack of preallocated scratch vectors for temporaries in hot loops.
+
+    vectors handed out by get() stay valid until the pool is released
+    back past them, so they must not be stored beyond the current frame.
+    """
+
+    __slots__ = ("_vectors", "_top", "_frames")
+
+    def __init__(self, size: int = 64) -> None:
+        self._vectors = [Vector2D() for _ in range(size)]
+        self._top = 0
+        self._frames: list[int] = []
+
+    def __len__(self) -> int:
+        """returns the number of vectors currently handed out"""
+        return self._top
+
+    @property
+    def capacity(self) -> int:
+        return len(self._vectors)
+
+    def get(self, x: float = 0.0, y: float = 0.0) -> Vector2D:
+        """returns a scratch vector set to (x, y), growing the pool if needed"""
+        if self._top == len(self._vectors):
+            self._vectors.append(Vector2D())
+        v = self._vectors[self._top]
+        self._top += 1
+        v.x = x
+        v.y = y
+        return v
+
+    def mark(self) -> int:
+        return self._top
+
+    def release_to(self, mark: int) -> None:
+        """gives back every vector handed out since mark"""
+        if not 0 <= mark <= self._top:
+            raise ValueError("<Vector2DPool> mark out of range")
+        self._top = mark
+
+    def reset(self) -> None:
+        self._top = 0
+        self._frames.clear()
+
+    def frame(self) -> "Vector2DPool":
+        """
+        use as `with pool.frame():` to release the vectors taken
+        inside the with block on exit, frames may be nested
+        """
+        return self
+
+    def __enter__(self) -> "Vector2DPool":
+        self._frames.append(self._top)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self._top = self._frames.pop()
@@ -1,3 +1,9 @@
+import math
+import struct
+from pathlib import Path
+from typing import Any, ClassVar, Self
+
+from . import serialization
 from .vector2d import Vector2D
 
 
@@ -7,6 +13,10 @@ class Wall2D:
     Defined as the two vectors A - B with a perpendicular normal.
     """
 
+    # from, to, normal
+    RECORD: ClassVar[struct.Struct] = struct.Struct("<6d")
+    RECORD_KIND: ClassVar[int] = serialization.WALL_RECORD
+
     def __init__(
         self,
         A: Vector2D,
@@ -16,16 +26,18 @@ class Wall2D:
         self._v_A = A
         self._v_B = B
 
-        # 可以优化
         if N is None:
             self._calculate_normal()
         else:
             self._v_N = N
 
     def _calculate_normal(self) -> None:
-        temp = self._v_B - self._v_A
-        temp.normalize()
-        self._v_N = Vector2D(x=-temp.y, y=temp.x)
+        dx = self._v_B.x - self._v_A.x
+        dy = self._v_B.y - self._v_A.y
+        if (length := math.sqrt(dx * dx + dy * dy)) > 0:
+            dx /= length
+            dy /= length
+        self._v_N = Vector2D(x=-dy, y=dx)
 
     @property
     def from_(self) -> Vector2D:
@@ -59,8 +71,23 @@ class Wall2D:
     def render(self) -> None:
         ...
 
-    def read(self) -> None:
-        ...
+    def read(self, path: Path) -> None:
+        serialization.read_many(path, type(self), into=[self])
 
-    def write(self) -> None:
-        ...
+    def write(self, path: Path) -> None:
+        serialization.write_many([self], path)
+
+    def record_fields(self) -> tuple[Any, ...]:
+        a, b, n = self._v_A, self._v_B, self._v_N
+        return (a.x, a.y, b.x, b.y, n.x, n.y)
+
+    def restore_record(self, fields: tuple[Any, ...]) -> None:
+        ax, ay, bx, by, nx, ny = fields
+        self._v_A = Vector2D(ax, ay)
+        self._v_B = Vector2D(bx, by)
+        self._v_N = Vector2D(nx, ny)
+
+    @classmethod
+    def from_record(cls, fields: tuple[Any, ...]) -> Self:
+        ax, ay, bx, by, nx, ny = fields
+        return cls(Vector2D(ax, ay), Vector2D(bx, by), Vector2D(nx, ny))
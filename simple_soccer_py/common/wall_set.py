@@ -0,0 +1,172 @@
+from collections.abc import Iterable
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .wall2d import Wall2D
+
+FloatArray = NDArray[np.float64]
+IntArray = NDArray[np.intp]
+
+
+class WallSet:
+    """
+    a fixed set of walls packed into contiguous (M, 2) arrays of end points
+    and normals, so that many segments can be tested against every wall
+    in a single array operation.
+
+    the arrays are built once from the Wall2D objects, call rebuild() if
+    any of the walls are changed afterwards.
+    """
+
+    def __init__(self, walls: Iterable[Wall2D]) -> None:
+        self._walls = list(walls)
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        walls = self._walls
+        self._from = np.array([[w.from_.x, w.from_.y] for w in walls]).reshape(-1, 2)
+        self._to = np.array([[w.to.x, w.to.y] for w in walls]).reshape(-1, 2)
+        self._normals = np.array([[w.normal.x, w.normal.y] for w in walls]).reshape(
+            -1, 2
+        )
+        self._direction = self._to - self._from
+
+    def __len__(self) -> int:
+        return len(self._walls)
+
+    @property
+    def walls(self) -> list[Wall2D]:
+        return self._walls
+
+    @property
+    def froms(self) -> FloatArray:
+        return self._from
+
+    @property
+    def tos(self) -> FloatArray:
+        return self._to
+
+    @property
+    def normals(self) -> FloatArray:
+        return self._normals
+
+    def intersect_segments(
+        self, starts: FloatArray, ends: FloatArray
+    ) -> tuple[NDArray[np.bool_], FloatArray]:
+        """
+        tests the N segments starts[i] -> ends[i] against every wall.
+
+        returns an (N, M) mask of the intersections and an (N, M) array of
+        the fraction of the way along each segment at which it crosses each
+        wall, inf where it does not. touching at an end point does not count
+        """
+        a = np.asarray(starts, dtype=np.float64)[:, None, :]
+        b = np.asarray(ends, dtype=np.float64)[:, None, :]
+        c = self._from[None, :, :]
+        d = self._direction[None, :, :]
+        ab = b - a
+        ac = a - c
+
+        r_bot = ab[..., 0] * d[..., 1] - ab[..., 1] * d[..., 0]
+        r_top = ac[..., 1] * d[..., 0] - ac[..., 0] * d[..., 1]
+        s_top = ac[..., 1] * ab[..., 0] - ac[..., 0] * ab[..., 1]
+
+        parallel = r_bot == 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r = r_top / r_bot
+            s = s_top / r_bot
+        hit = ~parallel & (r > 0) & (r < 1) & (s > 0) & (s < 1)
+        return hit, np.where(hit, r, np.inf)
+
+    def closest_hits(
+        self, starts: FloatArray, ends: FloatArray
+    ) -> tuple[IntArray, FloatArray, FloatArray]:
+        """
+        finds the first wall crossed by each of the N segments.
+
+        returns the (N,) wall indexes, -1 where no wall is crossed, the (N,)
+        fractions along the segments of the crossings, inf where there are
+        none, and the (N, 2) crossing points, the segment ends where there
+        are none
+        """
+        starts = np.asarray(starts, dtype=np.float64)
+        ends = np.asarray(ends, dtype=np.float64)
+        n = len(starts)
+        if not len(self._walls):
+            return np.full(n, -1, dtype=np.intp), np.full(n, np.inf), ends.copy()
+
+        _, fractions = self.intersect_segments(starts, ends)
+        index = np.argmin(fractions, axis=1)
+        fraction = fractions[np.arange(n), index]
+        missed = np.isinf(fraction)
+        index[missed] = -1
+        t = np.where(missed, 1.0, fraction)[:, None]
+        points = starts + (ends - starts) * t
+        return index, fraction, points
+
+    def reflect(self, velocities: FloatArray, wall_index: IntArray) -> FloatArray:
+        """
+        reflects the (N, 2) velocities off the walls in wall_index, the
+        array equivalent of Vector2D.reflect with each wall's normal.
+        rows whose index is -1 are returned unchanged
+        """
+        reflected = np.array(velocities, dtype=np.float64)
+        hit = wall_index >= 0
+        if hit.any():
+            normals = self._normals[wall_index[hit]]
+            v = reflected[hit]
+            dot = (v * normals).sum(axis=1)
+            reflected[hit] = v - normals * (2.0 * dot)[:, None]
+        return reflected
+
+    def bounce(
+        self, starts: FloatArray, ends: FloatArray, velocities: FloatArray
+    ) -> tuple[FloatArray, FloatArray, IntArray]:
+        """
+        moves N points from starts to ends, bouncing the ones whose path
+        crosses a wall off the first wall they meet: the end point is
+        mirrored back across the wall and the velocity is reflected.
+
+        returns the new positions, the new velocities and the index of the
+        wall each point bounced off, -1 for none
+        """
+        index, _, _ = self.closest_hits(starts, ends)
+        positions = np.array(ends, dtype=np.float64)
+        hit = index >= 0
+        if hit.any():
+            normals = self._normals[index[hit]]
+            # signed distance of the end points past the wall line
+            past = ((positions[hit] - self._from[index[hit]]) * normals).sum(axis=1)
+            positions[hit] -= normals * (2.0 * past)[:, None]
+        return positions, self.reflect(velocities, index), index
+
+    def feeler_forces(self, positions: FloatArray, feelers: FloatArray) -> FloatArray:
+        """
+        the wall avoidance steering force for N entities, each with F
+        feelers given as an (N, F, 2) array of feeler tips in world space.
+
+        for every feeler that crosses a wall the force is the normal of the
+        closest wall it crosses scaled by how far the feeler overshoots it,
+        the last such feeler of each entity wins as in Buckland's
+        SteeringBehavior::WallAvoidance
+        """
+        positions = np.asarray(positions, dtype=np.float64)
+        feelers = np.asarray(feelers, dtype=np.float64)
+        n, f, _ = feelers.shape
+        starts = np.repeat(positions, f, axis=0)
+        tips = feelers.reshape(n * f, 2)
+        index, _, points = self.closest_hits(starts, tips)
+
+        overshoot = np.hypot(*(tips - points).T)
+        forces = np.zeros((n * f, 2))
+        hit = index >= 0
+        forces[hit] = self._normals[index[hit]] * overshoot[hit, None]
+
+        forces = forces.reshape(n, f, 2)
+        hit = hit.reshape(n, f)
+        # the index of the last feeler of each entity that hit something
+        last = f - 1 - np.argmax(hit[:, ::-1], axis=1)
+        result: FloatArray = forces[np.arange(n), last]
+        result[~hit.any(axis=1)] = 0.0
+        return result
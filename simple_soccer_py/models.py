@@ -1,54 +1,1031 @@
-from common.vector2d import Vector2D
+import enum
+import math
+import random
+import time
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+from numpy.typing import NDArray
+
+from . import branching
+from .aggregates import TeamAggregates
+from .cache import ResultCache, default_cache
+from .common.entity_manager import EntityManager
+from .common.message_dispatcher import MessageDispatcher
+from .common.moving_entity import MovingEntity
+from .common.telegram import Telegram
+from .common.utils import clamp
+from .common.vector2d import Vector2D
+from .common.wall2d import Wall2D
+from .common.wall_set import WallSet
+from .params import Params
+from .passing import pass_safety, time_to_cover_distance
+from .regions import Region, RegionGrid, RegionMode
+from .replay import record_match
+from .steering import MOVEMENT, Behavior, SteeringBehaviors, calculate_batch
+from .summary import MatchSummary
+from .support_spots import SupportSpotCalculator
+
+
+class MessageType(enum.IntEnum):
+    # extra_info: the position the ball was passed to
+    RECEIVE_BALL = 0
+    GO_HOME = 1
+
+
+class EntityType(enum.IntEnum):
+    """the BaseGameEntity.type of everything on the pitch"""
+
+    BALL = 0
+    GOALKEEPER = 1
+    FIELD_PLAYER = 2
+
+
+class PlayerRole(enum.IntEnum):
+    GOALKEEPER = 0
+    FIELD_PLAYER = 1
+
+
+class PlayerState(enum.IntEnum):
+    # move to the home position and track the ball
+    WAIT = 0
+    # run to the ball and kick it
+    CHASE_BALL = 1
+    # run to where a pass was played
+    RECEIVE_BALL = 2
+    # goalkeeper only, stand between the ball and the goal
+    TEND_GOAL = 3
+    # run to the best support spot while a teammate has the ball
+    SUPPORT_ATTACKER = 4
+
+
+class TeamColor(enum.IntEnum):
+    RED = 0
+    BLUE = 1
 
 
 class SoccerPitch:
-    def __init__(self) -> None:
-        self.ball = SoccerBall()
+    """
+    a headless match between a red and a blue team.
+
+    the simulation advances in fixed steps of params.dt seconds, one per
+    call of update(), and never renders. run() plays a number of ticks
+    as fast as possible.
+    """
+
+    def __init__(self, params: Params | None = None, seed: int = 0) -> None:
+        self.params = params if params is not None else Params()
+        self.seed = seed
+        self.rng = random.Random(seed)
 
-        self.red_team = SoccerTeam()
-        self.blue_team = SoccerTeam()
+        # the number of ticks played and the simulated time they took
+        self.tick = 0
+        self.time = 0.0
 
-        self.red_goal = Goal()
-        self.blue_goal = Goal()
+        self.entities = EntityManager()
+        self.dispatcher = MessageDispatcher(self.entities, clock=self._clock)
 
-        self.vec_walls = Wall2D()
-        self.playing_area = Region()
+        p = self.params
+        self.playing_area = Region(0.0, 0.0, p.pitch_width, p.pitch_height)
+        center = self.playing_area.center
+        self.regions = RegionGrid(
+            0.0, 0.0, p.pitch_width, p.pitch_height, p.regions_x, p.regions_y
+        )
 
-        self.game_on = False
+        goal_top = (p.pitch_height - p.goal_width) / 2
+        goal_bottom = (p.pitch_height + p.goal_width) / 2
+        self.red_goal = Goal(
+            Vector2D(0.0, goal_top), Vector2D(0.0, goal_bottom), Vector2D(1, 0)
+        )
+        self.blue_goal = Goal(
+            Vector2D(p.pitch_width, goal_top),
+            Vector2D(p.pitch_width, goal_bottom),
+            Vector2D(-1, 0),
+        )
+
+        self.vec_walls = self._create_walls(goal_top, goal_bottom)
+        self.wall_set = WallSet(self.vec_walls)
+
+        self.ball = SoccerBall(self, center.copy())
+        self.entities.register(self.ball)
+
+        # the red team defends the red goal on the left of the pitch
+        self.red_team = SoccerTeam(
+            self, self.red_goal, self.blue_goal, TeamColor.RED, first_id=1
+        )
+        self.blue_team = SoccerTeam(
+            self,
+            self.blue_goal,
+            self.red_goal,
+            TeamColor.BLUE,
+            first_id=1 + p.players_per_team,
+        )
+        self.red_team.opponents = self.blue_team
+        self.blue_team.opponents = self.red_team
+        self._players = [*self.red_team.players, *self.blue_team.players]
+        self._steering = [player.steering for player in self._players]
+        for team in (self.red_team, self.blue_team):
+            self.entities.register_many(team.players)
+        for player in self._players:
+            player.steering.neighbours = self._players
+
+        # the team whose player touched the ball last
+        self.controlling_team: SoccerTeam | None = None
+        self.possession_ticks = {TeamColor.RED: 0, TeamColor.BLUE: 0}
+
+        # wall time spent in update() over the life of the pitch
+        self.update_time = 0.0
+
+        self.game_on = True
         self.goalkeeper_has_ball = False
 
+    def _clock(self) -> float:
+        return self.time
+
+    def _create_walls(self, goal_top: float, goal_bottom: float) -> list[Wall2D]:
+        """
+        the walls around the pitch, leaving the goal mouths open.
+        every normal points into the pitch
+        """
+        area = self.playing_area
+        top_left = Vector2D(area.left, area.top)
+        top_right = Vector2D(area.right, area.top)
+        bottom_left = Vector2D(area.left, area.bottom)
+        bottom_right = Vector2D(area.right, area.bottom)
+        return [
+            Wall2D(top_left, top_right),
+            Wall2D(top_right, Vector2D(area.right, goal_top)),
+            Wall2D(Vector2D(area.right, goal_bottom), bottom_right),
+            Wall2D(bottom_right, bottom_left),
+            Wall2D(bottom_left, Vector2D(area.left, goal_bottom)),
+            Wall2D(Vector2D(area.left, goal_top), top_left),
+        ]
+
+    @property
+    def red_score(self) -> int:
+        return self.blue_goal.num_goals_scored
+
+    @property
+    def blue_score(self) -> int:
+        return self.red_goal.num_goals_scored
+
+    @property
+    def ticks_per_second(self) -> float:
+        """the simulation speed over every update so far"""
+        return self.tick / self.update_time if self.update_time > 0 else 0.0
+
+    @property
+    def match_ticks(self) -> int:
+        """the number of ticks in a full match"""
+        return round(self.params.match_duration / self.params.dt)
+
     def update(self) -> None:
-        ...
+        """advances the match by one timestep"""
+        start = time.perf_counter()
+        dt = self.params.dt
+
+        self.ball.update(dt)
+        # the teams take turns to move first, the first to reach the ball
+        # in a tick gets to kick it
+        if self.tick % 2:
+            teams = (self.blue_team, self.red_team)
+        else:
+            teams = (self.red_team, self.blue_team)
+        if self.params.batched_steering:
+            # every player decides what to do, then they all move at once
+            for team in teams:
+                team.think()
+            forces = calculate_batch(self._steering, dt)
+            for player, (x, y) in zip(self._players, forces.tolist()):
+                player.move(dt, Vector2D(x, y))
+        else:
+            for team in teams:
+                team.update(dt)
+        self.dispatcher.dispatch_delayed_messages()
+
+        if self.blue_goal.scored(self.ball) or self.red_goal.scored(self.ball):
+            self.kick_off()
+        elif not self.playing_area.inside(self.ball.position):
+            self.ball.put_back_in_play()
+
+        if self.controlling_team is not None:
+            self.possession_ticks[self.controlling_team.color] += 1
+
+        self.tick += 1
+        self.time = self.tick * dt
+        self.update_time += time.perf_counter() - start
+
+    def kick_off(self) -> None:
+        """puts the ball on the centre spot and the players at home"""
+        self.ball.place_at_position(self.playing_area.center)
+        self.dispatcher.clear()
+        self.controlling_team = None
+        self.goalkeeper_has_ball = False
+        for team in (self.red_team, self.blue_team):
+            team.return_all_players_to_home()
+
+    def run(self, ticks: int | None = None) -> MatchSummary:
+        """
+        plays ticks more updates, or the rest of the match if ticks is None,
+        and summarises the match so far
+        """
+        if ticks is None:
+            ticks = max(0, self.match_ticks - self.tick)
+        start = time.perf_counter()
+        update = self.update
+        for _ in range(ticks):
+            update()
+        return self.summary(time.perf_counter() - start, ticks)
+
+    def branch(
+        self,
+        n: int | None = None,
+        seeds: Sequence[int] | None = None,
+        ticks: int | None = None,
+        setup: branching.Setup | None = None,
+        max_workers: int | None = None,
+        fork: bool | None = None,
+    ) -> list[MatchSummary]:
+        """
+        plays n continuations of the match from its current state, each
+        reseeded with one of seeds, range(n) by default, for ticks more
+        updates or the rest of the match, and returns their summaries in
+        the order of seeds. setup is applied to every continuation before
+        it is played, to try a pass that was not taken say.
+
+        the continuations run in forked children, max_workers at a time,
+        or one after another on copies of the pitch where fork is
+        unavailable or fork is false. this pitch is left as it was
+        """
+        if seeds is None:
+            if n is None:
+                raise ValueError("<SoccerPitch> branch needs n or seeds")
+            seeds = range(n)
+        elif n is not None and n != len(seeds):
+            raise ValueError(f"<SoccerPitch> {len(seeds)} seeds for {n} branches")
+        return branching.branch(self, seeds, ticks, setup, max_workers, fork)
+
+    @classmethod
+    def run_cached(
+        cls,
+        params: Params | None = None,
+        seed: int = 0,
+        ticks: int | None = None,
+        cache: ResultCache | None = None,
+        replay: Path | None = None,
+    ) -> MatchSummary:
+        """
+        the summary of ticks of the match of params and seed, or the whole
+        match, from cache if it was played before with the same engine code.
+        cache defaults to the one in the user's cache directory.
+
+        if replay is given the match is recorded there when it is played,
+        and a cached result without a replay, or whose replay file is gone,
+        is played again to record one. cache.get() says where the replay of
+        a cached result is. the elapsed time of a hit is that of the match
+        when it was played
+        """
+        params = params if params is not None else Params()
+        cache = cache if cache is not None else default_cache()
+        if ticks is None:
+            ticks = round(params.match_duration / params.dt)
+        key = cache.key(params, seed, ticks)
+        cached = cache.get(key)
+        if cached is not None and (
+            replay is None or (cached.replay is not None and cached.replay.exists())
+        ):
+            return cached.summary
+
+        pitch = cls(params, seed)
+        if replay is None:
+            summary = pitch.run(ticks)
+        else:
+            start = time.perf_counter()
+            record_match(pitch, replay, ticks)
+            summary = pitch.summary(time.perf_counter() - start, ticks)
+        cache.put(key, summary, replay)
+        return summary
+
+    def summary(self, elapsed: float, ticks: int | None = None) -> MatchSummary:
+        played = max(self.tick, 1)
+        return MatchSummary(
+            seed=self.seed,
+            ticks=self.tick if ticks is None else ticks,
+            red_score=self.red_score,
+            blue_score=self.blue_score,
+            red_possession=self.possession_ticks[TeamColor.RED] / played,
+            blue_possession=self.possession_ticks[TeamColor.BLUE] / played,
+            elapsed=elapsed,
+        )
 
     def render(self) -> None:
         ...
 
 
-class SoccerBall:
-    ...
+class SoccerBall(MovingEntity):
+    def __init__(self, pitch: SoccerPitch, position: Vector2D) -> None:
+        p = pitch.params
+        super().__init__(
+            id=0,
+            position=position,
+            radius=p.ball_radius,
+            velocity=Vector2D(),
+            max_speed=math.inf,
+            heading=Vector2D(1, 0),
+            mass=p.ball_mass,
+            scale=Vector2D(1, 1),
+            turn_rate=0.0,
+            max_force=math.inf,
+        )
+        self.pitch = pitch
+        self.type = EntityType.BALL
+        # the position at the start of the current tick
+        self.old_position = position.copy()
+        # the player who touched the ball last
+        self.owner: PlayerBase | None = None
+        # the tick of the last kick, the ball can only be kicked once a tick
+        self.kick_tick = -1
+
+        # predictions of the current tick, cleared whenever the ball moves,
+        # is kicked or bounces
+        self._future_positions: dict[float, Vector2D] = {}
+        self._predictions_tick = -1
+        self._kinematics: tuple[float, ...] | None = None
+
+    def invalidate_predictions(self) -> None:
+        """forgets the predictions, call after changing the ball's motion"""
+        self._future_positions.clear()
+        self._kinematics = None
+
+    def _check_predictions(self) -> None:
+        if self._predictions_tick != self.pitch.tick:
+            self._predictions_tick = self.pitch.tick
+            self.invalidate_predictions()
+
+    def kinematics(self) -> tuple[float, ...]:
+        """
+        (x, y, heading x, heading y, speed, time to stop) of the ball's
+        motion, worked out once a tick
+        """
+        self._check_predictions()
+        if self._kinematics is None:
+            velocity = self.velocity
+            speed = velocity.length()
+            hx, hy = (velocity.x / speed, velocity.y / speed) if speed else (0.0, 0.0)
+            stop_time = speed / -self.pitch.params.friction if speed else 0.0
+            self._kinematics = (
+                self.position.x,
+                self.position.y,
+                hx,
+                hy,
+                speed,
+                stop_time,
+            )
+        return self._kinematics
+
+    def future_position(self, time: float) -> Vector2D:
+        """
+        where the ball will be in time seconds if nothing touches it. it
+        slows at the friction deceleration and stays put once stopped,
+        walls are not accounted for
+        """
+        self._check_predictions()
+        cached = self._future_positions.get(time)
+        if cached is None:
+            x, y, hx, hy, speed, stop_time = self.kinematics()
+            t = min(max(time, 0.0), stop_time)
+            # s = ut + 1/2at^2
+            distance = speed * t + 0.5 * self.pitch.params.friction * t * t
+            cached = Vector2D(x + hx * distance, y + hy * distance)
+            self._future_positions[time] = cached
+        return cached.copy()
+
+    def future_positions(self, times: NDArray[np.float64]) -> NDArray[np.float64]:
+        """future_position for an array of times, returns (..., 2)"""
+        x, y, hx, hy, speed, stop_time = self.kinematics()
+        t = np.clip(np.asarray(times, dtype=np.float64), 0.0, stop_time)
+        distance = speed * t + 0.5 * self.pitch.params.friction * t * t
+        positions: NDArray[np.float64] = np.empty((*distance.shape, 2))
+        positions[..., 0] = x + hx * distance
+        positions[..., 1] = y + hy * distance
+        return positions
+
+    def time_to_cover_distance(self, a: Vector2D, b: Vector2D, force: float) -> float:
+        """
+        the time the ball takes to roll from a to b when kicked with force,
+        or inf if friction stops it first. it does not depend on the ball's
+        own motion, so unlike future_position it is not memoized
+        """
+        return self._time_to_cover(a.distance(b), force)
+
+    def times_to_cover_distances(
+        self, distances: NDArray[np.float64], force: float
+    ) -> NDArray[np.float64]:
+        """time_to_cover_distance for an array of distances"""
+        return time_to_cover_distance(
+            distances, force / self.mass, self.pitch.params.friction
+        )
+
+    def _time_to_cover(self, distance: float, force: float) -> float:
+        speed = force / self.mass
+        # v^2 = u^2 + 2as
+        v_sq = speed * speed + 2.0 * self.pitch.params.friction * distance
+        if v_sq < 0:
+            return math.inf
+        return (math.sqrt(v_sq) - speed) / self.pitch.params.friction
+
+    def update(self, dt: float = Params.dt) -> None:
+        """rolls the ball for dt seconds and bounces it off the walls"""
+        position = self.position
+        velocity = self.velocity
+        self.old_position.copy_from(position)
+        self.invalidate_predictions()
+
+        speed = velocity.length()
+        slowdown = -self.pitch.params.friction * dt
+        if speed <= slowdown:
+            velocity.zero()
+            return
+        velocity *= (speed - slowdown) / speed
+
+        position.x += velocity.x * dt
+        position.y += velocity.y * dt
+        self.heading.set(velocity.x, velocity.y).normalize()
+
+        # the walls are on the edge of the playing area so the ball can
+        # only have hit one if it has left it
+        if not self.pitch.playing_area.inside(position):
+            self._test_collision_with_walls()
+
+    def _test_collision_with_walls(self) -> None:
+        old, new, vel = self.old_position, self.position, self.velocity
+        positions, velocities, index = self.pitch.wall_set.bounce(
+            np.array([[old.x, old.y]]),
+            np.array([[new.x, new.y]]),
+            np.array([[vel.x, vel.y]]),
+        )
+        if index[0] >= 0:
+            new.set(*positions[0].tolist())
+            vel.set(*velocities[0].tolist())
+            self.invalidate_predictions()
+
+    def kick(self, direction: Vector2D, force: float) -> None:
+        """applys a force to the ball in the direction of heading"""
+        direction = direction.copy()
+        direction.normalize()
+        # the ball starts from rest as far as the kick is concerned
+        self.velocity.copy_from(direction * (force / self.mass))
+        self.invalidate_predictions()
+
+    def place_at_position(self, position: Vector2D) -> None:
+        """stops the ball at the given position"""
+        self.position.copy_from(position)
+        self.old_position.copy_from(position)
+        self.velocity.zero()
+        self.owner = None
+        self.invalidate_predictions()
+
+    def put_back_in_play(self) -> None:
+        """stops the ball just inside the pitch after it has gone out"""
+        area = self.pitch.playing_area
+        margin = self.bounding_radius
+        position = Vector2D(
+            clamp(self.position.x, area.left + margin, area.right - margin),
+            clamp(self.position.y, area.top + margin, area.bottom - margin),
+        )
+        self.place_at_position(position)
 
 
 class SoccerTeam:
-    ...
+    def __init__(
+        self,
+        pitch: SoccerPitch,
+        home_goal: "Goal",
+        opponents_goal: "Goal",
+        color: TeamColor,
+        first_id: int,
+    ) -> None:
+        self.pitch = pitch
+        self.home_goal = home_goal
+        self.opponents_goal = opponents_goal
+        self.color = color
+        # set by the pitch once both teams exist
+        self.opponents: SoccerTeam = self
+
+        self.players = self._create_players(first_id)
+        # the closest players and the roles, see aggregates.py
+        self.aggregates = TeamAggregates(self)
+        self.support_spots = SupportSpotCalculator(self)
+
+    def _create_players(self, first_id: int) -> list["PlayerBase"]:
+        p = self.pitch.params
+        players: list[PlayerBase] = []
+        for i, (depth, width) in enumerate(formation(p.players_per_team)):
+            home = self._to_pitch(depth, width)
+            role = PlayerRole.GOALKEEPER if i == 0 else PlayerRole.FIELD_PLAYER
+            players.append(PlayerBase(self, first_id + i, home, role))
+        return players
+
+    def _to_pitch(self, depth: float, width: float) -> Vector2D:
+        """
+        converts a position given as a fraction of the pitch length from
+        this team's goal and a fraction of the pitch width into pitch space
+        """
+        p = self.pitch.params
+        x = depth * p.pitch_width
+        if self.home_goal.facing.x < 0:
+            x = p.pitch_width - x
+        return Vector2D(x, width * p.pitch_height)
+
+    @property
+    def receiving_player(self) -> "PlayerBase | None":
+        """the player the ball was last passed to"""
+        return self.aggregates.receiving_player
+
+    @receiving_player.setter
+    def receiving_player(self, player: "PlayerBase | None") -> None:
+        self.aggregates.receiving_player = player
+
+    @property
+    def supporting_player(self) -> "PlayerBase | None":
+        """the field player running to the best support spot"""
+        return self.aggregates.supporting_player
+
+    @supporting_player.setter
+    def supporting_player(self, player: "PlayerBase | None") -> None:
+        self.aggregates.supporting_player = player
+
+    @property
+    def closest_player_to_ball(self) -> "PlayerBase | None":
+        """the field player closest to the ball, updated every tick"""
+        return self.aggregates.closest_to_ball
+
+    @property
+    def goalkeeper(self) -> "PlayerBase":
+        return self.players[0]
+
+    @property
+    def field_players(self) -> list["PlayerBase"]:
+        return self.players[1:]
+
+    def in_control(self) -> bool:
+        return self.pitch.controlling_team is self
+
+    def in_opponents_half(self, position: Vector2D) -> bool:
+        """true if position is in the half of the pitch this team attacks"""
+        halfway = self.pitch.playing_area.center.x
+        return (position.x - halfway) * self.home_goal.facing.x > 0
+
+    def positions(self) -> NDArray[np.float64]:
+        """the (players, 2) positions of the players"""
+        return np.array([(p.position.x, p.position.y) for p in self.players])
+
+    def players_in_opponents_half(self) -> NDArray[np.bool_]:
+        """in_opponents_half for every player"""
+        halfway = self.pitch.playing_area.center.x
+        mask: NDArray[np.bool_] = (
+            self.positions()[:, 0] - halfway
+        ) * self.home_goal.facing.x > 0
+        return mask
+
+    def player_regions(self) -> NDArray[np.intp]:
+        """the region every player is in"""
+        return self.pitch.regions.regions_of(self.positions())
+
+    def set_home_regions(self, region_ids: Sequence[int]) -> None:
+        """moves the home of every player to the centre of a region"""
+        if len(region_ids) != len(self.players):
+            raise ValueError(
+                f"<SoccerTeam> {len(region_ids)} regions for"
+                f" {len(self.players)} players"
+            )
+        for player, region_id in zip(self.players, region_ids):
+            player.set_home_region(region_id)
+
+    def update(self, dt: float) -> None:
+        self.aggregates.update()
+        self.supporting_player = self._determine_supporting_player()
+        for player in self.players:
+            player.update(dt)
+
+    def think(self) -> None:
+        """update without moving the players, whose steering is batched"""
+        self.aggregates.update()
+        self.supporting_player = self._determine_supporting_player()
+        for player in self.players:
+            player.think()
+
+    def controlling_player(self) -> "PlayerBase | None":
+        """the player of this team who touched the ball last, if in control"""
+        owner = self.pitch.ball.owner
+        if owner is None or owner.team is not self or not self.in_control():
+            return None
+        return owner
+
+    def _determine_supporting_player(self) -> "PlayerBase | None":
+        """
+        the field player, other than the one with the ball and the one
+        going to it, closest to the best support spot
+        """
+        attacker = self.controlling_player()
+        if attacker is None:
+            return None
+        spot = self.support_spots.determine_best_supporting_position(attacker.position)
+        if spot is None:
+            return None
+        busy = (attacker, self.closest_player_to_ball, self.receiving_player)
+        closest = None
+        closest_dist_sq = math.inf
+        for player in self.field_players:
+            if player in busy:
+                continue
+            dist_sq = player.position.distance_sq(spot)
+            if dist_sq < closest_dist_sq:
+                closest_dist_sq = dist_sq
+                closest = player
+        return closest
+
+    def return_all_players_to_home(self) -> None:
+        self.receiving_player = None
+        self.supporting_player = None
+        self.support_spots.reset()
+        for player in self.players:
+            player.place_at_home()
+        self.aggregates.recompute()
+
+    def lost_control(self) -> None:
+        self.receiving_player = None
+
+    def find_pass(self, passer: "PlayerBase") -> "PlayerBase | None":
+        """
+        the teammate closest to the opponents' goal among those nearer to it
+        than the passer who can be passed to safely, or None if there are none
+        """
+        goal = self.opponents_goal.center
+        passer_dist_sq = passer.position.distance_sq(goal)
+        candidates = [
+            player
+            for player in self.field_players
+            if player is not passer
+            and player.position.distance_sq(goal) < passer_dist_sq
+        ]
+        if not candidates:
+            return None
+
+        p = self.pitch.params
+        targets = np.array([(c.position.x, c.position.y) for c in candidates])
+        safe = pass_safety(
+            self.pitch.ball.position,
+            targets,
+            self.opponents.players,
+            p.max_passing_force / p.ball_mass,
+            p.friction,
+            p.ball_radius,
+        )
+        best = None
+        best_dist_sq = passer_dist_sq
+        for player, is_safe in zip(candidates, safe):
+            dist_sq = player.position.distance_sq(goal)
+            if is_safe and dist_sq < best_dist_sq:
+                best_dist_sq = dist_sq
+                best = player
+        return best
+
+
+def formation(players: int) -> list[tuple[float, float]]:
+    """
+    the home positions of a team of the given size, as (depth, width)
+    fractions of the pitch length from the team's own goal and of the pitch
+    width. the first position is the goalkeeper's
+    """
+    positions = [(0.02, 0.5)]
+    field = players - 1
+    if field <= 0:
+        return positions[:players]
+    lines = 1 if field <= 2 else 2 if field <= 6 else 3
+    per_line = math.ceil(field / lines)
+    for line in range(lines):
+        depth = 0.15 + 0.3 * (line + 1) / (lines + 1)
+        count = min(per_line, field - line * per_line)
+        for i in range(count):
+            positions.append((depth, (i + 1) / (count + 1)))
+    return positions
+
+
+class PlayerBase(MovingEntity):
+    def __init__(
+        self,
+        team: SoccerTeam,
+        id: int,
+        home: Vector2D,
+        role: PlayerRole,
+    ) -> None:
+        p = team.pitch.params
+        heading = Vector2D(team.home_goal.facing.x, team.home_goal.facing.y)
+        super().__init__(
+            id=id,
+            position=home.copy(),
+            radius=p.player_radius,
+            velocity=Vector2D(),
+            max_speed=p.player_max_speed,
+            heading=heading,
+            mass=p.player_mass,
+            scale=Vector2D(1, 1),
+            turn_rate=p.player_max_turn_rate,
+            max_force=p.player_max_force,
+        )
+        self.team = team
+        self.pitch = team.pitch
+        self.home = home
+        # the region containing the home position
+        self.home_region = self.pitch.regions.region_of(home)
+        self.role = role
+        self.type = (
+            EntityType.GOALKEEPER
+            if role == PlayerRole.GOALKEEPER
+            else EntityType.FIELD_PLAYER
+        )
+        self.state = PlayerState.WAIT
+        # where a pass to this player was aimed
+        self.receive_target = Vector2D()
+        # the simulated time at which this player may kick again
+        self.next_kick_time = 0.0
+
+        self.steering = SteeringBehaviors(self, team.pitch.ball, p)
+        if role == PlayerRole.FIELD_PLAYER:
+            self.steering.on(Behavior.SEPARATION)
+
+    def handle_message(self, msg: Telegram) -> bool:
+        if msg.msg == MessageType.RECEIVE_BALL:
+            (target,) = msg.extra_info
+            self.receive_target.copy_from(target)
+            self.state = PlayerState.RECEIVE_BALL
+            return True
+        if msg.msg == MessageType.GO_HOME:
+            self.state = PlayerState.WAIT
+            return True
+        return False
+
+    def place_at_home(self) -> None:
+        self.position.copy_from(self.home)
+        self.velocity.zero()
+        heading = self.team.home_goal.facing
+        self.heading = Vector2D(heading.x, heading.y)
+        self.state = PlayerState.WAIT
+        self.next_kick_time = 0.0
+
+    def set_home_region(self, region_id: int) -> None:
+        self.home_region = region_id
+        self.home = self.pitch.regions[region_id].center.copy()
+
+    def in_home_region(self) -> bool:
+        """
+        the keeper has to be anywhere in its home region, field players in
+        the middle half of theirs
+        """
+        if self.role == PlayerRole.GOALKEEPER:
+            mode = RegionMode.NORMAL
+        else:
+            mode = RegionMode.HALFSIZE
+        return self.pitch.regions[self.home_region].inside(self.position, mode)
+
+    def in_opponents_half(self) -> bool:
+        return self.team.in_opponents_half(self.position)
+
+    def ball_within_kicking_range(self) -> bool:
+        reach = self.pitch.params.player_kicking_distance
+        return self.position.distance_sq(self.pitch.ball.position) < reach * reach
+
+    def update(self, dt: float = Params.dt) -> None:
+        self.think()
+        self.move(dt, self.steering.calculate(dt))
+
+    def think(self) -> None:
+        """picks the state of the player, kicks, and sets up its steering"""
+        if self.role == PlayerRole.GOALKEEPER:
+            self._update_goalkeeper()
+        else:
+            self._update_field_player()
+        self._set_steering()
+
+    def move(self, dt: float, force: Vector2D) -> None:
+        self.integrate(dt, force)
+        self._keep_on_pitch()
+
+    def _update_field_player(self) -> None:
+        team = self.team
+        if self.state == PlayerState.RECEIVE_BALL and team.receiving_player is not self:
+            self.state = PlayerState.WAIT
+        if self.state != PlayerState.RECEIVE_BALL:
+            chasing = team.closest_player_to_ball is self and (
+                team.receiving_player is None or not team.in_control()
+            )
+            if chasing:
+                self.state = PlayerState.CHASE_BALL
+            elif team.supporting_player is self:
+                self.state = PlayerState.SUPPORT_ATTACKER
+            else:
+                self.state = PlayerState.WAIT
+
+        kicking = self.state in (PlayerState.CHASE_BALL, PlayerState.RECEIVE_BALL)
+        if kicking and self.ball_within_kicking_range():
+            self._kick()
+
+    def _update_goalkeeper(self) -> None:
+        pitch = self.pitch
+        ball = pitch.ball.position
+        p = pitch.params
+        goal = self.team.home_goal
+
+        # the keeper catches any ball in reach except its own clearance
+        if (
+            self.position.distance_sq(ball) < p.keeper_in_ball_range**2
+            and pitch.ball.owner is not self
+            and pitch.time >= self.next_kick_time
+        ):
+            self._put_ball_back_in_play()
+            return
+
+        in_range = goal.center.distance_sq(ball) < p.keeper_intercept_range**2
+        self.state = PlayerState.CHASE_BALL if in_range else PlayerState.TEND_GOAL
+
+    def _set_steering(self) -> None:
+        """turns on the behaviour of the current state, and only that one"""
+        pitch = self.pitch
+        steering = self.steering
+        steering.off(MOVEMENT)
+        if self.state == PlayerState.CHASE_BALL:
+            steering.on(Behavior.PURSUIT)
+            return
+        if self.state == PlayerState.RECEIVE_BALL:
+            steering.target.copy_from(self.receive_target)
+            steering.on(Behavior.ARRIVE)
+            return
+        if self.state == PlayerState.TEND_GOAL:
+            steering.target.copy_from(self._rear_interpose_target())
+            steering.interpose_distance = pitch.params.keeper_tending_distance
+            steering.on(Behavior.INTERPOSE)
+            return
+        if self.state == PlayerState.SUPPORT_ATTACKER:
+            spot = self.team.support_spots.best_spot
+            if spot is not None:
+                steering.target.copy_from(spot)
+                steering.on(Behavior.ARRIVE)
+                return
+
+        target = steering.target
+        target.copy_from(self.home)
+        if self.role == PlayerRole.FIELD_PLAYER:
+            shift = pitch.ball.position.x - pitch.playing_area.center.x
+            target.x += shift * pitch.params.formation_shift
+        if self.position.distance_sq(target) < 1.0:
+            self.rotate_heading_to_face_position(pitch.ball.position)
+        steering.on(Behavior.ARRIVE)
+
+    def _rear_interpose_target(self) -> Vector2D:
+        """
+        the spot on the goal line the keeper guards, which follows the
+        ball across the goal mouth. the keeper stands in front of it
+        towards the ball
+        """
+        p = self.pitch.params
+        goal = self.team.home_goal
+        ball = self.pitch.ball.position
+        offset = (ball.y - p.pitch_height / 2) * p.goal_width / p.pitch_height
+        return Vector2D(goal.center.x, goal.center.y + offset)
+
+    def _keep_on_pitch(self) -> None:
+        area = self.pitch.playing_area
+        position = self.position
+        if not area.inside(position):
+            position.x = clamp(position.x, area.left, area.right)
+            position.y = clamp(position.y, area.top, area.bottom)
+
+    def _take_kick(self, target: Vector2D, force: float) -> None:
+        """kicks the ball towards target, with some noise"""
+        pitch = self.pitch
+        direction = target - pitch.ball.position
+        accuracy = pitch.params.player_kicking_accuracy
+        angle = pitch.rng.uniform(-accuracy, accuracy)
+        cos, sin = math.cos(angle), math.sin(angle)
+        direction.set(
+            cos * direction.x - sin * direction.y,
+            sin * direction.x + cos * direction.y,
+        )
+        pitch.ball.kick(direction, force)
+        pitch.ball.owner = self
+        pitch.ball.kick_tick = pitch.tick
+        self.next_kick_time = pitch.time + pitch.params.player_kick_cooldown
+
+        if pitch.controlling_team is not self.team:
+            self.team.opponents.lost_control()
+        pitch.controlling_team = self.team
+
+    def _kick(self) -> None:
+        pitch = self.pitch
+        if pitch.time < self.next_kick_time or pitch.ball.kick_tick == pitch.tick:
+            return
+        p = pitch.params
+        team = self.team
+        goal = team.opponents_goal
+
+        if self.position.distance_sq(goal.center) < p.shooting_range**2:
+            # shoot at a random spot between the posts
+            target = goal.left_post + (goal.right_post - goal.left_post) * (
+                pitch.rng.uniform(0.15, 0.85)
+            )
+            self._take_kick(target, p.max_shooting_force)
+            team.receiving_player = None
+            return
+
+        if pitch.rng.random() < p.pass_probability:
+            receiver = team.find_pass(self)
+            if receiver is not None:
+                self._pass_to(receiver)
+                return
+
+        # dribble towards the goal
+        self._take_kick(goal.center, p.max_dribble_force)
+        team.receiving_player = None
+
+    def _pass_to(self, receiver: "PlayerBase") -> None:
+        p = self.pitch.params
+        target = receiver.position.copy()
+        self._take_kick(target, p.max_passing_force)
+        self.team.receiving_player = receiver
+        self.state = PlayerState.WAIT
+        self.pitch.dispatcher.dispatch_msg(
+            0, self.id, receiver.id, MessageType.RECEIVE_BALL, target
+        )
+
+    def _put_ball_back_in_play(self) -> None:
+        """the keeper has the ball, it passes it out to a field player"""
+        pitch = self.pitch
+        pitch.goalkeeper_has_ball = True
+        pitch.controlling_team = self.team
+        self.team.opponents.lost_control()
+
+        receivers = self.team.field_players
+        if not receivers:
+            return
+        receiver = pitch.rng.choice(receivers)
+        # start the pass from just in front of the keeper
+        ball = pitch.ball
+        facing = self.team.home_goal.facing
+        ball.place_at_position(self.position + facing * self.pitch.params.player_radius)
+        self.next_kick_time = 0.0
+        self._pass_to(receiver)
+        self.state = PlayerState.TEND_GOAL
+        pitch.goalkeeper_has_ball = False
 
 
 class Goal:
-    def __init__(self, left: Vector2D, right: Vector2D) -> None:
+    def __init__(self, left: Vector2D, right: Vector2D, facing: Vector2D) -> None:
         self.left_post = left
         self.right_post = right
 
-        self.facing = Vector2D()  # 球门的朝向向量
+        self.facing = facing  # 球门的朝向向量
         self.center = (left + right) / 2  # 球门线的中间位置
 
         self.num_goals_scored = 0
+        # the fraction of the tick at which the last goal went in
+        self.last_goal_fraction: float | None = None
 
-    def scored(self) -> bool:
-        ...
-
-
-class Wall2D:
-    ...
+    def crossing(self, old: Vector2D, new: Vector2D) -> float | None:
+        """
+        the fraction of the way from old to new at which a ball moving
+        between them crosses the goal line between the posts from the
+        pitch side, or None if it does not. being swept, a fast ball is
+        caught however far it travels in a tick
+        """
+        left = self.left_post
+        facing = self.facing
+        # how far each end is in front of the goal line
+        old_ahead = (old.x - left.x) * facing.x + (old.y - left.y) * facing.y
+        new_ahead = (new.x - left.x) * facing.x + (new.y - left.y) * facing.y
+        if not old_ahead > 0 >= new_ahead:
+            return None
+        fraction = old_ahead / (old_ahead - new_ahead)
 
+        # where it crosses, along the line from the left post
+        line = self.right_post - left
+        x = old.x + (new.x - old.x) * fraction - left.x
+        y = old.y + (new.y - old.y) * fraction - left.y
+        along = x * line.x + y * line.y
+        if 0 < along < line.length_sq():
+            return fraction
+        return None
 
-class Region:
-    ...
+    def scored(self, ball: SoccerBall) -> bool:
+        """
+        returns true if the ball has crossed the goal line this tick, with
+        the fraction of the tick it took in last_goal_fraction, and
+        increments num_goals_scored
+        """
+        fraction = self.crossing(ball.old_position, ball.position)
+        if fraction is None:
+            return False
+        self.last_goal_fraction = fraction
+        self.num_goals_scored += 1
+        return True
@@ -0,0 +1,82 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Params:
+    """
+    the tunable constants of a match, the Params.ini of the original.
+    distances are in metres, times in seconds and masses in kilograms.
+    """
+
+    # the fixed simulation timestep
+    dt: float = 1 / 30
+    # the length of a match in simulated seconds
+    match_duration: float = 90 * 60.0
+
+    pitch_width: float = 105.0
+    pitch_height: float = 68.0
+    goal_width: float = 12.0
+    players_per_team: int = 5
+    # the pitch is divided into regions_x by regions_y regions
+    regions_x: int = 6
+    regions_y: int = 3
+
+    ball_mass: float = 1.0
+    ball_radius: float = 0.5
+    # the deceleration the ball feels while rolling, always negative
+    friction: float = -4.0
+
+    player_mass: float = 70.0
+    player_radius: float = 0.5
+    player_max_force: float = 700.0
+    player_max_speed: float = 8.0
+    # radians a player may turn in one call of rotate_heading_to_face_position
+    player_max_turn_rate: float = 0.4
+    # the distance between player and ball centres within which it can be kicked
+    player_kicking_distance: float = 1.2
+    # the minimum time between two kicks of the same player
+    player_kick_cooldown: float = 0.25
+    # the angle (radians) by which a kick may miss its target either way
+    player_kicking_accuracy: float = 0.05
+    # the time players take to slow down when arriving at a target
+    arrive_deceleration_time: float = 0.6
+    # field players push away from those within view distance, by the
+    # coefficient over the distance
+    player_view_distance: float = 3.0
+    player_separation_coefficient: float = 150.0
+    # whether the steering of all the players of a pitch is worked out at
+    # once with numpy, see steering.calculate_batch
+    batched_steering: bool = False
+
+    # the initial speed of the ball given to it by each kind of kick
+    # is force / ball_mass
+    max_shooting_force: float = 25.0
+    max_passing_force: float = 16.0
+    max_dribble_force: float = 6.0
+    # players shoot from closer to the opponents' goal than this
+    shooting_range: float = 30.0
+    # the chance that a player out of shooting range passes rather than dribbles
+    pass_probability: float = 0.3
+
+    # the grid of spots a supporting player may run to, see support_spots.py
+    support_spots_x: int = 13
+    support_spots_y: int = 6
+    # how many times a simulated second the spots are rescored
+    support_spot_update_frequency: float = 1.0
+    # the weights of each part of a spot's score
+    spot_pass_safe_score: float = 2.0
+    spot_can_score_score: float = 1.0
+    spot_distance_score: float = 2.0
+    # the distance from the attacker a supporting player should keep
+    spot_optimal_distance: float = 20.0
+
+    # how far in front of the goal line the goalkeeper stands
+    keeper_tending_distance: float = 2.0
+    # the keeper goes for the ball when it is closer than this to its goal
+    keeper_intercept_range: float = 16.0
+    # the keeper catches the ball within this distance
+    keeper_in_ball_range: float = 1.5
+
+    # the fraction of the ball's offset from the halfway line by which
+    # players not involved in play shift their home position
+    formation_shift: float = 0.3
@@ -0,0 +1,182 @@
+"""
+batched pass safety, after isPassSafeFromAllOpponents in Buckland's
+Simple Soccer.
+
+every opponent is put in the local space of every pass in one go, with
+the same axes as point_to_local_space for an agent at the origin of the
+pass heading at its target, then whether it can get to the ball first
+is a comparison of distances against the time the ball takes to get
+there. the arrays have a leading pitch axis P so the passes of any
+number of pitches are checked in one call.
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .common.moving_entity import MovingEntity
+from .common.vector2d import Vector2D
+
+FloatArray = NDArray[np.float64]
+BoolArray = NDArray[np.bool_]
+
+
+def to_local_space(
+    points: FloatArray, origins: FloatArray, headings: FloatArray
+) -> FloatArray:
+    """
+    point_to_local_space over arrays. points, origins and headings (unit
+    length) broadcast against each other on every axis but the last, the
+    side of each heading being heading.perp() as for a MovingEntity
+    """
+    relative = np.asarray(points, dtype=np.float64) - origins
+    hx = headings[..., 0]
+    hy = headings[..., 1]
+    local: FloatArray = np.empty(np.broadcast_shapes(relative.shape, headings.shape))
+    local[..., 0] = relative[..., 0] * hx + relative[..., 1] * hy
+    local[..., 1] = relative[..., 1] * hx - relative[..., 0] * hy
+    return local
+
+
+def entity_arrays(
+    entities: Sequence[MovingEntity],
+) -> tuple[FloatArray, FloatArray, FloatArray]:
+    """the (N, 2) positions, (N,) max speeds and (N,) bounding radii of entities"""
+    positions = np.array([(e.position.x, e.position.y) for e in entities])
+    speeds = np.array([e.max_speed for e in entities])
+    radii = np.array([e.bounding_radius for e in entities])
+    return positions.reshape(len(entities), 2), speeds, radii
+
+
+def time_to_cover_distance(
+    distances: FloatArray, speed: float, friction: float
+) -> FloatArray:
+    """
+    the time the ball takes to roll each distance when kicked at speed,
+    decelerating at friction. inf where it stops short
+    """
+    # v^2 = u^2 + 2as
+    v_sq = speed * speed + 2.0 * friction * np.asarray(distances, dtype=np.float64)
+    times: FloatArray = np.full(v_sq.shape, np.inf)
+    reached = v_sq >= 0
+    times[reached] = (np.sqrt(v_sq[reached]) - speed) / friction
+    return times
+
+
+def interceptions(
+    origins: FloatArray,
+    targets: FloatArray,
+    opponents: FloatArray,
+    opponent_speeds: FloatArray,
+    opponent_radii: FloatArray,
+    speed: float,
+    friction: float,
+    ball_radius: float,
+    receivers: FloatArray | None = None,
+) -> BoolArray:
+    """
+    (P, T, O) true where opponent O of pitch P can intercept pass T, the
+    ball kicked at speed from origins (P, T, 2) or (P, 1, 2) to targets
+    (P, T, 2), the opponents (P, O, 2) having max speeds and radii (P, O).
+
+    an opponent behind the origin is no threat. one further from the
+    origin than the target is one only if it is nearer the target than
+    the receiver (P, T, 2) when receivers are given. otherwise it is one
+    if it can reach the line of the pass in the time the ball takes to
+    pass it
+    """
+    origins = np.asarray(origins, dtype=np.float64)
+    targets = np.asarray(targets, dtype=np.float64)
+    opponents = np.asarray(opponents, dtype=np.float64)
+
+    to_target = targets - origins
+    length_sq = (to_target * to_target).sum(axis=-1)
+    length = np.sqrt(length_sq)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        headings = to_target / length[..., None]
+    headings[length == 0] = (1.0, 0.0)
+
+    # (P, T, O, 2) every opponent in the local space of every pass
+    local = to_local_space(
+        opponents[:, None, :, :], origins[:, :, None, :], headings[:, :, None, :]
+    )
+    local_x = local[..., 0]
+    local_y = local[..., 1]
+
+    behind = local_x < 0
+    beyond = length_sq[..., None] < (local * local).sum(axis=-1)
+    time = time_to_cover_distance(np.maximum(local_x, 0.0), speed, friction)
+    reach = opponent_speeds[:, None, :] * time + ball_radius
+    reach += opponent_radii[:, None, :]
+    intercepted: BoolArray = ~behind & ~beyond & (np.abs(local_y) < reach)
+
+    if receivers is not None:
+        to_opponents = opponents[:, None, :, :] - targets[:, :, None, :]
+        to_receivers = np.asarray(receivers, dtype=np.float64) - targets
+        nearer = (to_opponents * to_opponents).sum(axis=-1) < (
+            to_receivers * to_receivers
+        ).sum(axis=-1)[..., None]
+        intercepted |= beyond & nearer
+    return intercepted
+
+
+def safe_passes(
+    origins: FloatArray,
+    targets: FloatArray,
+    opponents: FloatArray,
+    opponent_speeds: FloatArray,
+    opponent_radii: FloatArray,
+    speed: float,
+    friction: float,
+    ball_radius: float,
+    receivers: FloatArray | None = None,
+) -> BoolArray:
+    """
+    (P, T) true where the ball reaches the target of pass T and none of
+    the opponents can intercept it, see interceptions
+    """
+    intercepted = interceptions(
+        origins,
+        targets,
+        opponents,
+        opponent_speeds,
+        opponent_radii,
+        speed,
+        friction,
+        ball_radius,
+        receivers,
+    )
+    length = np.hypot(*(np.asarray(targets) - origins).transpose(2, 0, 1))
+    reaches = np.isfinite(time_to_cover_distance(length, speed, friction))
+    safe: BoolArray = reaches & ~intercepted.any(axis=-1)
+    return safe
+
+
+def pass_safety(
+    origin: Vector2D,
+    targets: FloatArray,
+    opponents: Sequence[MovingEntity],
+    speed: float,
+    friction: float,
+    ball_radius: float,
+    receivers: FloatArray | None = None,
+) -> BoolArray:
+    """
+    safe_passes for a single pitch, from origin to the (T, 2) targets
+    past the opponents, returns (T,)
+    """
+    positions, speeds, radii = entity_arrays(opponents)
+    safe = safe_passes(
+        np.array([[[origin.x, origin.y]]]),
+        np.asarray(targets, dtype=np.float64)[None],
+        positions[None],
+        speeds[None],
+        radii[None],
+        speed,
+        friction,
+        ball_radius,
+        None if receivers is None else np.asarray(receivers)[None],
+    )
+    result: BoolArray = safe[0]
+    return result
@@ -0,0 +1,246 @@
+"""
+opt-in instrumentation of the engine's hot paths.
+
+nothing here is active until Profiler.enable() swaps the methods listed
+in HOT_PATHS for timing wrappers, and disable() puts the originals back,
+so a disabled profiler costs nothing at all. the methods are patched
+for the whole process, so only one profiler may be enabled at a time.
+"""
+
+import csv
+import functools
+import json
+import time
+import tracemalloc
+from collections import deque
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+from .common.c2d_matrix import C2DMatrix
+from .common.message_dispatcher import MessageDispatcher
+from .common.moving_entity import MovingEntity
+from .common.wall_set import WallSet
+from .models import SoccerPitch
+
+# the pitch update that marks the end of a tick
+TICK = ("tick", SoccerPitch, "update")
+
+# (subsystem, class, method) of every wrapped method
+HOT_PATHS: list[tuple[str, type, str]] = [
+    TICK,
+    ("rotate_heading", MovingEntity, "rotate_heading_to_face_position"),
+    ("transform", C2DMatrix, "transform_vector2ds"),
+    ("transform", C2DMatrix, "rotate_vector2ds"),
+    ("transform", C2DMatrix, "apply_to_array"),
+    ("dispatch", MessageDispatcher, "dispatch_msg"),
+    ("dispatch", MessageDispatcher, "dispatch_delayed_messages"),
+    ("walls", WallSet, "bounce"),
+    ("walls", WallSet, "feeler_forces"),
+]
+
+# the profiler whose wrappers are installed, if any
+_active: "Profiler | None" = None
+
+
+class Profiler:
+    """
+    records per tick wall time, call counts and, with trace_allocations,
+    the net bytes allocated by every subsystem in HOT_PATHS.
+
+    the last `capacity` ticks and `event_capacity` calls are kept in ring
+    buffers. times are inclusive, the tick subsystem covers the whole of
+    SoccerPitch.update including the other subsystems called from it.
+    use as a context manager or call enable() and disable()
+    """
+
+    def __init__(
+        self,
+        capacity: int = 4096,
+        event_capacity: int = 100_000,
+        trace_allocations: bool = False,
+        hot_paths: Sequence[tuple[str, type, str]] = HOT_PATHS,
+    ) -> None:
+        self._hot_paths = list(hot_paths)
+        self.subsystems: list[str] = []
+        for subsystem, _, _ in self._hot_paths:
+            if subsystem not in self.subsystems:
+                self.subsystems.append(subsystem)
+        self.trace_allocations = trace_allocations
+
+        count = len(self.subsystems)
+        # totals of the tick in progress, by subsystem index
+        self._times = [0] * count
+        self._calls = [0] * count
+        self._bytes = [0] * count
+        # (tick, times ns, calls, bytes) of every finished tick
+        self.ticks: deque[tuple[int, list[int], list[int], list[int]]] = deque(
+            maxlen=capacity
+        )
+        # (subsystem index, start ns, duration ns) of every call
+        self.events: deque[tuple[int, int, int]] = deque(maxlen=event_capacity)
+
+        # the methods replaced by enable(), as (class, name, original)
+        # with original None if the class inherited the method
+        self._patched: list[tuple[type, str, Any]] = []
+        self._started_tracemalloc = False
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._patched)
+
+    def enable(self) -> None:
+        """
+        installs the wrappers, raises RuntimeError if another profiler is
+        enabled
+        """
+        global _active
+        if self._patched:
+            return
+        if _active is not None:
+            raise RuntimeError("<Profiler> another profiler is already enabled")
+        _active = self
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        for subsystem, cls, name in self._hot_paths:
+            func = getattr(cls, name)
+            index = self.subsystems.index(subsystem)
+            if (subsystem, cls, name) == TICK:
+                wrapper = self._wrap_tick(index, func)
+            else:
+                wrapper = self._wrap(index, func)
+            self._patched.append((cls, name, cls.__dict__.get(name)))
+            setattr(cls, name, wrapper)
+
+    def disable(self) -> None:
+        global _active
+        if _active is self:
+            _active = None
+        for cls, name, original in reversed(self._patched):
+            if original is None:
+                delattr(cls, name)
+            else:
+                setattr(cls, name, original)
+        self._patched.clear()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def __enter__(self) -> "Profiler":
+        self.enable()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.disable()
+
+    def clear(self) -> None:
+        count = len(self.subsystems)
+        self._times = [0] * count
+        self._calls = [0] * count
+        self._bytes = [0] * count
+        self.ticks.clear()
+        self.events.clear()
+
+    def _wrap(self, index: int, func: Callable[..., Any]) -> Callable[..., Any]:
+        clock = time.perf_counter_ns
+        events = self.events
+        traced_memory = tracemalloc.get_traced_memory
+        trace = self.trace_allocations
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if trace:
+                before = traced_memory()[0]
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                duration = clock() - start
+                self._times[index] += duration
+                self._calls[index] += 1
+                if trace:
+                    self._bytes[index] += traced_memory()[0] - before
+                events.append((index, start, duration))
+
+        return wrapper
+
+    def _wrap_tick(self, index: int, func: Callable[..., Any]) -> Callable[..., Any]:
+        timed = self._wrap(index, func)
+
+        @functools.wraps(func)
+        def wrapper(pitch: SoccerPitch) -> None:
+            tick = pitch.tick
+            timed(pitch)
+            self._end_tick(tick)
+
+        return wrapper
+
+    def _end_tick(self, tick: int) -> None:
+        count = len(self.subsystems)
+        self.ticks.append((tick, self._times, self._calls, self._bytes))
+        self._times = [0] * count
+        self._calls = [0] * count
+        self._bytes = [0] * count
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """per subsystem totals over the ticks in the ring buffer"""
+        ticks = max(len(self.ticks), 1)
+        result = {}
+        for i, subsystem in enumerate(self.subsystems):
+            times = [t[1][i] for t in self.ticks]
+            calls = sum(t[2][i] for t in self.ticks)
+            total = sum(times) / 1e9
+            result[subsystem] = {
+                "calls": calls,
+                "total_s": total,
+                "mean_tick_ms": total * 1e3 / ticks,
+                "max_tick_ms": max(times, default=0) / 1e6,
+                "mean_call_us": total * 1e6 / calls if calls else 0.0,
+                "bytes": sum(t[3][i] for t in self.ticks),
+            }
+        return result
+
+    def write_csv(self, path: Path) -> None:
+        """one row per tick with the time, calls and bytes of every subsystem"""
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            header = ["tick"]
+            for name in self.subsystems:
+                header += [f"{name}_ns", f"{name}_calls", f"{name}_bytes"]
+            writer.writerow(header)
+            for tick, times, calls, allocated in self.ticks:
+                row = [tick]
+                for i in range(len(self.subsystems)):
+                    row += [times[i], calls[i], allocated[i]]
+                writer.writerow(row)
+
+    def write_json(self, path: Path) -> None:
+        """the summary, with the number of ticks it covers"""
+        data = {"ticks": len(self.ticks), "subsystems": self.summary()}
+        Path(path).write_text(json.dumps(data, indent=2))
+
+    def write_chrome_trace(self, path: Path) -> None:
+        """
+        the calls in the event buffer in the trace event format read by
+        chrome://tracing and Perfetto
+        """
+        events = [
+            {
+                "name": self.subsystems[index],
+                "cat": self.subsystems[index],
+                "ph": "X",
+                "ts": start / 1e3,
+                "dur": duration / 1e3,
+                "pid": 0,
+                "tid": 0,
+            }
+            for index, start, duration in self.events
+        ]
+        Path(path).write_text(json.dumps({"traceEvents": events}))
@@ -0,0 +1,123 @@
+import enum
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .common.vector2d import Vector2D
+
+FloatArray = NDArray[np.float64]
+IntArray = NDArray[np.intp]
+
+
+class RegionMode(enum.IntEnum):
+    # the whole rectangle
+    NORMAL = 0
+    # the rectangle half as wide and half as high around the centre
+    HALFSIZE = 1
+
+
+class Region:
+    """a rectangle on the pitch"""
+
+    def __init__(
+        self, left: float, top: float, right: float, bottom: float, id: int = 0
+    ) -> None:
+        self.left = left
+        self.top = top
+        self.right = right
+        self.bottom = bottom
+        self.id = id
+
+        self.width = right - left
+        self.height = bottom - top
+        self.center = Vector2D((left + right) / 2, (top + bottom) / 2)
+
+    def __repr__(self) -> str:
+        return (
+            f"Region({self.left}, {self.top}, {self.right}, {self.bottom},"
+            f" id={self.id})"
+        )
+
+    def inside(self, position: Vector2D, mode: RegionMode = RegionMode.NORMAL) -> bool:
+        if mode == RegionMode.NORMAL:
+            return (
+                self.left <= position.x <= self.right
+                and self.top <= position.y <= self.bottom
+            )
+        margin_x = self.width * 0.25
+        margin_y = self.height * 0.25
+        return (
+            self.left + margin_x < position.x < self.right - margin_x
+            and self.top + margin_y < position.y < self.bottom - margin_y
+        )
+
+
+class RegionGrid:
+    """
+    the pitch divided into cols x rows equal regions, numbered row by row
+    from the top left. positions off the pitch belong to the nearest edge
+    region, the same as CellSpacePartition.position_to_index
+    """
+
+    def __init__(
+        self,
+        left: float,
+        top: float,
+        width: float,
+        height: float,
+        cols: int = 6,
+        rows: int = 3,
+    ) -> None:
+        self.left = left
+        self.top = top
+        self.cols = cols
+        self.rows = rows
+        self.region_width = width / cols
+        self.region_height = height / rows
+
+        self.regions: list[Region] = []
+        for row in range(rows):
+            for col in range(cols):
+                x = left + col * self.region_width
+                y = top + row * self.region_height
+                self.regions.append(
+                    Region(
+                        x,
+                        y,
+                        x + self.region_width,
+                        y + self.region_height,
+                        id=len(self.regions),
+                    )
+                )
+        # (regions, 2) the centre of every region, by id
+        self.centers: FloatArray = np.array(
+            [[r.center.x, r.center.y] for r in self.regions]
+        )
+
+    def __len__(self) -> int:
+        return len(self.regions)
+
+    def __getitem__(self, id: int) -> Region:
+        return self.regions[id]
+
+    def region_of(self, position: Vector2D) -> int:
+        """the id of the region containing position"""
+        col = int((position.x - self.left) / self.region_width)
+        row = int((position.y - self.top) / self.region_height)
+        col = min(max(col, 0), self.cols - 1)
+        row = min(max(row, 0), self.rows - 1)
+        return row * self.cols + col
+
+    def regions_of(self, positions: FloatArray) -> IntArray:
+        """region_of for an (N, 2) array of positions"""
+        positions = np.asarray(positions, dtype=np.float64)
+        cols = ((positions[:, 0] - self.left) / self.region_width).astype(np.intp)
+        rows = ((positions[:, 1] - self.top) / self.region_height).astype(np.intp)
+        np.clip(cols, 0, self.cols - 1, out=cols)
+        np.clip(rows, 0, self.rows - 1, out=rows)
+        ids: IntArray = rows * self.cols + cols
+        return ids
+
+    def center_of(self, position: Vector2D) -> Vector2D:
+        """the centre of the region containing position"""
+        return self.regions[self.region_of(position)].center
@@ -0,0 +1,355 @@
+"""
+an append-only replay log of a match, one frame per tick.
+
+every keyframe_interval ticks, and whenever a delta would not fit, the
+state of every entity is written in full as float64. the frames in
+between hold int16 deltas from the previous frame quantised to the
+steps in the file header. deltas are taken from the state the reader
+will reconstruct rather than the true state, so the error of every
+decoded value stays below half a step however long the run of deltas.
+
+the state of a frame is an (entities, 6) array with the columns
+POS_X, POS_Y, VEL_X, VEL_Y, HEADING_X, HEADING_Y.
+
+    file header
+    frames       frame header, payload padded to 8 bytes
+    index        (tick, offset) of every keyframe, written by close()
+    footer       index offset, index length, INDEX_MAGIC
+"""
+
+import bisect
+import mmap
+import struct
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from types import TracebackType
+from typing import TYPE_CHECKING, BinaryIO
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .common.moving_entity import MovingEntity
+
+if TYPE_CHECKING:
+    from .models import SoccerPitch
+
+FloatArray = NDArray[np.float64]
+
+MAGIC = b"SSRP"
+INDEX_MAGIC = b"SRIX"
+FORMAT_VERSION = 1
+
+# magic, version, entity count, keyframe interval,
+# position, velocity and heading steps
+FILE_HEADER = struct.Struct("<4sHxxIIddd")
+# kind, tick, red score, blue score
+FRAME_HEADER = struct.Struct("<B3xIHH4x")
+FOOTER = struct.Struct("<QQ4s")
+INDEX_DTYPE = np.dtype([("tick", "<u8"), ("offset", "<u8")])
+
+KEYFRAME = 0
+DELTA = 1
+
+# columns of the state array
+POS_X = 0
+POS_Y = 1
+VEL_X = 2
+VEL_Y = 3
+HEADING_X = 4
+HEADING_Y = 5
+COLUMNS = 6
+
+_DELTA_LIMIT = np.iinfo(np.int16).max
+
+
+def _padded(size: int) -> int:
+    return (size + 7) & ~7
+
+
+def pitch_entities(pitch: "SoccerPitch") -> list[MovingEntity]:
+    """the entities of a pitch in the order they are recorded"""
+    return [pitch.ball, *pitch.red_team.players, *pitch.blue_team.players]
+
+
+@dataclass
+class ReplayFrame:
+    tick: int
+    red_score: int
+    blue_score: int
+    # (entities, COLUMNS), a read-only view that is only valid until the
+    # reader moves on to the next frame, copy it to keep it
+    state: FloatArray
+
+
+class ReplayWriter:
+    """
+    records frames to path. use as a context manager or call close(),
+    which appends the keyframe index
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        entity_count: int,
+        keyframe_interval: int = 30,
+        position_step: float = 0.001,
+        velocity_step: float = 0.001,
+        heading_step: float = 0.0001,
+    ) -> None:
+        self.entity_count = entity_count
+        self.keyframe_interval = keyframe_interval
+        self._steps = np.array(
+            [position_step, position_step]
+            + [velocity_step, velocity_step]
+            + [heading_step, heading_step]
+        )
+        self._file: BinaryIO = open(path, "wb")
+        self._file.write(
+            FILE_HEADER.pack(
+                MAGIC,
+                FORMAT_VERSION,
+                entity_count,
+                keyframe_interval,
+                position_step,
+                velocity_step,
+                heading_step,
+            )
+        )
+        self._offset = FILE_HEADER.size
+        self._index: list[tuple[int, int]] = []
+        # the state as the reader will reconstruct it
+        self._decoded = np.zeros((entity_count, COLUMNS))
+        self._since_keyframe = 0
+        # scratch for gathering the state of the pitch
+        self._state = np.zeros((entity_count, COLUMNS))
+        self._delta_padding = bytes(
+            _padded(entity_count * COLUMNS * 2) - entity_count * COLUMNS * 2
+        )
+
+    @property
+    def keyframes(self) -> int:
+        return len(self._index)
+
+    def write_frame(
+        self, tick: int, red_score: int, blue_score: int, state: FloatArray
+    ) -> None:
+        """appends the frame for tick, state is (entity_count, COLUMNS)"""
+        state = np.asarray(state, dtype=np.float64)
+        if state.shape != self._decoded.shape:
+            raise ValueError(
+                f"<ReplayWriter> state shape {state.shape} is not"
+                f" {self._decoded.shape}"
+            )
+
+        delta = None
+        if self._index and self._since_keyframe < self.keyframe_interval:
+            quantised = np.rint((state - self._decoded) / self._steps)
+            if np.abs(quantised).max(initial=0) <= _DELTA_LIMIT:
+                delta = quantised.astype(np.int16)
+
+        file = self._file
+        if delta is None:
+            self._index.append((tick, self._offset))
+            file.write(FRAME_HEADER.pack(KEYFRAME, tick, red_score, blue_score))
+            file.write(state.tobytes())
+            self._decoded[:] = state
+            self._since_keyframe = 1
+            self._offset += FRAME_HEADER.size + state.nbytes
+        else:
+            file.write(FRAME_HEADER.pack(DELTA, tick, red_score, blue_score))
+            file.write(delta.tobytes())
+            file.write(self._delta_padding)
+            self._decoded += delta * self._steps
+            self._since_keyframe += 1
+            self._offset += FRAME_HEADER.size + delta.nbytes + len(self._delta_padding)
+
+    def record(self, pitch: "SoccerPitch") -> None:
+        """appends the current state of pitch"""
+        state = self._state
+        for row, entity in zip(state, pitch_entities(pitch)):
+            p, v, h = entity.position, entity.velocity, entity.heading
+            row[:] = (p.x, p.y, v.x, v.y, h.x, h.y)
+        self.write_frame(pitch.tick, pitch.red_score, pitch.blue_score, state)
+
+    def flush(self) -> None:
+        """makes the frames written so far readable"""
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        index = np.array(self._index, dtype=INDEX_DTYPE)
+        self._file.write(index.tobytes())
+        self._file.write(FOOTER.pack(self._offset, len(index), INDEX_MAGIC))
+        self._file.close()
+
+    def __enter__(self) -> "ReplayWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+class ReplayReader:
+    """
+    reads a replay through an mmap of the file. keyframe states are views
+    straight into the map, delta frames are decoded into a single buffer
+    that every yielded frame shares.
+
+    a file whose writer was never closed has no index, it is rebuilt by
+    walking the frame headers
+    """
+
+    def __init__(self, path: Path) -> None:
+        with open(path, "rb") as file:
+            header = file.read(FILE_HEADER.size)
+            if len(header) < FILE_HEADER.size:
+                raise ValueError("<ReplayReader> file is too short for a replay")
+            (
+                magic,
+                version,
+                self.entity_count,
+                self.keyframe_interval,
+                position_step,
+                velocity_step,
+                heading_step,
+            ) = FILE_HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ValueError("<ReplayReader> not a replay file")
+            if version != FORMAT_VERSION:
+                raise ValueError(f"<ReplayReader> unsupported format version {version}")
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = self._map
+
+        self._steps = np.array(
+            [position_step, position_step]
+            + [velocity_step, velocity_step]
+            + [heading_step, heading_step]
+        )
+        values = self.entity_count * COLUMNS
+        self._keyframe_size = FRAME_HEADER.size + values * 8
+        self._delta_size = FRAME_HEADER.size + _padded(values * 2)
+        self._decoded = np.zeros((self.entity_count, COLUMNS))
+
+        self._end = len(buffer)
+        ticks, offsets = self._read_index()
+        self._index_ticks = ticks
+        self._index_offsets = offsets
+
+    def _read_index(self) -> tuple[list[int], list[int]]:
+        buffer = self._map
+        if len(buffer) >= FILE_HEADER.size + FOOTER.size:
+            index_offset, count, magic = FOOTER.unpack_from(
+                buffer, len(buffer) - FOOTER.size
+            )
+            if magic == INDEX_MAGIC:
+                index = np.frombuffer(
+                    buffer, dtype=INDEX_DTYPE, count=count, offset=index_offset
+                )
+                self._end = index_offset
+                return index["tick"].tolist(), index["offset"].tolist()
+
+        ticks: list[int] = []
+        offsets: list[int] = []
+        for kind, tick, offset in self._walk(FILE_HEADER.size):
+            if kind == KEYFRAME:
+                ticks.append(tick)
+                offsets.append(offset)
+        return ticks, offsets
+
+    def _walk(self, offset: int) -> Iterator[tuple[int, int, int]]:
+        """(kind, tick, offset) of every complete frame from offset on"""
+        buffer = self._map
+        end = self._end
+        while offset + FRAME_HEADER.size <= end:
+            kind, tick, _, _ = FRAME_HEADER.unpack_from(buffer, offset)
+            size = self._keyframe_size if kind == KEYFRAME else self._delta_size
+            if offset + size > end:
+                break
+            yield kind, tick, offset
+            offset += size
+
+    @property
+    def keyframe_ticks(self) -> list[int]:
+        return self._index_ticks
+
+    def frames(self, start_tick: int = 0) -> Iterator[ReplayFrame]:
+        """
+        yields the frames from start_tick on, decoding from the last
+        keyframe at or before it
+        """
+        position = bisect.bisect_right(self._index_ticks, start_tick) - 1
+        if position < 0:
+            if not self._index_offsets:
+                return
+            position = 0
+
+        buffer = self._map
+        values = self.entity_count * COLUMNS
+        shape = (self.entity_count, COLUMNS)
+        decoded = self._decoded
+        steps = self._steps
+        for kind, tick, offset in self._walk(self._index_offsets[position]):
+            _, _, red_score, blue_score = FRAME_HEADER.unpack_from(buffer, offset)
+            data = offset + FRAME_HEADER.size
+            if kind == KEYFRAME:
+                state = np.frombuffer(
+                    buffer, dtype=np.float64, count=values, offset=data
+                ).reshape(shape)
+                decoded[:] = state
+            else:
+                delta = np.frombuffer(
+                    buffer, dtype=np.int16, count=values, offset=data
+                ).reshape(shape)
+                decoded += delta * steps
+                state = decoded.view()
+                state.flags.writeable = False
+            if tick >= start_tick:
+                yield ReplayFrame(tick, red_score, blue_score, state)
+
+    def frame(self, tick: int) -> ReplayFrame:
+        """returns a copy of the frame for tick"""
+        for frame in self.frames(tick):
+            if frame.tick != tick:
+                break
+            frame.state = frame.state.copy()
+            return frame
+        raise KeyError(tick)
+
+    def __iter__(self) -> Iterator[ReplayFrame]:
+        return self.frames()
+
+    def close(self) -> None:
+        """
+        unmaps the file, every state yielded from a keyframe must have been
+        released first
+        """
+        self._map.close()
+
+    def __enter__(self) -> "ReplayReader":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+def record_match(
+    pitch: "SoccerPitch", path: Path, ticks: int, keyframe_interval: int = 30
+) -> None:
+    """plays ticks of pitch, recording a frame before the first and after each"""
+    with ReplayWriter(path, len(pitch_entities(pitch)), keyframe_interval) as writer:
+        writer.record(pitch)
+        for _ in range(ticks):
+            pitch.update()
+            writer.record(pitch)
@@ -0,0 +1,317 @@
+"""
+serves a live match to any number of spectators over tcp or unix
+sockets.
+
+a spectator connects and sends SUBSCRIBE with the frames a second it
+wants, 0 for every tick, and may send it again at any time to change
+the rate. the server answers with STREAM_HEADER, then a snapshot at that
+rate:
+
+    SUBSCRIBE        magic b"SSSB", fps                      <4sf
+    STREAM_HEADER    magic b"SSSS", version, entity count    <4sHI
+    snapshot         SNAPSHOT_HEADER, tick, red score,       <IHH
+                     blue score, then the state as float32
+                     (entities, COLUMNS) as in replay.py
+
+the tick loop never waits for a spectator. every snapshot is encoded
+once and handed to each spectator due one as its latest frame, which a
+task per spectator writes out. a spectator still draining the last
+frame when the next is handed over skips the one it had not started,
+so a slow reader sees fewer frames rather than slowing the match down.
+"""
+
+import asyncio
+import math
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .models import SoccerPitch
+from .replay import COLUMNS, pitch_entities
+from .summary import MatchSummary
+
+SUBSCRIBE_MAGIC = b"SSSB"
+STREAM_MAGIC = b"SSSS"
+FORMAT_VERSION = 1
+
+SUBSCRIBE = struct.Struct("<4sf")
+STREAM_HEADER = struct.Struct("<4sHI")
+SNAPSHOT_HEADER = struct.Struct("<IHH")
+
+# how long a new connection has to subscribe, in seconds
+SUBSCRIBE_TIMEOUT = 5.0
+# how far in seconds a paced match may fall behind and still catch up
+MAX_LAG = 0.25
+
+
+@dataclass
+class Snapshot:
+    tick: int
+    red_score: int
+    blue_score: int
+    # (entities, COLUMNS) float32
+    state: NDArray[np.float32]
+
+
+class Spectator:
+    """the server side of one connection"""
+
+    def __init__(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, fps: float
+    ) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.fps = fps
+        # the simulated time the next frame is due
+        self.next_time = 0.0
+        # the frame waiting to be written, replaced by each newer one
+        self.latest: bytes | None = None
+        self.ready = asyncio.Event()
+        self.sent = 0
+        self.dropped = 0
+
+    def due(self, time: float) -> bool:
+        # the tolerance keeps a whole number of ticks a frame from rounding
+        # up to one more
+        if time + 1e-9 < self.next_time:
+            return False
+        if self.fps > 0:
+            self.next_time += 1.0 / self.fps
+            if self.next_time <= time:
+                # the first frame, or the rate was raised, starts from now
+                self.next_time = time + 1.0 / self.fps
+        return True
+
+    def offer(self, frame: bytes) -> None:
+        if self.latest is not None:
+            self.dropped += 1
+        self.latest = frame
+        self.ready.set()
+
+    async def send(self) -> None:
+        """writes the latest frame each time there is one, until cancelled"""
+        while True:
+            await self.ready.wait()
+            self.ready.clear()
+            frame = self.latest
+            self.latest = None
+            if frame is None:
+                continue
+            self.writer.write(frame)
+            try:
+                await self.writer.drain()
+            except ConnectionError:
+                return
+            self.sent += 1
+
+    async def receive(self) -> None:
+        """applies every further SUBSCRIBE, returns when the spectator leaves"""
+        while True:
+            try:
+                data = await self.reader.readexactly(SUBSCRIBE.size)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                return
+            magic, fps = SUBSCRIBE.unpack(data)
+            if magic != SUBSCRIBE_MAGIC:
+                return
+            self.fps = max(fps, 0.0)
+            self.next_time = 0.0
+
+
+class SpectatorServer:
+    """
+    plays a pitch and streams it to the spectators connected to any of
+    the sockets opened with listen_tcp() and listen_unix().
+
+    run() plays tick_rate ticks a wall second, real time if None and as
+    fast as it can if math.inf. the cost of a tick to the loop is one
+    encoding and a list append per due spectator, whatever the
+    spectators do with their frames
+    """
+
+    def __init__(self, pitch: SoccerPitch, tick_rate: float | None = None) -> None:
+        self.pitch = pitch
+        self.tick_rate = tick_rate if tick_rate is not None else 1.0 / pitch.params.dt
+        if self.tick_rate <= 0:
+            raise ValueError(f"<SpectatorServer> tick_rate {tick_rate} is not positive")
+        self.entities = pitch_entities(pitch)
+        self.spectators: set[Spectator] = set()
+        self.servers: list[asyncio.Server] = []
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._state = np.zeros((len(self.entities), COLUMNS), dtype=np.float32)
+        # the times a paced match fell more than MAX_LAG behind and gave
+        # up the time it had lost
+        self.late_ticks = 0
+
+    async def listen_tcp(
+        self, host: str = "127.0.0.1", port: int = 0
+    ) -> asyncio.Server:
+        server = await asyncio.start_server(self._connected, host, port)
+        self.servers.append(server)
+        return server
+
+    async def listen_unix(self, path: Path | str) -> asyncio.Server:
+        server = await asyncio.start_unix_server(self._connected, path)
+        self.servers.append(server)
+        return server
+
+    async def _connected(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        task = asyncio.current_task()
+        assert task is not None
+        self._tasks.add(task)
+        spectator: Spectator | None = None
+        tasks: set[asyncio.Task[None]] = set()
+        try:
+            data = await asyncio.wait_for(
+                reader.readexactly(SUBSCRIBE.size), SUBSCRIBE_TIMEOUT
+            )
+            magic, fps = SUBSCRIBE.unpack(data)
+            if magic != SUBSCRIBE_MAGIC:
+                return
+            writer.write(
+                STREAM_HEADER.pack(STREAM_MAGIC, FORMAT_VERSION, len(self.entities))
+            )
+            spectator = Spectator(reader, writer, max(fps, 0.0))
+            self.spectators.add(spectator)
+            tasks.add(asyncio.create_task(spectator.send()))
+            tasks.add(asyncio.create_task(spectator.receive()))
+            # until the spectator leaves or can no longer be written to
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except asyncio.CancelledError:
+            # by close(), the end of the connection rather than an error
+            pass
+        finally:
+            if spectator is not None:
+                self.spectators.discard(spectator)
+            for spectator_task in tasks:
+                spectator_task.cancel()
+            writer.close()
+            self._tasks.discard(task)
+
+    def snapshot(self) -> bytes:
+        """the current state of the pitch, encoded"""
+        state = self._state
+        for row, entity in zip(state, self.entities):
+            p, v, h = entity.position, entity.velocity, entity.heading
+            row[:] = (p.x, p.y, v.x, v.y, h.x, h.y)
+        pitch = self.pitch
+        header = SNAPSHOT_HEADER.pack(pitch.tick, pitch.red_score, pitch.blue_score)
+        return header + state.tobytes()
+
+    def publish(self) -> int:
+        """hands the current snapshot to the spectators due one, returns how many"""
+        time = self.pitch.time
+        due = [s for s in self.spectators if s.due(time)]
+        if due:
+            frame = self.snapshot()
+            for spectator in due:
+                spectator.offer(frame)
+        return len(due)
+
+    async def run(self, ticks: int | None = None) -> MatchSummary:
+        """
+        plays ticks more updates, or the rest of the match, publishing
+        after each, and summarises the match so far
+        """
+        pitch = self.pitch
+        if ticks is None:
+            ticks = max(0, pitch.match_ticks - pitch.tick)
+        loop = asyncio.get_running_loop()
+        period = 0.0 if math.isinf(self.tick_rate) else 1.0 / self.tick_rate
+        start = loop.time()
+        deadline = start
+        self.publish()
+        await asyncio.sleep(0)
+        for _ in range(ticks):
+            pitch.update()
+            self.publish()
+            deadline += period
+            delay = deadline - loop.time()
+            if period and delay < -MAX_LAG:
+                # too far behind to catch up, carry on from now
+                self.late_ticks += 1
+                deadline = loop.time()
+            # sleeping, if only for no time, lets the spectators be served
+            await asyncio.sleep(max(delay, 0.0))
+        return pitch.summary(loop.time() - start, ticks)
+
+    async def close(self) -> None:
+        for server in self.servers:
+            server.close()
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks)
+        for server in self.servers:
+            await server.wait_closed()
+        self.servers.clear()
+
+    async def __aenter__(self) -> "SpectatorServer":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+
+class SpectatorClient:
+    """a subscription to a SpectatorServer, see connect_tcp and connect_unix"""
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        entity_count: int,
+    ) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.entity_count = entity_count
+        self._state_size = entity_count * COLUMNS * 4
+
+    @classmethod
+    async def _subscribe(
+        cls, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, fps: float
+    ) -> "SpectatorClient":
+        writer.write(SUBSCRIBE.pack(SUBSCRIBE_MAGIC, fps))
+        data = await reader.readexactly(STREAM_HEADER.size)
+        magic, version, entity_count = STREAM_HEADER.unpack(data)
+        if magic != STREAM_MAGIC:
+            writer.close()
+            raise ValueError("<SpectatorClient> not a spectator stream")
+        if version != FORMAT_VERSION:
+            writer.close()
+            raise ValueError(f"<SpectatorClient> unsupported format version {version}")
+        return cls(reader, writer, entity_count)
+
+    async def set_fps(self, fps: float) -> None:
+        self.writer.write(SUBSCRIBE.pack(SUBSCRIBE_MAGIC, fps))
+        await self.writer.drain()
+
+    async def read(self) -> Snapshot:
+        """the next snapshot, raises IncompleteReadError once the stream ends"""
+        data = await self.reader.readexactly(SNAPSHOT_HEADER.size + self._state_size)
+        tick, red_score, blue_score = SNAPSHOT_HEADER.unpack_from(data)
+        state = np.frombuffer(data, dtype="<f4", offset=SNAPSHOT_HEADER.size)
+        return Snapshot(
+            tick, red_score, blue_score, state.reshape(self.entity_count, COLUMNS)
+        )
+
+    async def close(self) -> None:
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def connect_tcp(host: str, port: int, fps: float = 0.0) -> SpectatorClient:
+    reader, writer = await asyncio.open_connection(host, port)
+    return await SpectatorClient._subscribe(reader, writer, fps)
+
+
+async def connect_unix(path: Path | str, fps: float = 0.0) -> SpectatorClient:
+    reader, writer = await asyncio.open_unix_connection(path)
+    return await SpectatorClient._subscribe(reader, writer, fps)
@@ -0,0 +1,372 @@
+"""
+the steering behaviours of the players, after SteeringBehaviors in
+Buckland's Simple Soccer.
+
+every behaviour returns the force that would change the player's
+velocity to the one it wants within a single tick. the active ones are
+combined by priority: each is added to the total until the player's
+max_force is used up, and once it is the rest are not calculated.
+
+calculate_batch does the same for any number of players with array
+operations, giving the same forces as calling calculate on each.
+"""
+
+import enum
+from collections.abc import Sequence
+from typing import Protocol
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .common.moving_entity import MovingEntity
+from .common.vector2d import Vector2D
+from .params import Params
+
+FloatArray = NDArray[np.float64]
+
+
+class Behavior(enum.IntFlag):
+    NONE = 0
+    SEPARATION = 1
+    SEEK = 2
+    ARRIVE = 4
+    PURSUIT = 8
+    INTERPOSE = 16
+
+
+# the order the behaviours get their share of max_force, the first first
+PRIORITY = (
+    Behavior.SEPARATION,
+    Behavior.SEEK,
+    Behavior.ARRIVE,
+    Behavior.PURSUIT,
+    Behavior.INTERPOSE,
+)
+# PRIORITY with the int value of each, for the hot loop of calculate
+_PRIORITY_VALUES = tuple((behavior, behavior.value) for behavior in PRIORITY)
+# the behaviours that move a player somewhere, as opposed to separation
+MOVEMENT = Behavior.SEEK | Behavior.ARRIVE | Behavior.PURSUIT | Behavior.INTERPOSE
+
+
+class Ball(Protocol):
+    @property
+    def position(self) -> Vector2D:
+        ...
+
+    def future_position(self, time: float) -> Vector2D:
+        ...
+
+    def future_positions(self, times: FloatArray) -> FloatArray:
+        ...
+
+
+class SteeringBehaviors:
+    """
+    the steering force of a player. turn behaviours on and off with on()
+    and off(), set target for seek and arrive and target and
+    interpose_distance for interpose, then call calculate() once a tick
+    """
+
+    def __init__(
+        self,
+        player: MovingEntity,
+        ball: Ball,
+        params: Params,
+        neighbours: Sequence[MovingEntity] = (),
+    ) -> None:
+        self.player = player
+        self.ball = ball
+        self.params = params
+        # the entities the player keeps its distance from, may include it
+        self.neighbours = neighbours
+        # the Behavior bits of the active behaviours, a plain int as
+        # IntFlag arithmetic is slow
+        self.flags = 0
+        self.target = Vector2D()
+        self.interpose_distance = 0.0
+        # each behaviour's force is scaled by its weight before it is added
+        self.weights = {behavior: 1.0 for behavior in PRIORITY}
+        self.steering_force = Vector2D()
+
+    def on(self, behavior: Behavior) -> None:
+        self.flags |= behavior.value
+
+    def off(self, behavior: Behavior) -> None:
+        self.flags &= ~behavior.value
+
+    def is_on(self, behavior: Behavior) -> bool:
+        return bool(self.flags & behavior.value)
+
+    def calculate(self, dt: float) -> Vector2D:
+        """the prioritized, truncated sum of the active behaviours"""
+        total = Vector2D()
+        flags = self.flags
+        for behavior, value in _PRIORITY_VALUES:
+            if not flags & value:
+                continue
+            force = self._force(behavior, dt)
+            weight = self.weights[behavior]
+            if weight != 1.0:
+                force *= weight
+            if not self.accumulate_force(total, force):
+                break
+        self.steering_force = total
+        return total
+
+    def accumulate_force(self, running_total: Vector2D, force: Vector2D) -> bool:
+        """
+        adds as much of force to running_total as is left of max_force,
+        returns false once there is nothing left
+        """
+        remaining = self.player.max_force - running_total.length()
+        if remaining <= 0.0:
+            return False
+        magnitude = force.length()
+        if magnitude < remaining:
+            running_total += force
+        else:
+            running_total += force * (remaining / magnitude)
+        return True
+
+    def _force(self, behavior: Behavior, dt: float) -> Vector2D:
+        if behavior == Behavior.SEPARATION:
+            return self.separation()
+        if behavior == Behavior.SEEK:
+            return self.seek(self.target, dt)
+        if behavior == Behavior.ARRIVE:
+            return self.arrive(self.target, dt)
+        if behavior == Behavior.PURSUIT:
+            return self.pursuit(dt)
+        return self.interpose(self.target, self.interpose_distance, dt)
+
+    def seek(self, target: Vector2D, dt: float) -> Vector2D:
+        """turns the velocity towards target at full speed"""
+        player = self.player
+        desired = target - player.position
+        desired.normalize()
+        desired *= player.max_speed
+        desired -= player.velocity
+        desired *= player.mass / dt
+        return desired
+
+    def arrive(self, target: Vector2D, dt: float) -> Vector2D:
+        """brings the player to rest at target"""
+        player = self.player
+        to_target = target - player.position
+        dist = to_target.length()
+        if dist < 0.01:
+            desired = player.velocity.get_reverse()
+        else:
+            speed = min(dist / self.params.arrive_deceleration_time, player.max_speed)
+            desired = to_target * (speed / dist)
+            desired -= player.velocity
+        desired *= player.mass / dt
+        return desired
+
+    def pursuit(self, dt: float) -> Vector2D:
+        """seeks where the ball will be when the player gets to it"""
+        player = self.player
+        lookahead = player.position.distance(self.ball.position) / player.max_speed
+        return self.seek(self.ball.future_position(lookahead), dt)
+
+    def interpose(self, target: Vector2D, distance: float, dt: float) -> Vector2D:
+        """arrives at the point distance from target towards the ball"""
+        to_ball = self.ball.position - target
+        to_ball.normalize()
+        return self.arrive(target + to_ball * distance, dt)
+
+    def separation(self) -> Vector2D:
+        """
+        pushes away from every neighbour within view distance, harder the
+        closer it is
+        """
+        position = self.player.position
+        x, y = position.x, position.y
+        view_sq = self.params.player_view_distance**2
+        force_x = force_y = 0.0
+        for neighbour in self.neighbours:
+            other = neighbour.position
+            dx = x - other.x
+            dy = y - other.y
+            dist_sq = dx * dx + dy * dy
+            if 0.0 < dist_sq < view_sq:
+                # normalized and divided by the distance
+                force_x += dx / dist_sq
+                force_y += dy / dist_sq
+        coefficient = self.params.player_separation_coefficient
+        return Vector2D(force_x * coefficient, force_y * coefficient)
+
+
+def _seek_forces(
+    positions: FloatArray,
+    velocities: FloatArray,
+    targets: FloatArray,
+    max_speeds: FloatArray,
+    scales: FloatArray,
+) -> FloatArray:
+    desired = targets - positions
+    length = np.hypot(desired[:, 0], desired[:, 1])
+    factor = np.divide(max_speeds, length, out=np.zeros_like(length), where=length > 0)
+    desired *= factor[:, None]
+    desired -= velocities
+    desired *= scales[:, None]
+    return desired
+
+
+def _arrive_forces(
+    positions: FloatArray,
+    velocities: FloatArray,
+    targets: FloatArray,
+    max_speeds: FloatArray,
+    scales: FloatArray,
+    deceleration_time: float,
+) -> FloatArray:
+    desired = targets - positions
+    dist = np.hypot(desired[:, 0], desired[:, 1])
+    # the speed to go at over the distance, zero once arrived
+    speed = np.minimum(dist / deceleration_time, max_speeds)
+    factor = np.divide(speed, dist, out=np.zeros_like(dist), where=dist >= 0.01)
+    desired *= factor[:, None]
+    desired -= velocities
+    desired *= scales[:, None]
+    return desired
+
+
+def _separation_forces(
+    positions: FloatArray,
+    neighbours: FloatArray,
+    view_distance: float,
+    coefficient: float,
+) -> FloatArray:
+    # (N, M, 2) from every neighbour to every player
+    to_players = positions[:, None, :] - neighbours[None, :, :]
+    dist_sq = np.einsum("nmk,nmk->nm", to_players, to_players)
+    near = (dist_sq > 0.0) & (dist_sq < view_distance * view_distance)
+    inverse = np.divide(coefficient, dist_sq, out=np.zeros_like(dist_sq), where=near)
+    forces: FloatArray = np.einsum("nmk,nm->nk", to_players, inverse)
+    return forces
+
+
+def calculate_batch(
+    behaviors: Sequence[SteeringBehaviors],
+    dt: float,
+    neighbours: Sequence[MovingEntity] | None = None,
+) -> FloatArray:
+    """
+    the (N, 2) steering forces of the players of behaviors, which must
+    share a ball and params. neighbours, for separation, defaults to the
+    neighbours of the first.
+
+    every behaviour any player uses is worked out for all the players at
+    once, then the forces of the players using it are accumulated by
+    priority as calculate does. with a pitch's worth of players that is
+    cheaper than picking out the rows that use each one
+    """
+    count = len(behaviors)
+    if not count:
+        return np.zeros((count, 2))
+    first = behaviors[0]
+    params = first.params
+    ball = first.ball
+    if neighbours is None:
+        neighbours = first.neighbours
+
+    # one conversion of everything the behaviours read
+    rows = []
+    used = 0
+    for b in behaviors:
+        player = b.player
+        position, velocity, target = player.position, player.velocity, b.target
+        weights = b.weights
+        used |= b.flags
+        rows.append(
+            (
+                position.x, position.y, velocity.x, velocity.y, target.x,
+                target.y, player.max_speed, player.max_force, player.mass,
+                b.interpose_distance, b.flags, weights[Behavior.SEPARATION],
+                weights[Behavior.SEEK], weights[Behavior.ARRIVE],
+                weights[Behavior.PURSUIT], weights[Behavior.INTERPOSE],
+            )
+        )  # fmt: skip
+    data = np.array(rows)
+    positions = data[:, 0:2]
+    velocities = data[:, 2:4]
+    targets = data[:, 4:6]
+    max_speeds = data[:, 6]
+    max_forces = data[:, 7]
+    scales = data[:, 8] / dt
+    flags = data[:, 10].astype(np.int64)
+
+    total: FloatArray = np.zeros((count, 2))
+    remaining = max_forces.copy()
+    for i, (behavior, value) in enumerate(_PRIORITY_VALUES):
+        if not used & value:
+            continue
+        force = _batch_force(
+            behavior, data, positions, velocities, targets, max_speeds, scales,
+            ball, params, neighbours,
+        )  # fmt: skip
+        force *= data[:, 11 + i, None]
+        magnitude = np.hypot(force[:, 0], force[:, 1])
+        active = ((flags & value) != 0) & (remaining > 0)
+        # the whole force if it fits, else as much as does
+        scale = np.divide(
+            remaining,
+            magnitude,
+            out=np.ones_like(magnitude),
+            where=magnitude >= remaining,
+        )
+        scale[~active] = 0.0
+        force *= scale[:, None]
+        total += force
+        remaining = max_forces - np.hypot(total[:, 0], total[:, 1])
+    return total
+
+
+def _batch_force(
+    behavior: Behavior,
+    data: FloatArray,
+    positions: FloatArray,
+    velocities: FloatArray,
+    targets: FloatArray,
+    max_speeds: FloatArray,
+    scales: FloatArray,
+    ball: Ball,
+    params: Params,
+    neighbours: Sequence[MovingEntity],
+) -> FloatArray:
+    """one behaviour for every player of calculate_batch"""
+    if behavior == Behavior.SEPARATION:
+        others = np.array([(n.position.x, n.position.y) for n in neighbours])
+        return _separation_forces(
+            positions,
+            others.reshape(-1, 2),
+            params.player_view_distance,
+            params.player_separation_coefficient,
+        )
+    if behavior == Behavior.SEEK:
+        return _seek_forces(positions, velocities, targets, max_speeds, scales)
+
+    deceleration_time = params.arrive_deceleration_time
+    if behavior == Behavior.ARRIVE:
+        return _arrive_forces(
+            positions, velocities, targets, max_speeds, scales, deceleration_time
+        )
+
+    ball_position = np.array([ball.position.x, ball.position.y])
+    if behavior == Behavior.PURSUIT:
+        to_ball = ball_position - positions
+        lookahead = np.hypot(to_ball[:, 0], to_ball[:, 1]) / max_speeds
+        predicted = ball.future_positions(lookahead)
+        return _seek_forces(positions, velocities, predicted, max_speeds, scales)
+
+    # arrive at the point the interpose distance from the target
+    # towards the ball
+    to_ball = ball_position - targets
+    length = np.hypot(to_ball[:, 0], to_ball[:, 1])
+    offset = np.divide(data[:, 9], length, out=np.zeros_like(length), where=length > 0)
+    to_ball *= offset[:, None]
+    to_ball += targets
+    return _arrive_forces(
+        positions, velocities, to_ball, max_speeds, scales, deceleration_time
+    )
@@ -0,0 +1,21 @@
+import math
+from dataclasses import dataclass
+
+
+@dataclass
+class MatchSummary:
+    """the outcome of running a pitch for a number of ticks"""
+
+    seed: int
+    ticks: int
+    red_score: int
+    blue_score: int
+    # the fraction of the ticks each team controlled the ball
+    red_possession: float
+    blue_possession: float
+    # wall time spent running the ticks, in seconds
+    elapsed: float
+
+    @property
+    def ticks_per_second(self) -> float:
+        return self.ticks / self.elapsed if self.elapsed > 0 else math.inf
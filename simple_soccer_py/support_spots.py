@@ -0,0 +1,170 @@
+"""
+scores the spots a supporting player could run to when its team has the
+ball, after SupportSpotCalculator in Buckland's Simple Soccer.
+
+the scoring works on arrays with a leading pitch axis P, so the spots of
+any number of pitches are scored in one pass.
+"""
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .common.regulator import Regulator
+from .common.vector2d import Vector2D
+from .params import Params
+from .passing import entity_arrays, safe_passes
+
+if TYPE_CHECKING:
+    from .models import SoccerTeam
+
+FloatArray = NDArray[np.float64]
+
+# the number of points across the goal mouth tried for a shot from a spot
+SHOT_TARGETS = 5
+
+
+def support_spot_grid(
+    params: Params, attacking_right: bool, nx: int = 13, ny: int = 6
+) -> FloatArray:
+    """
+    the (S, 2) candidate spots in the half a team attacks, on an nx by ny
+    grid over the middle 90% by 80% of the pitch
+    """
+    width = params.pitch_width * 0.9
+    height = params.pitch_height * 0.8
+    slice_x = width / nx
+    slice_y = height / ny
+    left = (params.pitch_width - width) / 2 + slice_x
+    right = params.pitch_width - left
+    top = (params.pitch_height - height) / 2 + slice_y
+
+    spots = []
+    for x in range(nx // 2 - 1):
+        for y in range(ny):
+            if attacking_right:
+                spots.append((right - x * slice_x, top + y * slice_y))
+            else:
+                spots.append((left + x * slice_x, top + y * slice_y))
+    return np.array(spots)
+
+
+def score_support_spots(
+    spots: FloatArray,
+    attackers: FloatArray,
+    opponents: FloatArray,
+    opponent_speeds: FloatArray,
+    opponent_radii: FloatArray,
+    goal_targets: FloatArray,
+    params: Params,
+) -> FloatArray:
+    """
+    the (P, S) scores of the spots (P, S, 2) of P pitches, given the
+    attacker with the ball (P, 2), the opponents (P, O, 2) with their max
+    speeds and radii (P, O) and points across the goal mouth (P, K, 2).
+
+    every spot scores 1, plus pass_safe_score if the attacker can pass to
+    it, can_score_score if a shot from it could go in and up to
+    distance_score the closer its distance from the attacker is to the
+    optimal distance
+    """
+    p = params
+    spots = np.asarray(spots, dtype=np.float64)
+    attackers = np.asarray(attackers, dtype=np.float64)
+    pitches, count, _ = spots.shape
+    ball_speed = p.max_passing_force / p.ball_mass
+    shot_speed = p.max_shooting_force / p.ball_mass
+
+    scores = np.ones((pitches, count))
+    passable = safe_passes(
+        attackers[:, None, :],
+        spots,
+        opponents,
+        opponent_speeds,
+        opponent_radii,
+        ball_speed,
+        p.friction,
+        p.ball_radius,
+    )
+    scores += passable * p.spot_pass_safe_score
+
+    # every spot against every point of the goal mouth
+    shots = goal_targets.shape[1]
+    shot_origins = np.repeat(spots, shots, axis=1)
+    shot_targets = np.tile(goal_targets, (1, count, 1))
+    can_score = safe_passes(
+        shot_origins,
+        shot_targets,
+        opponents,
+        opponent_speeds,
+        opponent_radii,
+        shot_speed,
+        p.friction,
+        p.ball_radius,
+    ).reshape(pitches, count, shots)
+    scores += can_score.any(axis=-1) * p.spot_can_score_score
+
+    distance = np.hypot(*(spots - attackers[:, None, :]).transpose(2, 0, 1))
+    optimal = p.spot_optimal_distance
+    closeness = (optimal - np.abs(optimal - distance)) / optimal
+    scores += np.maximum(closeness, 0.0) * p.spot_distance_score
+    return scores
+
+
+class SupportSpotCalculator:
+    """
+    finds the best spot for a team's supporting player. the spots are only
+    rescored when the regulator allows, Params.support_spot_update_frequency
+    times a simulated second, and the best one is cached in between
+    """
+
+    def __init__(self, team: "SoccerTeam") -> None:
+        self.team = team
+        pitch = team.pitch
+        p = pitch.params
+        self.spots = support_spot_grid(
+            p, team.home_goal.facing.x > 0, p.support_spots_x, p.support_spots_y
+        )
+        self.scores = np.zeros(len(self.spots))
+        self.best_spot: Vector2D | None = None
+        self.regulator = Regulator(p.support_spot_update_frequency, pitch._clock)
+
+        goal = team.opponents_goal
+        fractions = np.linspace(0.1, 0.9, SHOT_TARGETS)[:, None]
+        left = np.array([goal.left_post.x, goal.left_post.y])
+        right = np.array([goal.right_post.x, goal.right_post.y])
+        self.goal_targets = left + (right - left) * fractions
+
+    def determine_best_supporting_position(self, attacker: Vector2D) -> Vector2D | None:
+        """
+        rescores the spots for the attacker with the ball if the regulator
+        is ready, otherwise returns the cached best spot
+        """
+        ready = self.regulator.is_ready()
+        if self.best_spot is not None and not ready:
+            return self.best_spot
+
+        positions, speeds, radii = entity_arrays(self.team.opponents.players)
+        scores = score_support_spots(
+            self.spots[None],
+            np.array([[attacker.x, attacker.y]]),
+            positions[None],
+            speeds[None],
+            radii[None],
+            self.goal_targets[None],
+            self.team.pitch.params,
+        )
+        self.scores = scores[0]
+        best = int(np.argmax(self.scores))
+        self.best_spot = Vector2D(*self.spots[best].tolist())
+        return self.best_spot
+
+    def get_best_supporting_spot(self, attacker: Vector2D) -> Vector2D | None:
+        if self.best_spot is not None:
+            return self.best_spot
+        return self.determine_best_supporting_position(attacker)
+
+    def reset(self) -> None:
+        self.best_spot = None
+        self.regulator.reset()
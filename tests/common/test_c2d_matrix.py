@@ -0,0 +1,92 @@
+import math
+
+import numpy as np
+import pytest
+
+from simple_soccer_py.common.c2d_matrix import C2DMatrix, Matrix
+from simple_soccer_py.common.vector2d import Vector2D
+
+
+def full(mat: C2DMatrix) -> np.ndarray:
+    m11, m12, m21, m22, m31, m32 = mat.elements
+    return np.array([[m11, m12, 0], [m21, m22, 0], [m31, m32, 1]])
+
+
+class TestC2DMatrix:
+    @pytest.fixture
+    def mat(self) -> C2DMatrix:
+        return C2DMatrix()
+
+    def test_identity(self, mat: C2DMatrix) -> None:
+        mat.translate(3, 4)
+        mat.identity()
+        assert mat.elements == (1, 0, 0, 1, 0, 0)
+
+    def test_repr(self, mat: C2DMatrix) -> None:
+        assert repr(mat).splitlines()[3] == "0.0000 0.0000 1.0000"
+
+    def test_translate(self, mat: C2DMatrix) -> None:
+        mat.translate(3, 4)
+        v = Vector2D(1, 2)
+        mat.transform_vector2ds(v)
+        assert v == Vector2D(4, 6)
+
+    def test_scale(self, mat: C2DMatrix) -> None:
+        mat.scale(2, 3)
+        v = Vector2D(1, 2)
+        mat.transform_vector2ds(v)
+        assert v == Vector2D(2, 6)
+
+    def test_rotate_by_angle(self, mat: C2DMatrix) -> None:
+        mat.rotate_by_angle(math.pi / 2)
+        v = Vector2D(1, 0)
+        mat.transform_vector2ds(v)
+        assert v.x == pytest.approx(0)
+        assert v.y == pytest.approx(1)
+
+    def test_composition_matches_3x3(self, mat: C2DMatrix) -> None:
+        expected = np.eye(3)
+        mat.translate(3, -2)
+        expected = expected @ np.array([[1, 0, 0], [0, 1, 0], [3, -2, 1]])
+        mat.rotate_by_angle(0.3)
+        c, s = math.cos(0.3), math.sin(0.3)
+        expected = expected @ np.array([[c, s, 0], [-s, c, 0], [0, 0, 1]])
+        mat.scale(2, 0.5)
+        expected = expected @ np.array([[2, 0, 0], [0, 0.5, 0], [0, 0, 1]])
+        mat.rotate_by_vectors(Vector2D(0, 1), Vector2D(-1, 0))
+        expected = expected @ np.array([[0, 1, 0], [-1, 0, 0], [0, 0, 1]])
+        np.testing.assert_allclose(full(mat), expected)
+
+    def test_matrix_multiply(self, mat: C2DMatrix) -> None:
+        m = Matrix()
+        m._m11, m._m22, m._m33 = 2.0, 2.0, 1.0
+        m._m31, m._m32 = 1.0, 1.0
+        mat.translate(1, 0)
+        mat.matrix_multiply(m)
+        assert mat.elements == (2, 0, 0, 2, 3, 1)
+
+    def test_apply_to_array(self, mat: C2DMatrix) -> None:
+        mat.rotate_by_angle(1.1)
+        mat.translate(5, 6)
+        points = np.array([[1.0, 2.0], [-3.0, 0.5]])
+        vectors = [Vector2D(*p) for p in points]
+        assert mat.apply_to_array(points) is points
+        mat.transform_vector2ds(*vectors)
+        np.testing.assert_allclose(points, [[v.x, v.y] for v in vectors])
+
+    def test_apply_to_array_directions(self, mat: C2DMatrix) -> None:
+        mat.rotate_by_angle(math.pi)
+        mat.translate(5, 6)
+        points = mat.apply_to_array(np.array([[1.0, 0.0]]), translate=False)
+        np.testing.assert_allclose(points, [[-1, 0]], atol=1e-12)
+
+    def test_world_local_round_trip(self) -> None:
+        heading = Vector2D(3, 4)
+        heading.normalize()
+        side = heading.perp()
+        position = Vector2D(10, -2)
+        point = Vector2D(7, 1)
+        C2DMatrix.local_transform(heading, side, position).transform_vector2ds(point)
+        C2DMatrix.world_transform(heading, side, position).transform_vector2ds(point)
+        assert point.x == pytest.approx(7)
+        assert point.y == pytest.approx(1)
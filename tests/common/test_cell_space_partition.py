@@ -0,0 +1,134 @@
+import random
+
+import pytest
+
+from simple_soccer_py.common.cell_space_partition import (
+    CellSpacePartition,
+    QuadTreePartition,
+    SpacePartition,
+)
+from simple_soccer_py.common.moving_entity import BaseGameEntity
+from simple_soccer_py.common.vector2d import Vector2D
+
+
+def make_entities(rng: random.Random, n: int) -> list[BaseGameEntity]:
+    entities = []
+    for i in range(n):
+        entity = BaseGameEntity(i)
+        entity.position = Vector2D(rng.uniform(0, 100), rng.uniform(0, 60))
+        entity.bounding_radius = rng.uniform(0.5, 2)
+        entities.append(entity)
+    return entities
+
+
+def brute_neighbours(
+    entities: list[BaseGameEntity], position: Vector2D, radius: float
+) -> set[int]:
+    return {
+        e.id for e in entities if e.position.distance_sq(position) < radius * radius
+    }
+
+
+@pytest.fixture(params=["grid", "quadtree"])
+def partition(request: pytest.FixtureRequest) -> SpacePartition:
+    if request.param == "grid":
+        return CellSpacePartition(100, 60, 10, 6)
+    return QuadTreePartition(100, 60, max_entities=4)
+
+
+class TestSpacePartition:
+    def test_neighbours_match_brute_force(self, partition: SpacePartition) -> None:
+        rng = random.Random(0)
+        entities = make_entities(rng, 200)
+        partition.add_entities(entities)
+        assert len(partition) == 200
+
+        for _ in range(5):
+            for entity in entities:
+                entity.position.x += rng.uniform(-5, 5)
+                entity.position.y += rng.uniform(-5, 5)
+            partition.update_entities(entities)
+            for _ in range(20):
+                position = Vector2D(rng.uniform(-10, 110), rng.uniform(-10, 70))
+                radius = rng.uniform(1, 20)
+                found = {e.id for e in partition.neighbours(position, radius)}
+                assert found == brute_neighbours(entities, position, radius)
+
+    def test_add_twice(self, partition: SpacePartition) -> None:
+        entity = BaseGameEntity(1)
+        partition.add_entity(entity)
+        with pytest.raises(ValueError):
+            partition.add_entity(entity)
+
+    def test_remove(self, partition: SpacePartition) -> None:
+        entities = make_entities(random.Random(1), 20)
+        partition.add_entities(entities)
+        partition.remove_entity(entities[0])
+        assert len(partition) == 19
+        found = partition.neighbours(entities[0].position, 200)
+        assert entities[0] not in found
+        assert len(found) == 19
+
+    def test_tag_neighbours(self, partition: SpacePartition) -> None:
+        rng = random.Random(2)
+        entities = make_entities(rng, 100)
+        partition.add_entities(entities)
+        for entity in entities[:10]:
+            tagged = partition.tag_neighbours(entity, 10)
+            expected = {
+                other.id
+                for other in entities
+                if other is not entity
+                and other.position.distance(entity.position)
+                < 10 + other.bounding_radius
+            }
+            assert {e.id for e in tagged} == expected
+            assert {e.id for e in entities if e.is_tagged()} == expected
+
+    def test_boundary(self, partition: SpacePartition) -> None:
+        centre, inside, edge = BaseGameEntity(0), BaseGameEntity(1), BaseGameEntity(2)
+        centre.position = Vector2D(50, 30)
+        inside.position = Vector2D(53.9, 30)
+        edge.position = Vector2D(54, 30)
+        partition.add_entities([centre, inside, edge])
+        # exactly at the radius is out for both
+        assert set(partition.neighbours(centre.position, 4)) == {centre, inside}
+        assert partition.tag_neighbours(centre, 4) == [inside]
+        assert not edge.is_tagged()
+
+
+def test_grid_position_to_index() -> None:
+    partition = CellSpacePartition(100, 60, 10, 6)
+    assert partition.position_to_index(Vector2D(0, 0)) == 0
+    assert partition.position_to_index(Vector2D(15, 25)) == 21
+    assert partition.position_to_index(Vector2D(-5, 100)) == 50
+
+
+def test_grid_update_only_rebuckets_on_cell_change() -> None:
+    partition = CellSpacePartition(100, 60, 10, 6)
+    entity = BaseGameEntity(1)
+    entity.position = Vector2D(1, 1)
+    partition.add_entity(entity)
+    entity.position.x = 2
+    assert not partition.update_entity(entity)
+    entity.position.x = 55
+    assert partition.update_entity(entity)
+    assert partition.neighbours(Vector2D(55, 1), 1) == [entity]
+
+
+def test_quadtree_splits_and_rebuckets() -> None:
+    partition = QuadTreePartition(100, 60, max_entities=2)
+    entities = [BaseGameEntity(i) for i in range(3)]
+    for i, entity in enumerate(entities):
+        entity.position = Vector2D(10 + i / 100, 10)
+        partition.add_entity(entity)
+    entities[0].position.x = 10.1
+    assert not partition.update_entity(entities[0])
+    entities[0].position.x = 90
+    assert partition.update_entity(entities[0])
+    assert partition.neighbours(Vector2D(90, 10), 1) == [entities[0]]
+
+
+def test_space_partition_is_abstract() -> None:
+    with pytest.raises(TypeError):
+        SpacePartition()  # type: ignore[abstract]
@@ -0,0 +1,106 @@
+import pytest
+
+from simple_soccer_py.common.entity_manager import EntityManager
+from simple_soccer_py.common.message_dispatcher import MessageDispatcher
+from simple_soccer_py.common.moving_entity import BaseGameEntity
+from simple_soccer_py.common.telegram import Telegram
+from simple_soccer_py.common.vector2d import Vector2D
+
+
+def make_entity(id: int, x: float, type: int = 0) -> BaseGameEntity:
+    entity = BaseGameEntity(id)
+    entity.position = Vector2D(x, 0)
+    entity.bounding_radius = 1.0
+    entity.type = type
+    return entity
+
+
+class TestEntityManager:
+    @pytest.fixture
+    def entities(self) -> list[BaseGameEntity]:
+        return [make_entity(i, i * 10, type=i % 2) for i in range(6)]
+
+    @pytest.fixture
+    def manager(self, entities: list[BaseGameEntity]) -> EntityManager:
+        return EntityManager(entities)
+
+    def test_lookup(
+        self, manager: EntityManager, entities: list[BaseGameEntity]
+    ) -> None:
+        assert len(manager) == 6
+        assert manager[3] is entities[3]
+        assert manager.get_entity_from_id(3) is entities[3]
+        assert manager.get(42) is None
+        assert 5 in manager
+        assert list(manager) == [0, 1, 2, 3, 4, 5]
+
+    def test_register_twice(
+        self, manager: EntityManager, entities: list[BaseGameEntity]
+    ) -> None:
+        with pytest.raises(ValueError):
+            manager.register(make_entity(0, 0))
+        with pytest.raises(ValueError):
+            EntityManager().register(entities[0])
+
+    def test_unregister(
+        self, manager: EntityManager, entities: list[BaseGameEntity]
+    ) -> None:
+        entities[1].tag()
+        manager.unregister_many(entities[:2])
+        assert len(manager) == 4
+        assert [e.id for e in manager.of_type(1)] == [3, 5]
+        assert list(manager.tagged()) == []
+        # unregistered entities no longer notify the manager
+        entities[0].tag()
+        assert list(manager.tagged()) == []
+        with pytest.raises(KeyError):
+            manager.unregister(entities[0])
+
+    def test_of_type(
+        self, manager: EntityManager, entities: list[BaseGameEntity]
+    ) -> None:
+        assert [e.id for e in manager.of_type(0)] == [0, 2, 4]
+        entities[2].type = 7
+        assert [e.id for e in manager.of_type(0)] == [0, 4]
+        assert [e.id for e in manager.of_type(7)] == [2]
+        assert list(manager.of_type(9)) == []
+
+    def test_tag_index(
+        self, manager: EntityManager, entities: list[BaseGameEntity]
+    ) -> None:
+        entities[1].tag()
+        entities[4].tag()
+        assert [e.id for e in manager.tagged()] == [1, 4]
+        entities[1].untag()
+        assert [e.id for e in manager.tagged()] == [4]
+        manager.untag_all()
+        assert not entities[4].is_tagged()
+        assert list(manager.tagged()) == []
+
+    def test_tagged_within_radius(
+        self, manager: EntityManager, entities: list[BaseGameEntity]
+    ) -> None:
+        for entity in entities[1:]:
+            entity.tag()
+        near = manager.tagged_within_radius(Vector2D(0, 0), 20)
+        assert [e.id for e in near] == [1, 2]
+
+    def test_clear(
+        self, manager: EntityManager, entities: list[BaseGameEntity]
+    ) -> None:
+        manager.clear()
+        assert len(manager) == 0
+        EntityManager().register(entities[0])
+
+    def test_message_dispatch(self) -> None:
+        received: list[Telegram] = []
+
+        class Receiver(BaseGameEntity):
+            def handle_message(self, msg: Telegram) -> bool:
+                received.append(msg)
+                return True
+
+        manager = EntityManager([Receiver(1)])
+        dispatcher = MessageDispatcher(manager)
+        assert dispatcher.dispatch_msg(0, 0, 1, 5)
+        assert received[0].msg == 5
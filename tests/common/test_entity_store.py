@@ -0,0 +1,150 @@
+import random
+
+import numpy as np
+import pytest
+
+from simple_soccer_py.common.entity_store import EntityStore, MovingEntityView
+from simple_soccer_py.common.moving_entity import MovingEntity
+from simple_soccer_py.common.vector2d import Vector2D
+
+
+def make_args(rng: random.Random, id: int) -> dict[str, object]:
+    heading = Vector2D(rng.uniform(-1, 1), rng.uniform(-1, 1))
+    heading.normalize()
+    return {
+        "id": id,
+        "position": Vector2D(rng.uniform(0, 100), rng.uniform(0, 60)),
+        "radius": 1.0,
+        "velocity": Vector2D(rng.uniform(-2, 2), rng.uniform(-2, 2)),
+        "max_speed": rng.uniform(1, 3),
+        "heading": heading,
+        "mass": rng.uniform(1, 5),
+        "scale": Vector2D(1, 1),
+        "turn_rate": 0.4,
+        "max_force": rng.uniform(0.5, 2),
+    }
+
+
+class TestEntityStore:
+    @pytest.fixture
+    def store(self) -> EntityStore:
+        return EntityStore(capacity=2)
+
+    @pytest.fixture
+    def entity(self, store: EntityStore) -> MovingEntityView:
+        return store.add(**make_args(random.Random(0), 7))  # type: ignore[arg-type]
+
+    def test_add(self, store: EntityStore, entity: MovingEntityView) -> None:
+        assert len(store) == 1
+        assert entity.id == 7
+        assert entity.row == 0
+        assert store[0] is entity
+        assert store.positions[0, 0] == entity.position.x
+        assert entity.side == entity.heading.perp()
+
+    def test_grow(self, store: EntityStore) -> None:
+        rng = random.Random(1)
+        entities = [store.add(**make_args(rng, i)) for i in range(5)]  # type: ignore[arg-type]
+        assert store.capacity >= 5
+        assert list(store.ids) == [0, 1, 2, 3, 4]
+        assert entities[4].position.x == store.positions[4, 0]
+
+    def test_view_writes_through(self, entity: MovingEntityView) -> None:
+        entity.position = Vector2D(3, 4)
+        assert entity.store.positions[0].tolist() == [3, 4]
+        entity.velocity += Vector2D(1, 1)
+        assert entity.store.velocities[0, 0] == entity.velocity.x
+        entity.max_speed = 9
+        assert entity.store.max_speeds[0] == 9
+        entity.heading = Vector2D(0, 1)
+        assert entity.side == Vector2D(-1, 0)
+
+    def test_remove(self, store: EntityStore) -> None:
+        rng = random.Random(2)
+        a, b, c = (store.add(**make_args(rng, i)) for i in range(3))  # type: ignore[arg-type]
+        position = c.position.copy()
+        store.remove(a)
+        assert len(store) == 2
+        assert c.row == 0
+        assert c.position == position
+        assert list(store.ids) == [2, 1]
+        with pytest.raises(ValueError):
+            a.position.x
+        with pytest.raises(ValueError):
+            store.remove(a)
+
+    def test_integrate_matches_scalar(self) -> None:
+        rng = random.Random(3)
+        store = EntityStore()
+        scalar = []
+        for i in range(50):
+            args = make_args(rng, i)
+            store.add(**args)  # type: ignore[arg-type]
+            copy = {
+                k: v.copy() if isinstance(v, Vector2D) else v for k, v in args.items()
+            }
+            scalar.append(MovingEntity(**copy))  # type: ignore[arg-type]
+        forces = np.array([[rng.uniform(-3, 3), rng.uniform(-3, 3)] for _ in range(50)])
+        forces[0] = 0
+        store.velocities[0] = 0
+
+        scalar[0].velocity.zero()
+        for _ in range(10):
+            store.integrate(0.1, forces)
+            for entity, force in zip(scalar, forces):
+                entity.integrate(0.1, Vector2D(*force))
+
+        for view, entity in zip(store.entities, scalar):
+            assert view.position.x == pytest.approx(entity.position.x, abs=1e-9)
+            assert view.position.y == pytest.approx(entity.position.y, abs=1e-9)
+            assert view.heading.x == pytest.approx(entity.heading.x, abs=1e-9)
+            assert view.side.y == pytest.approx(entity.side.y, abs=1e-9)
+            assert view.speed <= view.max_speed + 1e-9
+
+    def test_integrate_shape(
+        self, store: EntityStore, entity: MovingEntityView
+    ) -> None:
+        with pytest.raises(ValueError):
+            store.integrate(0.1, np.zeros((2, 2)))
+
+    def test_rotate_heading_matches_scalar(self) -> None:
+        rng = random.Random(4)
+        store = EntityStore()
+        scalar = []
+        for i in range(100):
+            args = make_args(rng, i)
+            args["turn_rate"] = rng.uniform(0.05, 3)
+            store.add(**args)  # type: ignore[arg-type]
+            copy = {
+                k: v.copy() if isinstance(v, Vector2D) else v for k, v in args.items()
+            }
+            scalar.append(MovingEntity(**copy))  # type: ignore[arg-type]
+        targets = np.array(
+            [[rng.uniform(0, 100), rng.uniform(0, 60)] for _ in range(100)]
+        )
+        targets[0] = store.positions[0] + store.headings[0] * 5
+
+        for _ in range(5):
+            facing = store.rotate_heading_to_face_position(targets)
+            for entity, target, is_facing in zip(scalar, targets, facing):
+                assert entity.rotate_heading_to_face_position(Vector2D(*target)) == (
+                    is_facing
+                )
+        assert facing[0]
+
+        for view, entity in zip(store.entities, scalar):
+            assert view.heading.x == pytest.approx(entity.heading.x, abs=1e-12)
+            assert view.heading.y == pytest.approx(entity.heading.y, abs=1e-12)
+            assert view.velocity.x == pytest.approx(entity.velocity.x, abs=1e-12)
+            assert view.side.x == pytest.approx(entity.side.x, abs=1e-12)
+
+    def test_rotate_heading_rows(self) -> None:
+        rng = random.Random(5)
+        store = EntityStore()
+        for i in range(3):
+            store.add(**make_args(rng, i))  # type: ignore[arg-type]
+        before = store.headings.copy()
+        facing = store.rotate_heading_to_face_position(np.array([[50.0, 30.0]]), [1])
+        assert facing.shape == (1,)
+        assert (store.headings[[0, 2]] == before[[0, 2]]).all()
+        assert (store.headings[1] != before[1]).any()
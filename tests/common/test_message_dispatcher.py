@@ -0,0 +1,91 @@
+import pytest
+
+from simple_soccer_py.common.message_dispatcher import MessageDispatcher
+from simple_soccer_py.common.moving_entity import BaseGameEntity
+from simple_soccer_py.common.telegram import Telegram
+
+
+class Receiver(BaseGameEntity):
+    def __init__(self, id: int) -> None:
+        super().__init__(id)
+        self.received: list[Telegram] = []
+
+    def handle_message(self, msg: Telegram) -> bool:
+        self.received.append(msg)
+        return True
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestMessageDispatcher:
+    @pytest.fixture
+    def clock(self) -> Clock:
+        return Clock()
+
+    @pytest.fixture
+    def receiver(self) -> Receiver:
+        return Receiver(2)
+
+    @pytest.fixture
+    def dispatcher(self, clock: Clock, receiver: Receiver) -> MessageDispatcher:
+        return MessageDispatcher({receiver.id: receiver}, clock=clock)
+
+    def test_immediate(self, dispatcher: MessageDispatcher, receiver: Receiver) -> None:
+        assert dispatcher.dispatch_msg(0, 1, 2, 7, "info")
+        assert len(receiver.received) == 1
+        assert receiver.received[0].extra_info == ("info",)
+        assert len(dispatcher) == 0
+
+    def test_unknown_receiver(self, dispatcher: MessageDispatcher) -> None:
+        assert not dispatcher.dispatch_msg(0, 1, 99, 7)
+        assert not dispatcher.dispatch_msg(1, 1, 99, 7)
+        assert len(dispatcher) == 0
+
+    def test_delayed(
+        self, dispatcher: MessageDispatcher, receiver: Receiver, clock: Clock
+    ) -> None:
+        dispatcher.dispatch_msg(2.0, 1, 2, 1)
+        dispatcher.dispatch_msg(1.0, 1, 2, 2)
+        dispatcher.dispatch_msg(1.0, 3, 2, 2)
+        assert dispatcher.dispatch_delayed_messages() == 0
+        clock.now = 1.5
+        assert dispatcher.dispatch_delayed_messages() == 2
+        assert [(t.sender, t.msg) for t in receiver.received] == [(1, 2), (3, 2)]
+        clock.now = 2.0
+        assert dispatcher.dispatch_delayed_messages() == 1
+        assert receiver.received[-1].msg == 1
+        assert len(dispatcher) == 0
+
+    def test_duplicates_merged(
+        self, dispatcher: MessageDispatcher, receiver: Receiver, clock: Clock
+    ) -> None:
+        assert dispatcher.dispatch_msg(1.0, 1, 2, 1)
+        assert not dispatcher.dispatch_msg(1.1, 1, 2, 1)
+        assert dispatcher.dispatch_msg(1.5, 1, 2, 1)
+        assert dispatcher.dispatch_msg(1.1, 1, 2, 2)
+        assert len(dispatcher) == 3
+        clock.now = 1.2
+        assert dispatcher.dispatch_delayed_messages() == 2
+        # the queued telegram has gone so the same one can be sent again
+        assert dispatcher.dispatch_msg(1.0, 1, 2, 1)
+
+    def test_receiver_removed(self, clock: Clock, receiver: Receiver) -> None:
+        entities = {receiver.id: receiver}
+        dispatcher = MessageDispatcher(entities, clock=clock)
+        dispatcher.dispatch_msg(1.0, 1, 2, 1)
+        del entities[2]
+        clock.now = 1.0
+        assert dispatcher.dispatch_delayed_messages() == 0
+        assert len(dispatcher) == 0
+
+    def test_clear(self, dispatcher: MessageDispatcher) -> None:
+        dispatcher.dispatch_msg(1.0, 1, 2, 1)
+        dispatcher.clear()
+        assert len(dispatcher) == 0
+        assert dispatcher.dispatch_msg(1.0, 1, 2, 1)
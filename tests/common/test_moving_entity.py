@@ -0,0 +1,90 @@
+import math
+import random
+
+import pytest
+
+from simple_soccer_py.common.c2d_matrix import C2DMatrix
+from simple_soccer_py.common.moving_entity import MovingEntity
+from simple_soccer_py.common.vector2d import Vector2D
+
+
+class TestMovingEntity:
+    @pytest.fixture
+    def entity(self) -> MovingEntity:
+        return MovingEntity(
+            id=1,
+            position=Vector2D(0, 0),
+            radius=1.0,
+            velocity=Vector2D(0, 0),
+            max_speed=2.0,
+            heading=Vector2D(1, 0),
+            mass=2.0,
+            scale=Vector2D(1, 1),
+            turn_rate=0.5,
+            max_force=4.0,
+        )
+
+    def test_integrate(self, entity: MovingEntity) -> None:
+        entity.integrate(1.0, Vector2D(0, 2))
+        assert entity.velocity == Vector2D(0, 1)
+        assert entity.position == Vector2D(0, 1)
+        assert entity.heading == Vector2D(0, 1)
+        assert entity.side == Vector2D(-1, 0)
+
+    def test_integrate_truncates(self, entity: MovingEntity) -> None:
+        entity.integrate(1.0, Vector2D(100, 0))
+        assert entity.velocity == Vector2D(2, 0)
+
+    def test_integrate_keeps_heading_when_still(self, entity: MovingEntity) -> None:
+        entity.integrate(1.0, Vector2D(0, 0))
+        assert entity.heading == Vector2D(1, 0)
+
+    def test_rotate_heading_facing(self, entity: MovingEntity) -> None:
+        assert entity.rotate_heading_to_face_position(Vector2D(10, 0))
+        assert entity.heading == Vector2D(1, 0)
+
+    def test_rotate_heading_clamped(self, entity: MovingEntity) -> None:
+        entity.velocity = Vector2D(1, 0)
+        assert not entity.rotate_heading_to_face_position(Vector2D(0, 10))
+        expected = legacy_rotate(Vector2D(1, 0), Vector2D(0, 1), 0.5)
+        assert entity.heading.x == pytest.approx(expected.x)
+        assert entity.heading.y == pytest.approx(expected.y)
+        assert entity.velocity.x == pytest.approx(expected.x)
+        assert entity.side == entity.heading.perp()
+
+    def test_rotate_heading_unclamped(self, entity: MovingEntity) -> None:
+        target = Vector2D(10, 3)
+        assert not entity.rotate_heading_to_face_position(target)
+        target.normalize()
+        assert entity.heading.x == pytest.approx(target.x)
+        assert entity.heading.y == pytest.approx(target.y)
+        assert entity.rotate_heading_to_face_position(Vector2D(10, 3))
+
+    def test_rotate_heading_matches_matrix(self) -> None:
+        rng = random.Random(0)
+        for _ in range(200):
+            heading = Vector2D(rng.uniform(-1, 1), rng.uniform(-1, 1))
+            heading.normalize()
+            target = Vector2D(rng.uniform(-10, 10), rng.uniform(-10, 10))
+            rate = rng.uniform(0.05, 3)
+            entity = MovingEntity(
+                0, Vector2D(), 1, heading.copy(), 1, heading.copy(), 1,
+                Vector2D(1, 1), rate, 1,
+            )  # fmt: skip
+            entity.rotate_heading_to_face_position(target)
+
+            to_target = target.copy()
+            to_target.normalize()
+            expected = legacy_rotate(heading, to_target, rate)
+            assert entity.heading.x == pytest.approx(expected.x, abs=1e-7)
+            assert entity.heading.y == pytest.approx(expected.y, abs=1e-7)
+
+
+def legacy_rotate(heading: Vector2D, to_target: Vector2D, rate: float) -> Vector2D:
+    """the acos and rotation matrix formulation of the heading rotation"""
+    angle = min(math.acos(max(-1.0, min(1.0, heading.dot(to_target)))), rate)
+    matrix = C2DMatrix()
+    matrix.rotate_by_angle(angle * heading.sign(to_target))
+    rotated = heading.copy()
+    matrix.transform_vector2ds(rotated)
+    return rotated
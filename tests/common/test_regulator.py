@@ -0,0 +1,52 @@
+from simple_soccer_py.common.regulator import Regulator
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_regulator_frequency() -> None:
+    clock = FakeClock()
+    regulator = Regulator(2.0, clock)
+    assert regulator.is_ready()
+    assert not regulator.is_ready()
+    clock.now = 0.49
+    assert not regulator.is_ready()
+    clock.now = 0.5
+    assert regulator.is_ready()
+    assert regulator.next_update_time == 1.0
+
+
+def test_regulator_never_and_always() -> None:
+    assert not Regulator(0.0, FakeClock()).is_ready()
+    always = Regulator(-1.0, FakeClock())
+    assert all(always.is_ready() for _ in range(3))
+
+
+def test_regulator_reset() -> None:
+    regulator = Regulator(1.0, FakeClock())
+    assert regulator.is_ready()
+    assert not regulator.is_ready()
+    regulator.reset()
+    assert regulator.is_ready()
+
+
+def test_regulator_variator() -> None:
+    clock = FakeClock()
+    regulator = Regulator(1.0, clock, variator=0.1)
+    regulator.is_ready()
+    assert 0.9 <= regulator.next_update_time <= 1.1
+
+
+def test_regulator_is_due() -> None:
+    clock = FakeClock()
+    regulator = Regulator(1.0, clock)
+    assert regulator.is_due()
+    assert regulator.is_due()
+    assert regulator.is_ready()
+    assert not regulator.is_due()
+    assert regulator.update_period == 1.0
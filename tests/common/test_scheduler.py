@@ -0,0 +1,121 @@
+import functools
+
+import pytest
+
+from simple_soccer_py.common.moving_entity import BaseGameEntity
+from simple_soccer_py.common.scheduler import AIScheduler
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestAIScheduler:
+    @pytest.fixture
+    def clock(self) -> FakeClock:
+        return FakeClock()
+
+    def test_frequency(self, clock: FakeClock) -> None:
+        scheduler = AIScheduler(clock=clock)
+        calls: list[int] = []
+        scheduler.register("a", lambda: calls.append(1), 10.0, phase=0.0)
+        for tick in range(30):
+            clock.now = tick / 30
+            scheduler.update()
+        # once every third tick
+        assert len(calls) == 10
+        assert scheduler["a"].runs == 10
+        assert scheduler.stats.ticks == 30
+
+    def test_phases_spread(self, clock: FakeClock) -> None:
+        scheduler = AIScheduler(clock=clock)
+        for i in range(30):
+            scheduler.register(i, lambda: None, 1.0)
+        per_tick = []
+        for tick in range(1, 31):
+            clock.now = tick / 30
+            per_tick.append(scheduler.update())
+        assert sum(per_tick) == 30
+        assert max(per_tick) <= 3
+
+    def test_max_tasks_round_robin(self, clock: FakeClock) -> None:
+        scheduler = AIScheduler(max_tasks=2, clock=clock)
+        order: list[int] = []
+        for i in range(5):
+            scheduler.register(i, functools.partial(order.append, i), -1.0)
+        for _ in range(5):
+            assert scheduler.update() == 2
+        # every task gets the same share
+        assert sorted(order) == [0, 0, 1, 1, 2, 2, 3, 3, 4, 4]
+        assert order[:4] == [0, 1, 2, 3]
+        stats = scheduler.stats
+        assert stats.runs == 10
+        assert stats.deferred == 15
+        assert stats.over_budget_ticks == 5
+
+    def test_budget(self, clock: FakeClock) -> None:
+        timer = FakeClock()
+
+        def work() -> None:
+            timer.now += 0.004
+
+        scheduler = AIScheduler(budget=0.01, clock=clock, timer=timer)
+        for i in range(10):
+            scheduler.register(i, work, -1.0)
+        # always runs at least one, then stops once 10 ms are used
+        assert scheduler.update() == 3
+        assert scheduler.stats.deferred == 7
+        assert scheduler.stats.last_tick_time == pytest.approx(0.012)
+
+    def test_dropped(self, clock: FakeClock) -> None:
+        scheduler = AIScheduler(clock=clock)
+        task = scheduler.register("a", lambda: None, 10.0, phase=0.0)
+        scheduler.update()
+        clock.now = 0.35
+        scheduler.update()
+        # due at 0.1, two whole periods behind
+        assert task.dropped == 2
+        assert task.runs == 2
+        assert task.regulator.next_update_time == pytest.approx(0.45)
+
+    def test_reset_is_due_now(self, clock: FakeClock) -> None:
+        scheduler = AIScheduler(clock=clock)
+        task = scheduler.register("a", lambda: None, 10.0)
+        task.regulator.reset()
+        clock.now = 1.0
+        assert scheduler.update() == 1
+        assert task.dropped == 0
+        assert task.regulator.next_update_time == pytest.approx(1.1)
+
+    def test_frequency_made_positive(self, clock: FakeClock) -> None:
+        scheduler = AIScheduler(clock=clock)
+        task = scheduler.register("a", lambda: None, -1.0)
+        scheduler.update()
+        task.regulator.frequency = 10.0
+        clock.now = 1.0
+        assert scheduler.update() == 1
+        assert task.dropped == 0
+        assert task.runs == 2
+
+    def test_register_entity(self, clock: FakeClock) -> None:
+        class Counter(BaseGameEntity):
+            calls = 0
+
+            def update(self) -> None:
+                self.calls += 1
+
+        entity = Counter(7)
+        scheduler = AIScheduler(clock=clock)
+        scheduler.register_entity(entity, -1.0)
+        assert 7 in scheduler
+        with pytest.raises(ValueError):
+            scheduler.register(7, lambda: None, 1.0)
+        scheduler.update()
+        assert entity.calls == 1
+        scheduler.unregister(7)
+        assert len(scheduler) == 0
+        assert scheduler.update() == 0
@@ -0,0 +1,167 @@
+from pathlib import Path
+
+import pytest
+
+from simple_soccer_py.common import serialization
+from simple_soccer_py.common.entity_store import EntityStore
+from simple_soccer_py.common.moving_entity import BaseGameEntity, MovingEntity
+from simple_soccer_py.common.vector2d import Vector2D
+from simple_soccer_py.common.wall2d import Wall2D
+
+
+def moving(id: int) -> MovingEntity:
+    entity = MovingEntity(
+        id, Vector2D(id, 2 * id), 0.5, Vector2D(1, -1), 8.0, Vector2D(0, 1), 70.0,
+        Vector2D(2, 2), 0.4, 700.0,
+    )  # fmt: skip
+    entity.type = 3
+    entity.tag()
+    return entity
+
+
+def state(entity: MovingEntity) -> tuple[object, ...]:
+    return (*entity.record_fields(), entity.side.x, entity.side.y)
+
+
+class TestSerialization:
+    def test_header(self) -> None:
+        buffer = serialization.pack_many([moving(1), moving(2)])
+        kind, size, count = serialization.unpack_header(buffer)
+        assert kind == serialization.MOVING_ENTITY_RECORD
+        assert size == MovingEntity.RECORD.size == 120
+        assert count == 2
+        assert len(buffer) == serialization.HEADER.size + 2 * size
+
+    def test_round_trip(self) -> None:
+        entities = [moving(i) for i in range(10)]
+        buffer = serialization.pack_many(entities)
+        loaded = serialization.unpack_many(buffer, MovingEntity)
+        assert [state(e) for e in loaded] == [state(e) for e in entities]
+
+    def test_restore_into(self) -> None:
+        source, target = moving(4), moving(4)
+        source.position = Vector2D(7, 8)
+        source.untag()
+        buffer = serialization.pack_many([source])
+        serialization.unpack_many(buffer, MovingEntity, into=[target])
+        assert state(target) == state(source)
+
+    def test_restore_into_view(self) -> None:
+        store = EntityStore()
+        view = store.add(
+            4, Vector2D(), 0.5, Vector2D(), 8.0, Vector2D(1, 0), 70.0,
+            Vector2D(1, 1), 0.4, 700.0,
+        )  # fmt: skip
+        source = moving(4)
+        serialization.unpack_many(
+            serialization.pack_many([source]), MovingEntity, into=[view]
+        )
+        assert state(view) == state(source)
+        assert store.positions[view.row].tolist() == [4.0, 8.0]
+        assert store.masses[view.row] == 70.0
+
+    def test_mismatches(self) -> None:
+        buffer = serialization.pack_many([moving(1)])
+        with pytest.raises(ValueError):
+            serialization.unpack_many(buffer, Wall2D)
+        with pytest.raises(ValueError):
+            serialization.unpack_many(buffer, MovingEntity, into=[moving(2)])
+        with pytest.raises(ValueError):
+            serialization.unpack_many(buffer, MovingEntity, into=[])
+        with pytest.raises(ValueError):
+            serialization.unpack_header(buffer[:-1])
+        with pytest.raises(ValueError):
+            serialization.unpack_header(b"XXXX" + buffer[4:])
+        with pytest.raises(ValueError):
+            serialization.pack_many([moving(1), BaseGameEntity(2)])
+        with pytest.raises(ValueError):
+            serialization.pack_many([])
+
+    def test_version(self) -> None:
+        buffer = serialization.pack_many([moving(1)])
+        buffer[4] = serialization.FORMAT_VERSION + 1
+        with pytest.raises(ValueError, match="version"):
+            serialization.unpack_header(buffer)
+
+
+class TestStoreRecords:
+    @pytest.fixture
+    def store(self) -> EntityStore:
+        store = EntityStore()
+        for i in range(10):
+            entity = moving(i)
+            view = store.add(
+                i, entity.position, 0.5, entity.velocity, 8.0, entity.heading,
+                70.0 + i, entity.scale, 0.4, 700.0,
+            )  # fmt: skip
+            view.type = i % 3
+            if i % 2:
+                view.tag()
+        return store
+
+    def test_pack_matches_pack_many(self, store: EntityStore) -> None:
+        assert store.pack_records() == serialization.pack_many(store.entities)
+
+    def test_restore_matches_unpack_many(self, store: EntityStore) -> None:
+        buffer = store.pack_records()
+        expected = [state(e) for e in store.entities]
+        for entity in store.entities:
+            entity.position = Vector2D(-1, -1)
+            entity.heading = Vector2D(0, -1)
+            entity.mass = 1.0
+            entity.type = 9
+            entity.untag()
+        store.restore_records(buffer)
+        assert [state(e) for e in store.entities] == expected
+
+        source = [moving(i) for i in range(10)]
+        store.restore_records(serialization.pack_many(source))
+        assert [state(e) for e in store.entities] == [state(e) for e in source]
+
+    def test_mismatches(self, store: EntityStore) -> None:
+        with pytest.raises(ValueError):
+            EntityStore().pack_records()
+        with pytest.raises(ValueError):
+            store.restore_records(serialization.pack_many([BaseGameEntity(0)]))
+        with pytest.raises(ValueError):
+            store.restore_records(serialization.pack_many([moving(0)]))
+        with pytest.raises(ValueError, match="ids"):
+            store.restore_records(
+                serialization.pack_many([moving(i + 1) for i in range(10)])
+            )
+
+
+def test_entity_write_read(tmp_path: Path) -> None:
+    path = tmp_path / "entity.bin"
+    entity = BaseGameEntity(5)
+    entity.position = Vector2D(1, 2)
+    entity.bounding_radius = 3.0
+    entity.tag()
+    entity.write(path)
+
+    loaded = BaseGameEntity(5)
+    loaded.read(path)
+    assert loaded.record_fields() == entity.record_fields()
+
+
+def test_moving_entity_write_read_many(tmp_path: Path) -> None:
+    path = tmp_path / "entities.bin"
+    entities = [moving(i) for i in range(100)]
+    serialization.write_many(entities, path)
+    loaded = serialization.read_many(path, MovingEntity)
+    assert [state(e) for e in loaded] == [state(e) for e in entities]
+
+
+def test_wall_write_read(tmp_path: Path) -> None:
+    path = tmp_path / "wall.bin"
+    wall = Wall2D(Vector2D(0, 0), Vector2D(10, 0))
+    wall.write(path)
+
+    loaded = Wall2D(Vector2D(), Vector2D(1, 1))
+    loaded.read(path)
+    assert (loaded.from_, loaded.to, loaded.normal) == (
+        wall.from_,
+        wall.to,
+        wall.normal,
+    )
+    assert serialization.read_many(path, Wall2D)[0].normal == wall.normal
@@ -0,0 +1,38 @@
+import heapq
+
+import pytest
+
+from simple_soccer_py.common.telegram import Telegram
+
+
+class TestTelegram:
+    @pytest.fixture
+    def telegram(self) -> Telegram:
+        return Telegram(1, 2, 3, 10.0, "extra")
+
+    def test_slots(self, telegram: Telegram) -> None:
+        assert not hasattr(telegram, "__dict__")
+        assert telegram.extra_info == ("extra",)
+
+    def test_is_duplicate(self, telegram: Telegram) -> None:
+        assert telegram.is_duplicate(Telegram(1, 2, 3, 10.2))
+        assert not telegram.is_duplicate(Telegram(1, 2, 3, 10.3))
+        assert not telegram.is_duplicate(Telegram(1, 2, 4, 10.0))
+        assert telegram.is_duplicate(Telegram(1, 2, 3, 10.3), window=0.5)
+
+    def test_hashable(self, telegram: Telegram) -> None:
+        # equality is identity, as it was before telegrams were ordered
+        assert telegram != Telegram(1, 2, 3, 10.0, "extra")
+        assert len({telegram, Telegram(1, 2, 3, 10.0), telegram}) == 2
+        assert {telegram: 1}[telegram] == 1
+
+    def test_lt(self, telegram: Telegram) -> None:
+        assert telegram < Telegram(1, 2, 3, 11.0)
+        assert telegram < Telegram(1, 2, 3, 10.1)
+        assert not telegram < Telegram(1, 2, 3, 10.0)
+        assert Telegram(5, 2, 3, 9.0) < telegram
+
+    def test_heap_order(self) -> None:
+        queue = [Telegram(0, 0, i, t) for i, t in enumerate((3.0, 1.0, 2.0))]
+        heapq.heapify(queue)
+        assert [heapq.heappop(queue).dispatch_time for _ in range(3)] == [1, 2, 3]
@@ -0,0 +1,68 @@
+import pytest
+
+from simple_soccer_py.common.moving_entity import MovingEntity
+from simple_soccer_py.common.transformations import (
+    point_to_local_space,
+    point_to_world_space,
+    vector_to_local_space,
+    vector_to_world_space,
+)
+from simple_soccer_py.common.vector2d import Vector2D
+
+HEADING = Vector2D(0, 1)
+SIDE = HEADING.perp()
+POSITION = Vector2D(5, 5)
+
+
+def test_point_to_local_space() -> None:
+    # a point straight ahead of the agent lies on its local x axis
+    local = point_to_local_space(Vector2D(5, 8), HEADING, SIDE, POSITION)
+    assert local.x == pytest.approx(3)
+    assert local.y == pytest.approx(0)
+
+
+def test_point_to_world_space() -> None:
+    world = point_to_world_space(Vector2D(3, 0), HEADING, SIDE, POSITION)
+    assert world.x == pytest.approx(5)
+    assert world.y == pytest.approx(8)
+
+
+def test_vectors_ignore_position() -> None:
+    local = vector_to_local_space(Vector2D(0, 2), HEADING, SIDE)
+    assert local.x == pytest.approx(2)
+    world = vector_to_world_space(local, HEADING, SIDE)
+    assert world.x == pytest.approx(0)
+    assert world.y == pytest.approx(2)
+
+
+class TestEntityTransformCache:
+    @pytest.fixture
+    def entity(self) -> MovingEntity:
+        return MovingEntity(
+            1, Vector2D(5, 5), 1, Vector2D(), 1, Vector2D(0, 1), 1,
+            Vector2D(1, 1), 0.5, 1,
+        )  # fmt: skip
+
+    def test_matches_functions(self, entity: MovingEntity) -> None:
+        point = Vector2D(2, -7)
+        expected = point_to_local_space(point, HEADING, SIDE, POSITION)
+        assert entity.point_to_local_space(point) == expected
+        back = entity.point_to_world_space(expected)
+        assert back.x == pytest.approx(point.x)
+        assert back.y == pytest.approx(point.y)
+        assert entity.vector_to_world_space(Vector2D(1, 0)) == HEADING
+        vec = Vector2D(3, -2)
+        assert entity.vector_to_local_space(vec) == vector_to_local_space(
+            vec, HEADING, SIDE
+        )
+        assert entity.vector_to_local_space(HEADING) == Vector2D(1, 0)
+
+    def test_cached_until_moved(self, entity: MovingEntity) -> None:
+        transform = entity.local_transform()
+        assert entity.local_transform() is transform
+        entity.position.x += 1
+        moved = entity.local_transform()
+        assert moved is not transform
+        entity.heading = Vector2D(1, 0)
+        assert entity.local_transform() is not moved
+        assert entity.world_transform() is entity.world_transform()
@@ -1,6 +1,6 @@
 import pytest
 
-from simple_soccer_py.common.vector2d import Vector2D
+from simple_soccer_py.common.vector2d import Vector2D, Vector2DPool
 
 
 class TestVector2D:
@@ -70,3 +70,76 @@ class TestVector2D:
 
     def test_reflect(self, v2: Vector2D) -> None:
         assert v2.reflect(Vector2D(1, 0)) == Vector2D(-1, 2)
+
+    def test_iadd(self, v2: Vector2D) -> None:
+        v = v2
+        v2 += Vector2D(3, 4)
+        assert v2 is v
+        assert v2 == Vector2D(4, 6)
+
+    def test_isub(self, v2: Vector2D) -> None:
+        v2 -= Vector2D(3, 4)
+        assert v2 == Vector2D(-2, -2)
+
+    def test_imul(self, v2: Vector2D) -> None:
+        v2 *= 2
+        assert v2 == Vector2D(2, 4)
+
+    def test_itruediv(self, v2: Vector2D) -> None:
+        v2 /= 2
+        assert v2 == Vector2D(0.5, 1)
+
+    def test_slots(self, v2: Vector2D) -> None:
+        assert not hasattr(v2, "__dict__")
+
+    def test_perp_into(self, v2: Vector2D) -> None:
+        out = Vector2D()
+        assert v2.perp_into(out) is out
+        assert out == v2.perp()
+        v2.perp_into(v2)
+        assert v2 == Vector2D(-2, 1)
+
+    def test_get_reverse_into(self, v2: Vector2D) -> None:
+        out = Vector2D()
+        assert v2.get_reverse_into(out) == Vector2D(-1, -2)
+
+    def test_reflect_into(self, v2: Vector2D) -> None:
+        expected = v2.reflect(Vector2D(1, 0))
+        v2.reflect_into(Vector2D(1, 0), v2)
+        assert v2 == expected
+
+
+class TestVector2DPool:
+    def test_get(self) -> None:
+        pool = Vector2DPool(2)
+        a = pool.get(1, 2)
+        b = pool.get()
+        c = pool.get(3, 4)
+        assert (a, b, c) == (Vector2D(1, 2), Vector2D(0, 0), Vector2D(3, 4))
+        assert len(pool) == 3
+        assert pool.capacity == 3
+
+    def test_reuse(self) -> None:
+        pool = Vector2DPool(4)
+        a = pool.get(1, 1)
+        pool.reset()
+        assert pool.get() is a
+        assert a == Vector2D(0, 0)
+
+    def test_frame(self) -> None:
+        pool = Vector2DPool(4)
+        pool.get()
+        with pool.frame():
+            pool.get()
+            pool.get()
+            assert len(pool) == 3
+        assert len(pool) == 1
+
+    def test_release_to(self) -> None:
+        pool = Vector2DPool()
+        mark = pool.mark()
+        pool.get()
+        pool.release_to(mark)
+        assert len(pool) == 0
+        with pytest.raises(ValueError):
+            pool.release_to(1)
@@ -0,0 +1,108 @@
+import random
+
+import numpy as np
+import pytest
+
+from simple_soccer_py.common.utils import line_intersection_2d
+from simple_soccer_py.common.vector2d import Vector2D
+from simple_soccer_py.common.wall2d import Wall2D
+from simple_soccer_py.common.wall_set import WallSet
+
+
+def box(width: float, height: float) -> list[Wall2D]:
+    """the four walls of a box, normals pointing inwards"""
+    tl, tr = Vector2D(0, 0), Vector2D(width, 0)
+    bl, br = Vector2D(0, height), Vector2D(width, height)
+    return [Wall2D(tl, tr), Wall2D(bl, tl), Wall2D(br, bl), Wall2D(tr, br)]
+
+
+def test_wall2d_normal() -> None:
+    wall = Wall2D(Vector2D(0, 0), Vector2D(10, 0))
+    assert wall.normal == Vector2D(-0.0, 1.0)
+    wall.to = Vector2D(0, 5)
+    assert wall.normal == Vector2D(-1.0, 0.0)
+
+
+class TestWallSet:
+    @pytest.fixture
+    def walls(self) -> WallSet:
+        return WallSet(box(100, 60))
+
+    def test_arrays(self, walls: WallSet) -> None:
+        assert len(walls) == 4
+        assert walls.froms.shape == walls.tos.shape == walls.normals.shape == (4, 2)
+        # every normal points into the box
+        centre = np.array([50.0, 30.0])
+        assert ((centre - walls.froms) * walls.normals).sum(axis=1).min() > 0
+
+    def test_intersect_matches_scalar(self, walls: WallSet) -> None:
+        rng = random.Random(0)
+        starts = np.array(
+            [[rng.uniform(-20, 120), rng.uniform(-20, 80)] for _ in range(50)]
+        )
+        ends = np.array(
+            [[rng.uniform(-20, 120), rng.uniform(-20, 80)] for _ in range(50)]
+        )
+        hit, fractions = walls.intersect_segments(starts, ends)
+        for i in range(50):
+            for j, wall in enumerate(walls.walls):
+                r = line_intersection_2d(
+                    Vector2D(*starts[i]), Vector2D(*ends[i]), wall.from_, wall.to
+                )
+                assert hit[i, j] == (r is not None)
+                if r is not None:
+                    assert fractions[i, j] == pytest.approx(r)
+
+    def test_closest_hits(self, walls: WallSet) -> None:
+        starts = np.array([[50.0, 30.0], [50.0, 30.0], [10.0, 10.0]])
+        ends = np.array([[150.0, 30.0], [60.0, 30.0], [-10.0, 5.0]])
+        index, fraction, points = walls.closest_hits(starts, ends)
+        assert index.tolist() == [3, -1, 1]
+        assert fraction[0] == pytest.approx(0.5)
+        assert np.isinf(fraction[1])
+        np.testing.assert_allclose(
+            points, [[100.0, 30.0], [60.0, 30.0], [0.0, 7.5]], atol=1e-12
+        )
+
+    def test_reflect_matches_vector2d(self, walls: WallSet) -> None:
+        velocities = np.array([[3.0, -4.0], [1.0, 2.0], [-2.0, 5.0]])
+        index = np.array([0, -1, 1])
+        reflected = walls.reflect(velocities, index)
+        for v, i, r in zip(velocities, index, reflected):
+            expected = Vector2D(*v)
+            if i >= 0:
+                expected = expected.reflect(walls.walls[i].normal)
+            assert r.tolist() == pytest.approx([expected.x, expected.y])
+
+    def test_bounce(self, walls: WallSet) -> None:
+        positions, velocities, index = walls.bounce(
+            np.array([[95.0, 30.0], [50.0, 30.0]]),
+            np.array([[105.0, 32.0], [52.0, 30.0]]),
+            np.array([[10.0, 2.0], [2.0, 0.0]]),
+        )
+        assert index.tolist() == [3, -1]
+        np.testing.assert_allclose(positions, [[95, 32], [52, 30]])
+        np.testing.assert_allclose(velocities, [[-10, 2], [2, 0]])
+
+    def test_feeler_forces(self, walls: WallSet) -> None:
+        positions = np.array([[95.0, 30.0], [50.0, 30.0], [5.0, 5.0]])
+        feelers = np.array(
+            [
+                [[110.0, 30.0], [95.0, 35.0]],
+                [[60.0, 30.0], [50.0, 40.0]],
+                [[-5.0, 5.0], [5.0, -3.0]],
+            ]
+        )
+        forces = walls.feeler_forces(positions, feelers)
+        # overshoots the right wall by 10
+        np.testing.assert_allclose(forces[0], [-10, 0], atol=1e-12)
+        np.testing.assert_allclose(forces[1], [0, 0])
+        # both feelers hit, the last one (3 past the top wall) wins
+        np.testing.assert_allclose(forces[2], [0, 3], atol=1e-12)
+
+    def test_empty(self) -> None:
+        index, fraction, points = WallSet([]).closest_hits(
+            np.zeros((2, 2)), np.ones((2, 2))
+        )
+        assert index.tolist() == [-1, -1]
+        assert points.tolist() == [[1, 1], [1, 1]]
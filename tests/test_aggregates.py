@@ -0,0 +1,101 @@
+import random
+
+import pytest
+
+from simple_soccer_py.aggregates import TeamAggregates, repair_order
+from simple_soccer_py.common.vector2d import Vector2D
+from simple_soccer_py.models import SoccerPitch
+
+
+def test_repair_order() -> None:
+    rng = random.Random(0)
+    keys = [rng.uniform(0, 100) for _ in range(20)]
+    order = sorted(range(20), key=lambda i: keys[i])
+    # nudge the keys a little, as a tick would
+    for i in range(20):
+        keys[i] += rng.uniform(-2, 2)
+    swaps = repair_order(order, keys, max_swaps=400)
+    assert swaps >= 0
+    assert order == sorted(range(20), key=lambda i: (keys[i], i))
+    # sorted already, nothing to do
+    assert repair_order(order, keys, max_swaps=0) == 0
+
+
+def test_repair_order_ties_by_index() -> None:
+    order = [2, 0, 1]
+    assert repair_order(order, [1.0, 1.0, 1.0], max_swaps=10) == 2
+    assert order == [0, 1, 2]
+
+
+def test_repair_order_gives_up() -> None:
+    order = list(range(10))
+    keys = [float(10 - i) for i in range(10)]
+    assert repair_order(order, keys, max_swaps=5) == -1
+
+
+class TestTeamAggregates:
+    @pytest.fixture(params=[False, True], ids=["scan", "ordered"])
+    def pitch(self, request: pytest.FixtureRequest) -> SoccerPitch:
+        pitch = SoccerPitch(seed=2)
+        for team in (pitch.red_team, pitch.blue_team):
+            team.aggregates = TeamAggregates(team, ordered=request.param)
+        return pitch
+
+    def test_scan_by_default(self) -> None:
+        pitch = SoccerPitch()
+        assert not pitch.red_team.aggregates.ordered
+
+    def test_consistent_during_match(self, pitch: SoccerPitch) -> None:
+        for _ in range(500):
+            pitch.update()
+            for team in (pitch.red_team, pitch.blue_team):
+                team.aggregates.update()
+                assert team.aggregates.check() == []
+        aggregates = pitch.red_team.aggregates
+        if aggregates.ordered:
+            # kept up to date mostly by repairs
+            assert aggregates.repairs > aggregates.recomputes
+
+    def test_closest(self, pitch: SoccerPitch) -> None:
+        team = pitch.red_team
+        player = team.field_players[-1]
+        pitch.ball.place_at_position(player.position + Vector2D(0.1, 0))
+        team.aggregates.update()
+        assert team.closest_player_to_ball is player
+
+        goal = team.opponents_goal.center
+        nearest = min(team.field_players, key=lambda p: p.position.distance_sq(goal))
+        assert team.aggregates.closest_to_opponents_goal is nearest
+
+    def test_kick_off_recomputes(self, pitch: SoccerPitch) -> None:
+        pitch.run(300)
+        aggregates = pitch.blue_team.aggregates
+        recomputes = aggregates.recomputes
+        pitch.kick_off()
+        assert aggregates.recomputes == recomputes + 1
+        assert aggregates.check() == []
+
+    def test_check_finds_problems(self, pitch: SoccerPitch) -> None:
+        aggregates = pitch.red_team.aggregates
+        aggregates.update()
+        if aggregates.ordered:
+            aggregates.by_ball.reverse()
+        else:
+            count = len(aggregates.field_players)
+            aggregates._ball_index = (aggregates._ball_index + 1) % count
+        aggregates.supporting_player = pitch.blue_team.field_players[0]
+        problems = aggregates.check()
+        assert len(problems) == 2
+        assert "ball" in problems[0]
+        aggregates.recompute()
+        aggregates.supporting_player = None
+        assert aggregates.check() == []
+
+    def test_roles(self, pitch: SoccerPitch) -> None:
+        team = pitch.red_team
+        receiver = team.field_players[1]
+        team.receiving_player = receiver
+        assert team.aggregates.receiving_player is receiver
+        assert team.aggregates.controlling_player is None
+        team.lost_control()
+        assert team.receiving_player is None
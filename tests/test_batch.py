@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from simple_soccer_py.batch import SUMMARY_DTYPE, BatchRunner
+from simple_soccer_py.models import SoccerPitch
+
+TICKS = 300
+
+
+class TestBatchRunner:
+    @pytest.fixture
+    def runner(self) -> BatchRunner:
+        return BatchRunner(ticks=TICKS, max_workers=2)
+
+    def test_matches_serial(self, runner: BatchRunner) -> None:
+        seeds = [5, 3, 8]
+        results = runner.run(seeds)
+        assert results.dtype == SUMMARY_DTYPE
+        assert results["seed"].tolist() == seeds
+        assert results["done"].all()
+        assert (results["ticks"] == TICKS).all()
+        for row, seed in zip(results, seeds):
+            summary = SoccerPitch(seed=seed).run(TICKS)
+            assert row["red_score"] == summary.red_score
+            assert row["blue_score"] == summary.blue_score
+            assert row["red_possession"] == summary.red_possession
+            assert row["blue_possession"] == summary.blue_possession
+        assert runner.elapsed > 0
+
+    def test_deterministic(self, runner: BatchRunner) -> None:
+        columns = ["seed", "red_score", "blue_score", "red_possession"]
+        a = runner.run(range(4))[columns]
+        b = BatchRunner(ticks=TICKS, max_workers=1).run(range(4))[columns]
+        np.testing.assert_array_equal(a, b)
+
+    def test_progress(self, runner: BatchRunner) -> None:
+        calls: list[tuple[int, int, int]] = []
+        runner.run(
+            [1, 2, 3],
+            progress=lambda done, total, row: calls.append((done, total, row["seed"])),
+        )
+        assert [(done, total) for done, total, _ in calls] == [(1, 3), (2, 3), (3, 3)]
+        assert sorted(seed for _, _, seed in calls) == [1, 2, 3]
+
+    def test_stream_stops_early(self, runner: BatchRunner) -> None:
+        stream = runner.stream(range(6))
+        index, row = next(stream)
+        assert row["seed"] == index
+        stream.close()
+
+    def test_empty(self, runner: BatchRunner) -> None:
+        assert len(runner.run([])) == 0
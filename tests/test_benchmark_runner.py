@@ -0,0 +1,42 @@
+from pathlib import Path
+
+from benchmarks import runner
+from benchmarks.suite import CASES, Case
+
+
+def results(**best: float) -> dict[str, object]:
+    return {"results": {name: {"best": time} for name, time in best.items()}}
+
+
+def test_compare() -> None:
+    rows = runner.compare(results(a=1.0, b=2.0, c=1.0), results(a=1.05, b=3.0, d=1.0))
+    assert rows == [("a", 1.0, 1.05, 1.05), ("b", 2.0, 3.0, 1.5)]
+    assert runner.regressions(rows, threshold=0.1) == ["b"]
+    assert runner.regressions(rows, threshold=0.6) == []
+
+
+def test_measure() -> None:
+    case = Case("noop", lambda: lambda: None, number=10)
+    result = runner.measure(case, warmup=1, repeats=3)
+    assert result["repeats"] == 3
+    assert 0 < result["best"] <= result["median"]
+
+
+def test_run_save_compare(tmp_path: Path) -> None:
+    path = tmp_path / "baseline.json"
+    argv = ["run", "-k", "telegram", "--repeats", "2", "--save", str(path)]
+    assert runner.main(argv) == 0
+    data = runner.load(path)
+    assert list(data["results"]) == ["telegram.create"]
+
+    slower = runner.load(path)
+    slower["results"]["telegram.create"]["best"] *= 2
+    runner.save(slower, tmp_path / "slower.json")
+    assert runner.main(["compare", str(path), str(tmp_path / "slower.json")]) == 1
+    assert runner.main(["compare", str(path), str(path)]) == 0
+
+
+def test_cases_set_up() -> None:
+    for case in CASES.values():
+        if case.name != "match.tick":
+            case.setup()()
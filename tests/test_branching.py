@@ -0,0 +1,90 @@
+import dataclasses
+import os
+
+import pytest
+
+from simple_soccer_py.common.vector2d import Vector2D
+from simple_soccer_py.models import SoccerPitch
+from simple_soccer_py.summary import MatchSummary
+
+fork_only = pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+
+
+def outcome(summary: MatchSummary) -> MatchSummary:
+    """the summary without the wall time, which differs between runs"""
+    return dataclasses.replace(summary, elapsed=0.0)
+
+
+class TestBranch:
+    @pytest.fixture
+    def pitch(self) -> SoccerPitch:
+        pitch = SoccerPitch(seed=3)
+        pitch.run(300)
+        return pitch
+
+    # deepcopying a pitch must not rely on copying library internals, such
+    # as itertools objects, that newer pythons deprecate
+    @pytest.mark.filterwarnings("error::DeprecationWarning")
+    def test_copied(self, pitch: SoccerPitch) -> None:
+        summaries = pitch.branch(seeds=[5, 6], ticks=200, fork=False)
+        assert [s.seed for s in summaries] == [5, 6]
+        assert all(s.ticks == 200 for s in summaries)
+        # the same as replaying to the branch point and reseeding
+        replay = SoccerPitch(seed=3)
+        replay.run(300)
+        replay.seed = 6
+        replay.rng.seed(6)
+        assert outcome(summaries[1]) == outcome(replay.run(200))
+
+    @fork_only
+    def test_forked_matches_copied(self, pitch: SoccerPitch) -> None:
+        seeds = [0, 1, 2, 3, 4]
+        forked = pitch.branch(seeds=seeds, ticks=300, max_workers=2, fork=True)
+        copied = pitch.branch(seeds=seeds, ticks=300, fork=False)
+        assert [outcome(s) for s in forked] == [outcome(s) for s in copied]
+
+    @fork_only
+    def test_deterministic_per_seed(self, pitch: SoccerPitch) -> None:
+        first = pitch.branch(seeds=[7, 8, 7], ticks=300, fork=True)
+        second = pitch.branch(seeds=[8, 7], ticks=300, fork=True)
+        assert outcome(first[0]) == outcome(first[2]) == outcome(second[1])
+        assert outcome(first[1]) == outcome(second[0])
+
+    @pytest.mark.parametrize("fork", [False, pytest.param(True, marks=fork_only)])
+    def test_pitch_unchanged(self, pitch: SoccerPitch, fork: bool) -> None:
+        position = pitch.ball.position.copy()
+        pitch.branch(2, ticks=100, fork=fork)
+        assert pitch.tick == 300
+        assert pitch.seed == 3
+        assert pitch.ball.position == position
+
+    @pytest.mark.parametrize("fork", [False, pytest.param(True, marks=fork_only)])
+    def test_setup(self, pitch: SoccerPitch, fork: bool) -> None:
+        def clear_ball(branch: SoccerPitch) -> None:
+            branch.ball.place_at_position(Vector2D(10.0, 10.0))
+
+        (summary,) = pitch.branch(1, ticks=0, setup=clear_ball, fork=fork)
+        assert summary.seed == 0
+        assert summary.ticks == 0
+
+    def test_rest_of_match(self) -> None:
+        pitch = SoccerPitch()
+        pitch.tick = pitch.match_ticks - 10
+        (summary,) = pitch.branch(1, fork=False)
+        assert summary.ticks == 10
+
+    @fork_only
+    def test_child_error(self, pitch: SoccerPitch) -> None:
+        def fail(branch: SoccerPitch) -> None:
+            raise KeyError("boom")
+
+        with pytest.raises(RuntimeError, match="KeyError"):
+            pitch.branch(3, ticks=10, setup=fail, max_workers=2, fork=True)
+
+    def test_arguments(self, pitch: SoccerPitch) -> None:
+        with pytest.raises(ValueError):
+            pitch.branch()
+        with pytest.raises(ValueError):
+            pitch.branch(3, seeds=[1, 2])
+        with pytest.raises(ValueError):
+            pitch.branch(1, max_workers=0, fork=True)
@@ -0,0 +1,141 @@
+import dataclasses
+import json
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from simple_soccer_py.cache import ResultCache, engine_version, match_key
+from simple_soccer_py.models import SoccerPitch
+from simple_soccer_py.params import Params
+from simple_soccer_py.replay import ReplayReader
+from simple_soccer_py.summary import MatchSummary
+
+
+def summary(seed: int) -> MatchSummary:
+    return MatchSummary(seed, 10, 1, 2, 0.25, 0.5, 0.125)
+
+
+def test_match_key() -> None:
+    params = Params()
+    key = match_key(params, 1, 100, "v1")
+    assert key == match_key(Params(), 1, 100, "v1")
+    keys = [
+        key,
+        match_key(params, 2, 100, "v1"),
+        match_key(params, 1, 101, "v1"),
+        match_key(params, 1, 100, "v2"),
+        match_key(dataclasses.replace(params, pass_probability=0.31), 1, 100, "v1"),
+    ]
+    assert len(set(keys)) == 5
+
+
+def test_engine_version() -> None:
+    assert engine_version() == engine_version()
+    assert len(engine_version()) == 64
+
+
+class TestResultCache:
+    @pytest.fixture
+    def cache(self, tmp_path: Path) -> Iterator[ResultCache]:
+        with ResultCache(tmp_path / "results.sqlite3", max_entries=3) as cache:
+            yield cache
+
+    def test_get_put(self, cache: ResultCache) -> None:
+        assert cache.get("a") is None
+        cache.put("a", summary(1), Path("a.replay"))
+        cached = cache.get("a")
+        assert cached is not None
+        assert cached.summary == summary(1)
+        assert cached.replay == Path("a.replay")
+        assert "a" in cache
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_persists(self, tmp_path: Path) -> None:
+        path = tmp_path / "results.sqlite3"
+        with ResultCache(path) as cache:
+            cache.put("a", summary(1))
+        with ResultCache(path) as cache:
+            cached = cache.get("a")
+            assert cached is not None
+            assert cached.summary == summary(1)
+            assert cached.replay is None
+
+    def test_lru_eviction(self, cache: ResultCache) -> None:
+        for key in "abc":
+            cache.put(key, summary(ord(key)))
+        # a is used, so b is the least recently used
+        cache.get("a")
+        cache.put("d", summary(4))
+        assert len(cache) == 3
+        assert "b" not in cache
+        assert all(key in cache for key in "acd")
+
+    def test_recency_survives_reopening(self, tmp_path: Path) -> None:
+        path = tmp_path / "results.sqlite3"
+        with ResultCache(path, max_entries=2) as cache:
+            cache.put("a", summary(1))
+            cache.put("b", summary(2))
+            cache.get("a")
+        with ResultCache(path, max_entries=2) as cache:
+            cache.put("c", summary(3))
+            assert "a" in cache
+            assert "b" not in cache
+
+    def test_clear(self, cache: ResultCache) -> None:
+        cache.put("a", summary(1))
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_max_entries(self, tmp_path: Path) -> None:
+        with pytest.raises(ValueError):
+            ResultCache(tmp_path / "results.sqlite3", max_entries=0)
+
+
+class TestRunCached:
+    @pytest.fixture
+    def cache(self, tmp_path: Path) -> Iterator[ResultCache]:
+        with ResultCache(tmp_path / "results.sqlite3") as cache:
+            yield cache
+
+    def test_hit(self, cache: ResultCache) -> None:
+        played = SoccerPitch.run_cached(seed=4, ticks=150, cache=cache)
+        assert (cache.hits, cache.misses) == (0, 1)
+        cached = SoccerPitch.run_cached(seed=4, ticks=150, cache=cache)
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert cached == played
+        expected = SoccerPitch(seed=4).run(150)
+        assert dataclasses.replace(played, elapsed=0.0) == dataclasses.replace(
+            expected, elapsed=0.0
+        )
+
+    def test_new_engine_misses(self, tmp_path: Path) -> None:
+        path = tmp_path / "results.sqlite3"
+        with ResultCache(path) as cache:
+            SoccerPitch.run_cached(ticks=10, cache=cache)
+        with ResultCache(path, version="changed") as cache:
+            SoccerPitch.run_cached(ticks=10, cache=cache)
+            assert (cache.hits, cache.misses) == (0, 1)
+
+    def test_replay(self, cache: ResultCache, tmp_path: Path) -> None:
+        SoccerPitch.run_cached(seed=1, ticks=20, cache=cache)
+        replay = tmp_path / "match.replay"
+        # played again to record the replay the cached result lacks
+        SoccerPitch.run_cached(seed=1, ticks=20, cache=cache, replay=replay)
+        with ReplayReader(replay) as reader:
+            assert [frame.tick for frame in reader][-1] == 20
+        cached = cache.get(cache.key(Params(), 1, 20))
+        assert cached is not None
+        assert cached.replay == replay
+
+        # recorded again once the replay is gone
+        replay.unlink()
+        misses = cache.misses
+        SoccerPitch.run_cached(seed=1, ticks=20, cache=cache, replay=replay)
+        assert replay.exists()
+        assert cache.misses == misses
+
+    def test_stored_as_json(self, cache: ResultCache) -> None:
+        SoccerPitch.run_cached(seed=2, ticks=10, cache=cache)
+        rows = cache._db.execute("SELECT summary FROM results").fetchall()
+        assert [json.loads(row[0])["seed"] for row in rows] == [2]
@@ -0,0 +1,234 @@
+import math
+
+import numpy as np
+import pytest
+
+from simple_soccer_py.common.vector2d import Vector2D
+from simple_soccer_py.models import (
+    EntityType,
+    Goal,
+    PlayerRole,
+    SoccerPitch,
+    formation,
+)
+from simple_soccer_py.params import Params
+
+
+def snapshot(pitch: SoccerPitch) -> list[tuple[float, float]]:
+    entities = [pitch.ball, *pitch.red_team.players, *pitch.blue_team.players]
+    return [(e.position.x, e.position.y) for e in entities]
+
+
+class TestSoccerPitch:
+    @pytest.fixture
+    def pitch(self) -> SoccerPitch:
+        return SoccerPitch(seed=1)
+
+    def test_setup(self, pitch: SoccerPitch) -> None:
+        players = Params().players_per_team
+        assert len(pitch.entities) == 1 + 2 * players
+        assert pitch.red_team.goalkeeper.role == PlayerRole.GOALKEEPER
+        assert (
+            pitch.red_team.goalkeeper.position.x < pitch.blue_team.goalkeeper.position.x
+        )
+        # the walls leave both goal mouths open
+        assert len(pitch.vec_walls) == 6
+        for wall in pitch.vec_walls:
+            to_center = pitch.playing_area.center - wall.from_
+            assert to_center.dot(wall.normal) > 0
+
+    def test_entity_types(self, pitch: SoccerPitch) -> None:
+        entities = pitch.entities
+        assert list(entities.of_type(EntityType.BALL)) == [pitch.ball]
+        keepers = [pitch.red_team.goalkeeper, pitch.blue_team.goalkeeper]
+        assert list(entities.of_type(EntityType.GOALKEEPER)) == keepers
+        field_players = [*pitch.red_team.field_players, *pitch.blue_team.field_players]
+        assert list(entities.of_type(EntityType.FIELD_PLAYER)) == field_players
+
+    def test_fixed_timestep(self, pitch: SoccerPitch) -> None:
+        pitch.run(10)
+        assert pitch.tick == 10
+        assert pitch.time == pytest.approx(10 * pitch.params.dt)
+
+    def test_deterministic(self) -> None:
+        a, b = SoccerPitch(seed=7), SoccerPitch(seed=7)
+        a.run(2000)
+        b.run(2000)
+        assert snapshot(a) == snapshot(b)
+        assert (a.red_score, a.blue_score) == (b.red_score, b.blue_score)
+
+    def test_seeds_differ(self) -> None:
+        a, b = SoccerPitch(seed=1), SoccerPitch(seed=2)
+        a.run(2000)
+        b.run(2000)
+        assert snapshot(a) != snapshot(b)
+
+    def test_run_summary(self, pitch: SoccerPitch) -> None:
+        summary = pitch.run(3000)
+        assert summary.seed == 1
+        assert summary.ticks == 3000
+        assert summary.red_score + summary.blue_score > 0
+        assert 0 < summary.red_possession + summary.blue_possession <= 1
+        assert summary.ticks_per_second > 0
+
+    def test_entities_stay_on_pitch(self, pitch: SoccerPitch) -> None:
+        area = pitch.playing_area
+        for _ in range(1000):
+            pitch.update()
+            for player in pitch.red_team.players + pitch.blue_team.players:
+                assert area.inside(player.position)
+            assert area.inside(pitch.ball.position)
+
+    def test_ball_bounces_off_wall(self, pitch: SoccerPitch) -> None:
+        ball = pitch.ball
+        ball.place_at_position(Vector2D(50, 0.2))
+        ball.velocity = Vector2D(0, -10)
+        ball.update(pitch.params.dt)
+        assert ball.velocity.y > 0
+        assert ball.position.y > 0
+
+    def test_goal_resets_to_kick_off(self, pitch: SoccerPitch) -> None:
+        ball = pitch.ball
+        ball.place_at_position(Vector2D(0.2, pitch.playing_area.center.y))
+        ball.velocity = Vector2D(-20, 0)
+        pitch.update()
+        assert pitch.blue_score == 1
+        assert ball.position == pitch.playing_area.center
+        assert ball.velocity.is_zero()
+
+
+class TestSoccerBall:
+    @pytest.fixture
+    def pitch(self) -> SoccerPitch:
+        pitch = SoccerPitch(seed=1)
+        pitch.ball.place_at_position(Vector2D(30, 34))
+        pitch.ball.kick(Vector2D(1, 0), 16.0)
+        return pitch
+
+    def test_future_position_matches_rolling(self, pitch: SoccerPitch) -> None:
+        ball = pitch.ball
+        dt = pitch.params.dt
+        predicted = ball.future_position(30 * dt)
+        for _ in range(30):
+            ball.update(dt)
+        # the integrator slows the ball before moving it, so it falls
+        # behind the exact trajectory by up to -friction * dt * t / 2
+        assert ball.position.distance(predicted) < 4 * dt
+        assert ball.position.y == predicted.y
+
+    def test_future_position_stops(self, pitch: SoccerPitch) -> None:
+        ball = pitch.ball
+        # u^2 / -2a
+        stop = Vector2D(30 + 16**2 / 8, 34)
+        assert ball.future_position(100.0) == stop
+        assert ball.future_position(4.0) == stop
+        assert ball.future_position(0.0) == Vector2D(30, 34)
+
+    def test_vectorized(self, pitch: SoccerPitch) -> None:
+        ball = pitch.ball
+        times = np.linspace(0, 6, 13)
+        positions = ball.future_positions(times)
+        for t, (x, y) in zip(times, positions):
+            assert ball.future_position(float(t)) == Vector2D(x, y)
+        distances = np.array([0.0, 10.0, 40.0])
+        a, force = Vector2D(0, 0), 16.0
+        times = ball.times_to_cover_distances(distances, force)
+        for distance, t in zip(distances, times):
+            b = Vector2D(float(distance), 0)
+            assert ball.time_to_cover_distance(a, b, force) == pytest.approx(t)
+        assert math.isinf(times[-1])
+
+    def test_memoized_per_tick(self, pitch: SoccerPitch) -> None:
+        ball = pitch.ball
+        first = ball.future_position(1.0)
+        # a copy of the cached prediction, safe to change
+        first.x += 100
+        assert ball.future_position(1.0) != first
+        assert len(ball._future_positions) == 1
+
+        before = ball.future_position(1.0)
+        pitch.update()
+        assert ball.future_position(1.0) != before
+        assert len(ball._future_positions) == 1
+
+    def test_cover_time_ignores_motion(self, pitch: SoccerPitch) -> None:
+        ball = pitch.ball
+        a, b = Vector2D(0, 0), Vector2D(10, 0)
+        still = ball.time_to_cover_distance(a, b, 16.0)
+        ball.kick(Vector2D(0, 1), 16.0)
+        pitch.update()
+        assert ball.time_to_cover_distance(a, b, 16.0) == still
+
+    def test_kick_invalidates(self, pitch: SoccerPitch) -> None:
+        ball = pitch.ball
+        ahead = ball.future_position(1.0)
+        ball.kick(Vector2D(0, 1), 16.0)
+        assert ball.future_position(1.0) != ahead
+        assert ball.future_position(1.0).x == pytest.approx(30)
+
+    def test_bounce_invalidates(self, pitch: SoccerPitch) -> None:
+        ball = pitch.ball
+        area = pitch.playing_area
+        ball.place_at_position(Vector2D(area.left + 10, area.top + 0.2))
+        ball.kick(Vector2D(0, -1), 16.0)
+        ball.future_position(1.0)
+        ball.update(pitch.params.dt)
+        # the ball now moves away from the touchline
+        assert ball.velocity.y > 0
+        assert ball.future_position(1.0).y > ball.position.y
+
+
+class TestGoal:
+    def test_scored(self) -> None:
+        goal = Goal(Vector2D(0, 10), Vector2D(0, 20), Vector2D(1, 0))
+        assert goal.center == Vector2D(0, 15)
+
+        pitch = SoccerPitch()
+        ball = pitch.ball
+        ball.old_position = Vector2D(1, 15)
+        ball.position = Vector2D(-1, 15)
+        assert goal.scored(ball)
+        ball.position = Vector2D(-1, 25)
+        assert not goal.scored(ball)
+        assert goal.num_goals_scored == 1
+
+    def test_crossing_fraction(self) -> None:
+        goal = Goal(Vector2D(0, 10), Vector2D(0, 20), Vector2D(1, 0))
+        assert goal.crossing(Vector2D(1, 15), Vector2D(-3, 15)) == 0.25
+        # ending on the line counts, starting on it does not count twice
+        assert goal.crossing(Vector2D(2, 12), Vector2D(0, 12)) == 1.0
+        assert goal.crossing(Vector2D(0, 12), Vector2D(-2, 12)) is None
+        # wide of the posts
+        assert goal.crossing(Vector2D(1, 5), Vector2D(-1, 5)) is None
+
+    def test_facing(self) -> None:
+        goal = Goal(Vector2D(0, 10), Vector2D(0, 20), Vector2D(1, 0))
+        # coming out of the goal is not a goal
+        assert goal.crossing(Vector2D(-1, 15), Vector2D(1, 15)) is None
+        # nor is going in at the back of the other goal
+        other = Goal(Vector2D(100, 20), Vector2D(100, 10), Vector2D(-1, 0))
+        assert other.crossing(Vector2D(1, 15), Vector2D(-1, 15)) is None
+        assert other.crossing(Vector2D(99, 15), Vector2D(101, 15)) == 0.5
+
+    def test_fast_shot_coarse_timestep(self) -> None:
+        # a 25 m/s shot moves over 8 m a tick at 3 ticks a second
+        pitch = SoccerPitch(Params(dt=1 / 3), seed=0)
+        ball = pitch.ball
+        goal = pitch.blue_goal
+        ball.place_at_position(goal.center + Vector2D(-3, 0))
+        ball.kick(Vector2D(1, 0), pitch.params.max_shooting_force)
+        pitch.update()
+        assert pitch.red_score == 1
+        # 3 m of the ball's step this tick, slowed by friction
+        dt = pitch.params.dt
+        step = (pitch.params.max_shooting_force + pitch.params.friction * dt) * dt
+        assert goal.last_goal_fraction == pytest.approx(3 / step)
+        # kick off afterwards
+        assert ball.position == pitch.playing_area.center
+
+
+@pytest.mark.parametrize("players", [1, 2, 5, 8, 11])
+def test_formation(players: int) -> None:
+    positions = formation(players)
+    assert len(positions) == players
+    assert all(0 < depth < 0.5 and 0 < width < 1 for depth, width in positions)
@@ -0,0 +1,140 @@
+import math
+
+import numpy as np
+import pytest
+
+from simple_soccer_py.common.transformations import point_to_local_space
+from simple_soccer_py.common.vector2d import Vector2D
+from simple_soccer_py.models import SoccerPitch
+from simple_soccer_py.passing import (
+    entity_arrays,
+    interceptions,
+    pass_safety,
+    safe_passes,
+    time_to_cover_distance,
+    to_local_space,
+)
+
+SPEED = 16.0
+FRICTION = -4.0
+BALL_RADIUS = 0.5
+
+
+def test_time_to_cover_distance() -> None:
+    times = time_to_cover_distance(np.array([0.0, 10.0, 100.0]), 10.0, -4.0)
+    assert times[0] == 0
+    # 10 = 10t - 2t^2
+    assert times[1] == pytest.approx((10 - np.sqrt(20)) / 4)
+    assert np.isinf(times[2])
+
+
+def test_to_local_space_matches_point_to_local_space() -> None:
+    rng = np.random.default_rng(0)
+    points = rng.uniform(-50, 50, (20, 2))
+    origins = rng.uniform(-50, 50, (20, 2))
+    angles = rng.uniform(0, 2 * np.pi, 20)
+    headings = np.stack([np.cos(angles), np.sin(angles)], axis=-1)
+    local = to_local_space(points, origins, headings)
+    for point, origin, heading, expected in zip(points, origins, headings, local):
+        h = Vector2D(*heading)
+        result = point_to_local_space(Vector2D(*point), h, h.perp(), Vector2D(*origin))
+        assert (result.x, result.y) == pytest.approx(tuple(expected))
+
+
+def test_safe_passes() -> None:
+    origins = np.array([[[0.0, 0.0]]])
+    targets = np.array([[[20.0, 0.0], [0.0, 20.0], [100.0, 0.0]]])
+    # one opponent on the line of the first pass, behind the second
+    opponents = np.array([[[10.0, 0.0]]])
+    safe = safe_passes(
+        origins, targets, opponents, np.array([[8.0]]), np.array([[0.5]]),
+        SPEED, FRICTION, BALL_RADIUS,
+    )  # fmt: skip
+    assert safe.tolist() == [[False, True, False]]
+
+
+def test_receivers_beyond_target() -> None:
+    origins = np.array([[[0.0, 0.0]]])
+    targets = np.array([[[20.0, 0.0], [20.0, 0.0]]])
+    # an opponent just past the target, a receiver further or nearer
+    opponents = np.array([[[23.0, 0.0]]])
+    receivers = np.array([[[30.0, 0.0], [21.0, 0.0]]])
+    args = (np.array([[8.0]]), np.array([[0.5]]), SPEED, FRICTION, BALL_RADIUS)
+    assert safe_passes(origins, targets, opponents, *args).tolist() == [[True, True]]
+    safe = safe_passes(origins, targets, opponents, *args, receivers=receivers)
+    assert safe.tolist() == [[False, True]]
+
+
+def reference_intercepted(
+    origin: Vector2D, target: Vector2D, opponent: Vector2D, speed: float
+) -> bool:
+    """one opponent against one pass with Vector2D, as Buckland does it"""
+    heading = target - origin
+    length = heading.length()
+    heading.normalize()
+    local = point_to_local_space(opponent, heading, heading.perp(), origin)
+    if local.x < 0 or origin.distance_sq(opponent) > length * length:
+        return False
+    v_sq = SPEED * SPEED + 2 * FRICTION * local.x
+    if v_sq < 0:
+        return True
+    time = (math.sqrt(v_sq) - SPEED) / FRICTION
+    return abs(local.y) < speed * time + BALL_RADIUS + 0.5
+
+
+def test_interceptions_match_reference() -> None:
+    rng = np.random.default_rng(1)
+    pitches, passes, count = 3, 8, 5
+    origins = rng.uniform([0, 0], [105, 68], (pitches, passes, 2))
+    targets = origins + rng.uniform(-25, 25, (pitches, passes, 2))
+    opponents = rng.uniform([0, 0], [105, 68], (pitches, count, 2))
+    speeds = rng.uniform(4, 8, (pitches, count))
+    radii = np.full((pitches, count), 0.5)
+    result = interceptions(
+        origins, targets, opponents, speeds, radii, SPEED, FRICTION, BALL_RADIUS
+    )
+    assert result.shape == (pitches, passes, count)
+    assert result.any() and not result.all()
+    for p in range(pitches):
+        for t in range(passes):
+            for o in range(count):
+                expected = reference_intercepted(
+                    Vector2D(*origins[p, t]),
+                    Vector2D(*targets[p, t]),
+                    Vector2D(*opponents[p, o]),
+                    speeds[p, o],
+                )
+                assert result[p, t, o] == expected
+
+
+def test_pass_safety_uses_entities() -> None:
+    pitch = SoccerPitch(seed=0)
+    opponents = pitch.blue_team.players
+    positions, speeds, radii = entity_arrays(opponents)
+    assert positions.shape == (len(opponents), 2)
+    assert speeds[0] == opponents[0].max_speed
+    assert radii[0] == opponents[0].bounding_radius
+
+    # straight at the blue goalkeeper is never safe, back towards our own
+    # goal from the centre spot always is
+    keeper = pitch.blue_team.goalkeeper.position
+    targets = np.array([[keeper.x + 1, keeper.y], [30.0, 34.0]])
+    safe = pass_safety(
+        pitch.ball.position, targets, opponents, 30.0, FRICTION, BALL_RADIUS
+    )
+    assert safe.tolist() == [False, True]
+
+
+def test_find_pass_skips_marked_players() -> None:
+    pitch = SoccerPitch(seed=0)
+    team = pitch.red_team
+    goal = team.opponents_goal.center
+    passer = max(team.field_players, key=lambda p: p.position.distance_sq(goal))
+    pitch.ball.place_at_position(passer.position)
+    receiver = team.find_pass(passer)
+    assert receiver is not None
+
+    # an opponent halfway along the pass marks the receiver
+    marker = pitch.blue_team.field_players[0]
+    marker.position.copy_from((passer.position + receiver.position) / 2)
+    assert team.find_pass(passer) is not receiver
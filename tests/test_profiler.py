@@ -0,0 +1,102 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from simple_soccer_py.common.moving_entity import MovingEntity
+from simple_soccer_py.models import SoccerPitch
+from simple_soccer_py.profiler import Profiler
+
+TICKS = 100
+
+
+class TestProfiler:
+    @pytest.fixture
+    def pitch(self) -> SoccerPitch:
+        return SoccerPitch(seed=2)
+
+    def test_restores_methods(self) -> None:
+        update = SoccerPitch.update
+        rotate = MovingEntity.rotate_heading_to_face_position
+        with Profiler() as profiler:
+            assert profiler.enabled
+            assert SoccerPitch.update is not update
+        assert not profiler.enabled
+        assert SoccerPitch.update is update
+        assert MovingEntity.rotate_heading_to_face_position is rotate
+
+    def test_one_at_a_time(self, pitch: SoccerPitch) -> None:
+        update = SoccerPitch.update
+        first = Profiler()
+        second = Profiler()
+        first.enable()
+        try:
+            with pytest.raises(RuntimeError):
+                second.enable()
+            assert not second.enabled
+            # the failed enable left the first one in place
+            pitch.run(5)
+            assert len(first.ticks) == 5
+        finally:
+            second.disable()
+            first.disable()
+        assert SoccerPitch.update is update
+        pitch.run(5)
+        assert len(first.ticks) == 5
+        # free for the next one once the first is disabled
+        with Profiler() as profiler:
+            pitch.run(3)
+        assert len(profiler.ticks) == 3
+        assert SoccerPitch.update is update
+
+    def test_records_ticks(self, pitch: SoccerPitch) -> None:
+        with Profiler(capacity=50) as profiler:
+            pitch.run(TICKS)
+        assert len(profiler.ticks) == 50
+        assert [t[0] for t in profiler.ticks] == list(range(TICKS - 50, TICKS))
+
+        summary = profiler.summary()
+        assert summary["tick"]["calls"] == 50
+        assert summary["rotate_heading"]["calls"] > 0
+        # the tick covers every other subsystem
+        assert summary["tick"]["total_s"] >= summary["rotate_heading"]["total_s"]
+        assert summary["tick"]["bytes"] == 0
+
+    def test_disabled_records_nothing(self, pitch: SoccerPitch) -> None:
+        profiler = Profiler()
+        pitch.run(10)
+        assert not profiler.ticks and not profiler.events
+
+    def test_same_result(self) -> None:
+        plain = SoccerPitch(seed=3).run(TICKS)
+        with Profiler():
+            profiled = SoccerPitch(seed=3).run(TICKS)
+        assert (plain.red_score, plain.red_possession) == (
+            profiled.red_score,
+            profiled.red_possession,
+        )
+
+    def test_trace_allocations(self, pitch: SoccerPitch) -> None:
+        with Profiler(trace_allocations=True) as profiler:
+            pitch.run(10)
+        assert profiler.summary()["tick"]["calls"] == 10
+
+    def test_exports(self, pitch: SoccerPitch, tmp_path: Path) -> None:
+        with Profiler(event_capacity=500) as profiler:
+            pitch.run(20)
+
+        profiler.write_csv(tmp_path / "ticks.csv")
+        lines = (tmp_path / "ticks.csv").read_text().splitlines()
+        assert lines[0].startswith("tick,tick_ns,tick_calls,tick_bytes")
+        assert len(lines) == 21
+
+        profiler.write_json(tmp_path / "summary.json")
+        summary = json.loads((tmp_path / "summary.json").read_text())
+        assert summary["ticks"] == 20
+        assert set(summary["subsystems"]) == set(profiler.subsystems)
+
+        profiler.write_chrome_trace(tmp_path / "trace.json")
+        trace = json.loads((tmp_path / "trace.json").read_text())
+        events = trace["traceEvents"]
+        assert 0 < len(events) <= 500
+        assert {"name", "ph", "ts", "dur", "pid", "tid"} <= set(events[0])
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from simple_soccer_py.common.vector2d import Vector2D
+from simple_soccer_py.models import PlayerRole, SoccerPitch
+from simple_soccer_py.regions import Region, RegionGrid, RegionMode
+
+
+def test_region_inside() -> None:
+    region = Region(0, 0, 10, 5)
+    assert region.center == Vector2D(5, 2.5)
+    assert region.inside(Vector2D(10, 5))
+    assert not region.inside(Vector2D(10.1, 2))
+    assert region.inside(Vector2D(5, 2.5), RegionMode.HALFSIZE)
+    assert not region.inside(Vector2D(2, 2.5), RegionMode.HALFSIZE)
+    assert not region.inside(Vector2D(5, 1), RegionMode.HALFSIZE)
+
+
+class TestRegionGrid:
+    @pytest.fixture
+    def grid(self) -> RegionGrid:
+        return RegionGrid(0, 0, 105, 68, cols=6, rows=3)
+
+    def test_regions(self, grid: RegionGrid) -> None:
+        assert len(grid) == 18
+        assert grid[0].left == 0 and grid[0].top == 0
+        assert grid[17].right == pytest.approx(105)
+        assert grid[17].bottom == pytest.approx(68)
+        assert [r.id for r in grid.regions] == list(range(18))
+        np.testing.assert_allclose(
+            grid.centers[7], [grid[7].center.x, grid[7].center.y]
+        )
+
+    def test_region_of_matches_scan(self, grid: RegionGrid) -> None:
+        rng = np.random.default_rng(0)
+        positions = rng.uniform([0, 0], [105, 68], (500, 2))
+        ids = grid.regions_of(positions)
+        for (x, y), id in zip(positions, ids):
+            position = Vector2D(x, y)
+            assert grid.region_of(position) == id
+            assert grid[id].inside(position)
+
+    def test_off_pitch_clamps(self, grid: RegionGrid) -> None:
+        assert grid.region_of(Vector2D(-5, -5)) == 0
+        assert grid.region_of(Vector2D(200, 200)) == 17
+        assert grid.regions_of(np.array([[-5.0, 30.0], [200.0, 30.0]])).tolist() == [
+            6,
+            11,
+        ]
+
+    def test_center_of(self, grid: RegionGrid) -> None:
+        assert grid.center_of(Vector2D(1, 1)) == grid[0].center
+
+
+class TestPitchRegions:
+    @pytest.fixture
+    def pitch(self) -> SoccerPitch:
+        return SoccerPitch()
+
+    def test_home_regions(self, pitch: SoccerPitch) -> None:
+        for player in pitch.red_team.players + pitch.blue_team.players:
+            assert pitch.regions[player.home_region].inside(player.home)
+        keeper = pitch.red_team.goalkeeper
+        assert keeper.role == PlayerRole.GOALKEEPER
+        assert keeper.in_home_region()
+
+        ids = [6, 1, 7, 13, 8]
+        pitch.red_team.set_home_regions(ids)
+        for player, id in zip(pitch.red_team.players, ids):
+            assert player.home == pitch.regions[id].center
+            player.position = pitch.regions[id].center.copy()
+            assert player.in_home_region()
+        with pytest.raises(ValueError):
+            pitch.red_team.set_home_regions([1])
+
+    def test_opponents_half(self, pitch: SoccerPitch) -> None:
+        red, blue = pitch.red_team, pitch.blue_team
+        assert red.in_opponents_half(Vector2D(80, 30))
+        assert not red.in_opponents_half(Vector2D(20, 30))
+        assert blue.in_opponents_half(Vector2D(20, 30))
+
+        pitch.run(500)
+        for team in (red, blue):
+            mask = team.players_in_opponents_half()
+            assert mask.tolist() == [p.in_opponents_half() for p in team.players]
+            assert team.player_regions().tolist() == [
+                pitch.regions.region_of(p.position) for p in team.players
+            ]
@@ -0,0 +1,127 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from simple_soccer_py.models import SoccerPitch
+from simple_soccer_py.replay import (
+    COLUMNS,
+    ReplayReader,
+    ReplayWriter,
+    pitch_entities,
+    record_match,
+)
+
+TICKS = 200
+STEPS = np.array([0.001, 0.001, 0.001, 0.001, 0.0001, 0.0001])
+
+
+def states(pitch: SoccerPitch) -> list[np.ndarray]:
+    """plays TICKS of pitch, returning the state before the first and after each"""
+
+    def state() -> np.ndarray:
+        return np.array(
+            [
+                (
+                    e.position.x,
+                    e.position.y,
+                    e.velocity.x,
+                    e.velocity.y,
+                    e.heading.x,
+                    e.heading.y,
+                )  # noqa: E501
+                for e in pitch_entities(pitch)
+            ]
+        )
+
+    result = [state()]
+    for _ in range(TICKS):
+        pitch.update()
+        result.append(state())
+    return result
+
+
+class TestReplay:
+    @pytest.fixture
+    def expected(self) -> list[np.ndarray]:
+        return states(SoccerPitch(seed=4))
+
+    @pytest.fixture
+    def path(self, tmp_path: Path) -> Path:
+        path = tmp_path / "match.replay"
+        record_match(SoccerPitch(seed=4), path, TICKS, keyframe_interval=30)
+        return path
+
+    def test_frames(self, path: Path, expected: list[np.ndarray]) -> None:
+        with ReplayReader(path) as reader:
+            assert reader.entity_count == len(expected[0])
+            assert reader.keyframe_ticks[:3] == [0, 30, 60]
+            ticks = []
+            for frame in reader:
+                ticks.append(frame.tick)
+                assert frame.state.shape == (reader.entity_count, COLUMNS)
+                error = np.abs(frame.state - expected[frame.tick])
+                # quantisation error never builds up across deltas
+                assert (error <= STEPS / 2 + 1e-9).all()
+                if frame.tick in reader.keyframe_ticks:
+                    assert (error == 0).all()
+                del frame
+            assert ticks == list(range(TICKS + 1))
+
+    def test_seek(self, path: Path) -> None:
+        with ReplayReader(path) as reader:
+            sequential = [f.state.copy() for f in reader if f.tick >= 95]
+            frames = reader.frames(95)
+            first = next(frames)
+            assert first.tick == 95
+            np.testing.assert_array_equal(first.state, sequential[0])
+            del first, frames
+            frame = reader.frame(150)
+            np.testing.assert_array_equal(frame.state, sequential[150 - 95])
+            del frame
+            with pytest.raises(KeyError):
+                reader.frame(TICKS + 1)
+
+    def test_scores(self, tmp_path: Path) -> None:
+        path = tmp_path / "scores.replay"
+        with ReplayWriter(path, 1) as writer:
+            writer.write_frame(0, 0, 0, np.zeros((1, COLUMNS)))
+            writer.write_frame(1, 2, 3, np.ones((1, COLUMNS)))
+        with ReplayReader(path) as reader:
+            assert [(f.tick, f.red_score, f.blue_score) for f in reader] == [
+                (0, 0, 0),
+                (1, 2, 3),
+            ]
+
+    def test_large_jump_is_keyframe(self, tmp_path: Path) -> None:
+        path = tmp_path / "jump.replay"
+        with ReplayWriter(path, 1, keyframe_interval=100) as writer:
+            writer.write_frame(0, 0, 0, np.zeros((1, COLUMNS)))
+            writer.write_frame(1, 0, 0, np.full((1, COLUMNS), 0.5))
+            writer.write_frame(2, 0, 0, np.full((1, COLUMNS), 50.0))
+            assert writer.keyframes == 2
+        with ReplayReader(path) as reader:
+            assert reader.keyframe_ticks == [0, 2]
+            assert reader.frame(2).state.tolist() == [[50.0] * COLUMNS]
+
+    def test_unclosed_writer(self, tmp_path: Path) -> None:
+        path = tmp_path / "crashed.replay"
+        writer = ReplayWriter(path, 2, keyframe_interval=4)
+        for tick in range(10):
+            writer.write_frame(tick, 0, 0, np.full((2, COLUMNS), tick / 10))
+        writer.flush()
+        with ReplayReader(path) as reader:
+            assert reader.keyframe_ticks == [0, 4, 8]
+            assert [f.tick for f in reader] == list(range(10))
+        writer.close()
+
+    def test_bad_file(self, tmp_path: Path) -> None:
+        path = tmp_path / "bad.replay"
+        path.write_bytes(b"x" * 64)
+        with pytest.raises(ValueError):
+            ReplayReader(path)
+
+    def test_wrong_shape(self, tmp_path: Path) -> None:
+        with ReplayWriter(tmp_path / "shape.replay", 2) as writer:
+            with pytest.raises(ValueError):
+                writer.write_frame(0, 0, 0, np.zeros((3, COLUMNS)))
@@ -0,0 +1,157 @@
+import asyncio
+import math
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from simple_soccer_py.models import SoccerPitch
+from simple_soccer_py.replay import pitch_entities
+from simple_soccer_py.spectator import (
+    Snapshot,
+    Spectator,
+    SpectatorClient,
+    SpectatorServer,
+    connect_tcp,
+    connect_unix,
+)
+
+
+async def read_until(client: SpectatorClient, tick: int) -> list[Snapshot]:
+    snapshots = [await client.read()]
+    while snapshots[-1].tick < tick:
+        snapshots.append(await client.read())
+    return snapshots
+
+
+async def watch(
+    server: SpectatorServer, client: SpectatorClient, ticks: int
+) -> list[Snapshot]:
+    end = server.pitch.tick + ticks
+    run = asyncio.create_task(server.run(ticks))
+    snapshots = await asyncio.wait_for(read_until(client, end), 10.0)
+    await run
+    return snapshots
+
+
+def test_tcp() -> None:
+    async def main() -> None:
+        pitch = SoccerPitch(seed=1)
+        async with SpectatorServer(pitch, tick_rate=math.inf) as server:
+            listening = await server.listen_tcp()
+            port = listening.sockets[0].getsockname()[1]
+            client = await connect_tcp("127.0.0.1", port)
+            assert client.entity_count == len(pitch_entities(pitch))
+            snapshots = await watch(server, client, 60)
+            await client.close()
+
+        ticks = [s.tick for s in snapshots]
+        assert ticks[0] == 0
+        assert ticks == sorted(set(ticks))
+        # the last one is the state the match ended in
+        last = snapshots[-1]
+        ball = pitch.ball
+        assert last.state.shape == (len(pitch_entities(pitch)), 6)
+        assert np.allclose(last.state[0, :2], (ball.position.x, ball.position.y))
+
+    asyncio.run(main())
+
+
+def test_unix_fps(tmp_path: Path) -> None:
+    async def main() -> None:
+        path = tmp_path / "spectator.sock"
+        async with SpectatorServer(SoccerPitch(), tick_rate=900.0) as server:
+            await server.listen_unix(path)
+            # every third tick at 30 ticks a simulated second
+            client = await connect_unix(path, fps=10.0)
+            snapshots = await watch(server, client, 90)
+            assert [s.tick for s in snapshots] == list(range(0, 91, 3))
+
+            await client.set_fps(0.0)
+            snapshots = await watch(server, client, 90)
+            assert snapshots[-1].tick == 180
+            # near every tick, the new rate may only apply after the first
+            assert len(snapshots) > 45
+            await client.close()
+
+    asyncio.run(main())
+
+
+def test_slow_spectator_does_not_stall_match() -> None:
+    async def main() -> None:
+        pitch = SoccerPitch(seed=2)
+        async with SpectatorServer(pitch, tick_rate=math.inf) as server:
+            listening = await server.listen_tcp()
+            port = listening.sockets[0].getsockname()[1]
+            # subscribed, but never reads
+            clients = [await connect_tcp("127.0.0.1", port) for _ in range(4)]
+            summary = await asyncio.wait_for(server.run(3000), 60.0)
+            assert len(server.spectators) == 4
+            for client in clients:
+                await client.close()
+
+        expected = SoccerPitch(seed=2).run(3000)
+        assert (summary.red_score, summary.blue_score) == (
+            expected.red_score,
+            expected.blue_score,
+        )
+        assert summary.red_possession == expected.red_possession
+
+    asyncio.run(main())
+
+
+def test_spectator_leaves() -> None:
+    async def main() -> None:
+        async with SpectatorServer(SoccerPitch(), tick_rate=math.inf) as server:
+            listening = await server.listen_tcp()
+            port = listening.sockets[0].getsockname()[1]
+            client = await connect_tcp("127.0.0.1", port)
+            assert len(server.spectators) == 1
+            await client.close()
+            await server.run(30)
+            assert not server.spectators
+
+    asyncio.run(main())
+
+
+def test_not_a_spectator() -> None:
+    async def main() -> None:
+        async with SpectatorServer(SoccerPitch()) as server:
+            listening = await server.listen_tcp()
+            port = listening.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"GET / HTTP/1.0\r\n")
+            assert await reader.read() == b""
+            writer.close()
+
+    asyncio.run(main())
+
+
+class TestSpectator:
+    @pytest.fixture
+    def spectator(self) -> Spectator:
+        # due() and offer() never touch the streams
+        return Spectator(None, None, 10.0)  # type: ignore[arg-type]
+
+    def test_due(self, spectator: Spectator) -> None:
+        dt = 1 / 30
+        due = [tick for tick in range(31) if spectator.due(tick * dt)]
+        assert due == list(range(0, 31, 3))
+        # a raised rate starts from now
+        spectator.fps = 30.0
+        spectator.next_time = 0.0
+        assert spectator.due(2.0)
+        assert not spectator.due(2.0)
+        assert spectator.due(2.0 + dt)
+
+    def test_latest_frame_wins(self, spectator: Spectator) -> None:
+        for frame in (b"a", b"b", b"c"):
+            spectator.offer(frame)
+        assert spectator.latest == b"c"
+        assert spectator.dropped == 2
+        assert spectator.ready.is_set()
+
+    def test_tick_rate(self) -> None:
+        with pytest.raises(ValueError):
+            SpectatorServer(SoccerPitch(), tick_rate=0.0)
+        assert SpectatorServer(SoccerPitch()).tick_rate == pytest.approx(30.0)
@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+
+from simple_soccer_py.common.vector2d import Vector2D
+from simple_soccer_py.models import SoccerPitch
+from simple_soccer_py.params import Params
+from simple_soccer_py.steering import (
+    PRIORITY,
+    Behavior,
+    SteeringBehaviors,
+    calculate_batch,
+)
+
+DT = Params().dt
+
+
+@pytest.fixture
+def pitch() -> SoccerPitch:
+    pitch = SoccerPitch(seed=0)
+    pitch.run(200)
+    return pitch
+
+
+def steering_of(pitch: SoccerPitch) -> list[SteeringBehaviors]:
+    return [p.steering for p in (*pitch.red_team.players, *pitch.blue_team.players)]
+
+
+class TestSteeringBehaviors:
+    def test_seek_and_arrive(self, pitch: SoccerPitch) -> None:
+        player = pitch.red_team.field_players[0]
+        player.velocity.zero()
+        steering = player.steering
+        target = player.position + Vector2D(10, 0)
+        # full speed towards the target in one tick
+        seek = steering.seek(target, DT)
+        assert seek.x == pytest.approx(player.max_speed * player.mass / DT)
+        assert seek.y == pytest.approx(0)
+        # slower the closer it gets
+        near = steering.arrive(player.position + Vector2D(1, 0), DT)
+        assert 0 < near.x < seek.x
+        assert steering.arrive(player.position, DT) == Vector2D()
+
+    def test_interpose(self, pitch: SoccerPitch) -> None:
+        player = pitch.red_team.field_players[0]
+        steering = player.steering
+        pitch.ball.place_at_position(Vector2D(50, 34))
+        target = Vector2D(40, 34)
+        expected = steering.arrive(Vector2D(43, 34), DT)
+        assert steering.interpose(target, 3.0, DT) == expected
+
+    def test_separation(self, pitch: SoccerPitch) -> None:
+        a, b = pitch.red_team.field_players[:2]
+        b.position.copy_from(a.position + Vector2D(1, 0))
+        force = a.steering.separation()
+        assert force.x < 0
+        assert force.x == pytest.approx(-pitch.params.player_separation_coefficient)
+
+    def test_priority_truncates(self, pitch: SoccerPitch) -> None:
+        a, b = pitch.red_team.field_players[:2]
+        b.position.copy_from(a.position + Vector2D(0.5, 0))
+        steering = a.steering
+        steering.flags = 0
+        steering.on(Behavior.SEPARATION)
+        steering.on(Behavior.SEEK)
+        steering.target = a.position + Vector2D(0, 20)
+        a.velocity.zero()
+        force = steering.calculate(DT)
+        # separation went first and got its whole force, seek what was left
+        separation = steering.separation()
+        assert separation.length() < a.max_force
+        seek = force - separation
+        assert seek.x == pytest.approx(0, abs=1e-6)
+        assert seek.y > 0
+        assert separation.length() + seek.length() == pytest.approx(a.max_force)
+
+        # once max_force is used up the rest are not added
+        steering.weights[Behavior.SEPARATION] = 100.0
+        force = steering.calculate(DT)
+        assert force.y == pytest.approx(0)
+        assert force.length() == pytest.approx(a.max_force)
+
+    def test_on_off(self, pitch: SoccerPitch) -> None:
+        steering = pitch.red_team.field_players[0].steering
+        steering.on(Behavior.PURSUIT)
+        assert steering.is_on(Behavior.PURSUIT)
+        steering.off(Behavior.PURSUIT)
+        assert not steering.is_on(Behavior.PURSUIT)
+
+
+class TestBatch:
+    def test_matches_scalar_in_play(self, pitch: SoccerPitch) -> None:
+        for _ in range(30):
+            pitch.update()
+            behaviors = steering_of(pitch)
+            batched = calculate_batch(behaviors, DT)
+            for b, (x, y) in zip(behaviors, batched):
+                force = b.calculate(DT)
+                assert (x, y) == pytest.approx((force.x, force.y), abs=1e-6)
+
+    def test_matches_scalar_every_behavior(self, pitch: SoccerPitch) -> None:
+        rng = np.random.default_rng(0)
+        behaviors = steering_of(pitch)
+        pitch.ball.kick(Vector2D(1, 1), 10)
+        for b in behaviors:
+            b.flags = int(rng.integers(0, 32))
+            b.target = Vector2D(*rng.uniform([0, 0], [105, 68]))
+            b.interpose_distance = float(rng.uniform(0, 5))
+            b.weights = {behavior: float(rng.uniform(0.5, 2)) for behavior in PRIORITY}
+            b.player.position.copy_from(Vector2D(*rng.uniform([40, 25], [60, 40])))
+        batched = calculate_batch(behaviors, DT)
+        for b, (x, y) in zip(behaviors, batched):
+            force = b.calculate(DT)
+            assert (x, y) == pytest.approx((force.x, force.y), abs=1e-6)
+
+    def test_empty(self) -> None:
+        assert calculate_batch([], DT).shape == (0, 2)
+
+    def test_batched_match(self) -> None:
+        pitch = SoccerPitch(Params(batched_steering=True), seed=0)
+        pitch.run(300)
+        positions = [p.position for p in pitch.red_team.players]
+        area = pitch.playing_area
+        assert all(area.inside(p) for p in positions)
+        assert len({(p.x, p.y) for p in positions}) == len(positions)
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from simple_soccer_py.common.vector2d import Vector2D
+from simple_soccer_py.models import PlayerState, SoccerPitch
+from simple_soccer_py.params import Params
+from simple_soccer_py.support_spots import score_support_spots, support_spot_grid
+
+
+class TestScoring:
+    @pytest.fixture
+    def pitch(self) -> SoccerPitch:
+        pitch = SoccerPitch(seed=0)
+        pitch.run(200)
+        return pitch
+
+    def test_grid_in_attacking_half(self) -> None:
+        p = Params()
+        right = support_spot_grid(p, True)
+        left = support_spot_grid(p, False)
+        assert len(right) == len(left) == (13 // 2 - 1) * 6
+        assert (right[:, 0] > p.pitch_width / 2).all()
+        assert (left[:, 0] < p.pitch_width / 2).all()
+
+    def test_batched_matches_single(self, pitch: SoccerPitch) -> None:
+        rng = np.random.default_rng(0)
+        calc = pitch.red_team.support_spots
+        opponents = pitch.blue_team
+        pitches = 4
+        attackers = rng.uniform([0, 0], [105, 68], (pitches, 2))
+        positions = rng.uniform([0, 0], [105, 68], (pitches, 5, 2))
+        speeds = np.full((pitches, 5), opponents.players[0].max_speed)
+        radii = np.full((pitches, 5), 0.5)
+        spots = np.broadcast_to(calc.spots, (pitches, *calc.spots.shape))
+        goals = np.broadcast_to(calc.goal_targets, (pitches, 5, 2))
+
+        batched = score_support_spots(
+            spots, attackers, positions, speeds, radii, goals, pitch.params
+        )
+        for i in range(pitches):
+            single = score_support_spots(
+                spots[i : i + 1], attackers[i : i + 1], positions[i : i + 1],
+                speeds[i : i + 1], radii[i : i + 1], goals[i : i + 1],
+                pitch.params,
+            )  # fmt: skip
+            np.testing.assert_allclose(batched[i], single[0])
+        p = pitch.params
+        top = 1 + p.spot_pass_safe_score + p.spot_can_score_score
+        assert ((batched >= 1) & (batched <= top + p.spot_distance_score)).all()
+
+    def test_best_spot_throttled(self, pitch: SoccerPitch) -> None:
+        calc = pitch.red_team.support_spots
+        calc.reset()
+        attacker = Vector2D(50, 34)
+        best = calc.determine_best_supporting_position(attacker)
+        assert best is not None
+        assert calc.scores[int(np.argmax(calc.scores))] == calc.scores.max()
+        # until the regulator is ready the cached spot is returned
+        scores = calc.scores
+        assert calc.determine_best_supporting_position(Vector2D(90, 10)) is best
+        assert calc.scores is scores
+        period = 1 / pitch.params.support_spot_update_frequency
+        pitch.run(int(period / pitch.params.dt) + 1)
+        calc.determine_best_supporting_position(attacker)
+        assert calc.scores is not scores
+
+    def test_supporting_player(self, pitch: SoccerPitch) -> None:
+        seen = False
+        states = set()
+        for _ in range(2_000):
+            pitch.update()
+            for team in (pitch.red_team, pitch.blue_team):
+                supporter = team.supporting_player
+                if supporter is None:
+                    continue
+                seen = True
+                assert supporter is not pitch.ball.owner
+                assert supporter is not team.closest_player_to_ball
+                assert supporter in team.field_players
+                assert team.support_spots.best_spot is not None
+                states.add(supporter.state)
+        assert seen
+        assert PlayerState.SUPPORT_ATTACKER in states